@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Alias Tracer
+============
+
+Finds every object that can be reached from a set of named roots through
+more than one reference - the nested list shared by a list and its
+shallow copy, one power-up list shared by every player, a default
+mutable argument - and shows the paths that lead to it:
+
+    list [3, 4] is referenced 2 times:
+        original[2]
+        shallow_copy[2]
+
+How it works:
+- The reference graph is walked breadth-first and iteratively with
+  gc.get_referents(), so deep or cyclic graphs are fine.
+- Each object gets a node number the first time it is seen; every
+  reference to it adds an edge and raises its in-degree. An object with
+  an in-degree above 1 is aliased. Edges are stored in two compact
+  arrays, so hundreds of thousands of objects take a second or two.
+- Paths are only worked out for the aliased objects that are reported.
+- The walk stops (and the graph is marked truncated) when the tracer's
+  own bookkeeping would go over a memory budget.
+
+Numbers, strings and bytes are left out: they are immutable, and Python
+shares them freely (small ints, interned strings), so they are never an
+aliasing bug. Classes, modules and functions are skipped like in
+deep_size.py. The graph can be exported as JSON or Graphviz DOT.
+
+Usage:
+    python alias_tracer.py                          # demo on a large game session
+    python alias_tracer.py --players 100000 --dot aliases.dot --json aliases.json
+"""
+
+import argparse
+import gc
+import json
+import re
+import reprlib
+import time
+from array import array
+
+from deep_size import SHARED_TYPES
+
+# Immutable values that are shared freely by Python itself
+ATOMIC_TYPES = (int, float, complex, str, bytes)
+
+# Approximate bookkeeping cost per object and per reference (index dict
+# entry, object list slot, parent and in-degree entries; two array items)
+NODE_BYTES = 150
+EDGE_BYTES = 16
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024
+
+_short_repr = reprlib.Repr()
+_short_repr.maxlevel = 2
+_short_repr.maxlist = _short_repr.maxtuple = _short_repr.maxdict = _short_repr.maxset = 4
+_short_repr.maxstring = _short_repr.maxother = 30
+
+
+class AliasGraph:
+    """The reference graph between the objects reachable from some roots.
+
+    Nodes are numbered in the order they were found. objects[n] is the
+    object, parents[n] the node it was first reached from (-1 for
+    roots) and in_degree[n] the number of references to it (a root
+    counts as one). Edge i goes from edge_from[i] to edge_to[i].
+    """
+
+    def __init__(self, roots, memory_budget=DEFAULT_MEMORY_BUDGET):
+        self.roots = {}           # root name -> node
+        self.objects = []
+        self.parents = []
+        self.in_degree = []
+        self.edge_from = array("q")
+        self.edge_to = array("q")
+        self.truncated = False
+        self.seconds = 0.0
+        self._incoming = None
+        self._trace(roots, memory_budget)
+
+    def _trace(self, roots, memory_budget):
+        # Local names keep the inner loop fast
+        get_referents = gc.get_referents
+        objects, parents, in_degree = self.objects, self.parents, self.in_degree
+        edge_from, edge_to = self.edge_from, self.edge_to
+        index = {}
+        followed = {}             # type -> whether its objects are nodes
+
+        def is_node(cls):
+            keep = not issubclass(cls, SHARED_TYPES + ATOMIC_TYPES)
+            followed[cls] = keep
+            return keep
+
+        start = time.perf_counter()
+        for name, obj in roots.items():
+            if not is_node(type(obj)):
+                continue
+            node = index.get(id(obj))
+            if node is None:
+                node = index[id(obj)] = len(objects)
+                objects.append(obj)
+                parents.append(-1)
+                in_degree.append(1)
+            else:
+                in_degree[node] += 1
+            self.roots[name] = node
+
+        cursor = 0
+        while cursor < len(objects):
+            if not cursor & 1023 and (len(objects) * NODE_BYTES
+                                      + len(edge_from) * EDGE_BYTES) > memory_budget:
+                self.truncated = True
+                break
+            for child in get_referents(objects[cursor]):
+                keep = followed.get(type(child))
+                if keep is None:
+                    keep = is_node(type(child))
+                if not keep:
+                    continue
+                node = index.get(id(child))
+                if node is None:
+                    node = index[id(child)] = len(objects)
+                    objects.append(child)
+                    parents.append(cursor)
+                    in_degree.append(1)
+                else:
+                    in_degree[node] += 1
+                edge_from.append(cursor)
+                edge_to.append(node)
+            cursor += 1
+        self.seconds = time.perf_counter() - start
+
+    def aliased(self):
+        """Return the aliased nodes, most referenced first"""
+        nodes = [node for node, count in enumerate(self.in_degree) if count > 1]
+        nodes.sort(key=lambda node: self.in_degree[node], reverse=True)
+        return nodes
+
+    def incoming(self, node):
+        """Return the nodes that reference node (once per reference)"""
+        if self._incoming is None:
+            # One pass over the edges, keeping only the aliased targets
+            aliased = {node for node, count in enumerate(self.in_degree) if count > 1}
+            self._incoming = {node: [] for node in aliased}
+            for source, target in zip(self.edge_from, self.edge_to):
+                if target in aliased:
+                    self._incoming[target].append(source)
+        if node in self._incoming:
+            return self._incoming[node]
+        parent = self.parents[node]
+        return [] if parent == -1 else [parent]
+
+    def path(self, node):
+        """Return the shortest path from a root to node, like "session['players'][3]" """
+        steps = []
+        while self.parents[node] != -1:
+            parent = self.parents[node]
+            steps.append(_edge_labels(self.objects[parent], self.objects[node])[0])
+            node = parent
+        steps.append(self._root_name(node))
+        return _join_path(reversed(steps))
+
+    def paths(self, node, limit=5):
+        """Return up to limit different paths from the roots to node"""
+        paths = [name for name, root in self.roots.items() if root == node]
+        seen_parents = {}
+        for parent in self.incoming(node):
+            if len(paths) >= limit:
+                break
+            # A parent may hold several references to node ([x, x])
+            occurrence = seen_parents.get(parent, 0)
+            seen_parents[parent] = occurrence + 1
+            labels = _edge_labels(self.objects[parent], self.objects[node])
+            label = labels[occurrence] if occurrence < len(labels) else labels[-1]
+            paths.append(_join_path([self.path(parent), label]))
+        return paths[:limit]
+
+    def describe(self, node):
+        obj = self.objects[node]
+        return f"{type(obj).__qualname__} {_short_repr.repr(obj)}"
+
+    def _root_name(self, node):
+        for name, root in self.roots.items():
+            if root == node:
+                return name
+        return "?"
+
+    def to_json(self):
+        """Return the graph as a JSON-ready dict"""
+        return {
+            "roots": self.roots,
+            "truncated": self.truncated,
+            "nodes": [
+                {"id": node, "type": type(obj).__qualname__, "in_degree": self.in_degree[node]}
+                for node, obj in enumerate(self.objects)
+            ],
+            "edges": [[source, target] for source, target in zip(self.edge_from, self.edge_to)],
+            "aliased": [
+                {"id": node, "repr": _short_repr.repr(self.objects[node]),
+                 "in_degree": self.in_degree[node], "paths": self.paths(node)}
+                for node in self.aliased()
+            ],
+        }
+
+    def write_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_json(), f)
+
+    def write_dot(self, path):
+        """Write the graph in Graphviz DOT format, aliased objects in red"""
+        with open(path, "w") as f:
+            f.write("digraph aliases {\n  node [shape=box, fontsize=10];\n")
+            for name, node in self.roots.items():
+                f.write(f'  "root {_dot_escape(name)}" [shape=plaintext];\n'
+                        f'  "root {_dot_escape(name)}" -> n{node};\n')
+            for node, obj in enumerate(self.objects):
+                if self.in_degree[node] > 1:
+                    label = _dot_escape(self.describe(node))
+                    f.write(f'  n{node} [label="{label}", style=filled, fillcolor="#ffb3b3"];\n')
+                else:
+                    f.write(f'  n{node} [label="{type(obj).__qualname__}"];\n')
+            for source, target in zip(self.edge_from, self.edge_to):
+                f.write(f"  n{source} -> n{target};\n")
+            f.write("}\n")
+
+
+def trace_aliases(roots, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """Walk everything reachable from roots and return an AliasGraph.
+
+    roots is a dict of {name: object} (names are used in the paths), or
+    a list of objects, which are named root0, root1, ...
+    """
+    if not isinstance(roots, dict):
+        roots = {f"root{i}": obj for i, obj in enumerate(roots)}
+    return AliasGraph(roots, memory_budget)
+
+
+def _edge_labels(parent, child):
+    """Return how parent refers to child, once per reference ("[2]", "['hp']", ".name")"""
+    if isinstance(parent, (list, tuple)):
+        labels = [f"[{i}]" for i, item in enumerate(parent) if item is child]
+    elif isinstance(parent, dict):
+        labels = []
+        for key, value in parent.items():
+            if key is child:
+                labels.append(f".keys() {_short_repr.repr(key)}")
+            if value is child:
+                labels.append(f"[{_short_repr.repr(key)}]")
+    elif isinstance(parent, (set, frozenset)):
+        labels = [" member"]
+    else:
+        labels = []
+        attributes = getattr(parent, "__dict__", None)
+        if attributes is child:
+            labels.append(".__dict__")
+        elif isinstance(attributes, dict):
+            labels.extend(f".{name}" for name, value in attributes.items() if value is child)
+        for cls in type(parent).__mro__:
+            for name in cls.__dict__.get("__slots__", ()):
+                if getattr(parent, name, None) is child:
+                    labels.append(f".{name}")
+    return labels or [" -> "]
+
+
+def _join_path(steps):
+    # obj.__dict__['name'] reads better as obj.name
+    return re.sub(r"\.__dict__\['(\w+)'\]", r".\1", "".join(steps))
+
+
+def _dot_escape(text):
+    return text.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def format_report(graph, limit=10):
+    """Return the aliased objects of a graph as printable text"""
+    aliased = graph.aliased()
+    lines = [f"Traced {len(graph.objects):,} objects and {len(graph.edge_from):,} references "
+             f"in {graph.seconds:.2f}s"]
+    if graph.truncated:
+        lines.append("⚠️  Stopped at the memory budget - the graph is incomplete")
+    if not aliased:
+        lines.append("✅ No aliased objects")
+    else:
+        lines.append(f"⚠️  {len(aliased):,} aliased object{'s' if len(aliased) != 1 else ''}")
+    for node in aliased[:limit]:
+        lines.append(f"\n  {graph.describe(node)} is referenced {graph.in_degree[node]:,} times:")
+        for path in graph.paths(node):
+            lines.append(f"      {path}")
+    if len(aliased) > limit:
+        lines.append(f"\n  ... and {len(aliased) - limit:,} more")
+    return "\n".join(lines)
+
+
+def make_session(players, bug_every=1000):
+    """Return a game session where every bug_every-th player shares a list by mistake"""
+    shared_power_ups = ["Shield"]
+    session = {"level": 3, "players": [], "leaderboard": []}
+    for i in range(players):
+        player = {
+            "name": f"player{i}",
+            "health": [100, 100],
+            "position": [i % 800, i % 600],
+            "power_ups": shared_power_ups if i % bug_every == 0 else ["Shield"],
+        }
+        session["players"].append(player)
+    # The leaderboard is meant to hold references to players, so these are expected aliases
+    session["leaderboard"] = session["players"][:10]
+    return session
+
+
+def main():
+    """Trace a large game session and report the aliased objects"""
+    parser = argparse.ArgumentParser(description="Find objects reachable through more than one path")
+    parser.add_argument("--players", type=int, default=50_000, help="players in the demo session")
+    parser.add_argument("--budget-mb", type=int, default=DEFAULT_MEMORY_BUDGET // 2**20,
+                        help="memory budget for the tracer's bookkeeping")
+    parser.add_argument("--dot", help="write the graph in Graphviz DOT format")
+    parser.add_argument("--json", help="write the graph as JSON")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("ALIAS TRACER")
+    print("=" * 50)
+    session = make_session(args.players)
+    graph = trace_aliases({"session": session}, args.budget_mb * 2**20)
+    print(format_report(graph, limit=5))
+    if args.dot:
+        graph.write_dot(args.dot)
+        print(f"\nDOT graph saved to {args.dot}")
+    if args.json:
+        graph.write_json(args.json)
+        print(f"JSON graph saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
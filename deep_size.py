@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Deep Memory Size Reporter
+=========================
+
+sys.getsizeof() only reports the shallow size of an object: a list's
+size does not include the objects it contains. deep_sizeof() walks the
+whole object graph instead and adds everything up.
+
+- Objects are de-duplicated by id(), so shared and aliased objects (like
+  the nested list in a shallow copy) are counted exactly once.
+- The walk is iterative and breadth-first using gc.get_referents(), so
+  deep graphs never hit the recursion limit and each object is visited
+  once (linear time, even for millions of objects). Every object except
+  the leaf types (strings, bytes and numbers) is followed - including
+  dicts and tuples the garbage collector has stopped tracking because
+  they only hold strings and numbers.
+- Usage is broken down by type.
+
+Classes, modules and functions are shared by the whole program, so they
+are not counted as part of any object graph.
+"""
+
+import gc
+import sys
+import types
+
+# Objects of these types belong to the program, not to the data being sized
+SHARED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    types.CodeType,
+    types.FrameType,
+    type(None),
+    bool,
+)
+
+# Objects of these types hold no references, so their referents are not looked up
+LEAF_TYPES = (str, bytes, int, float, complex, bool, type(None))
+
+# gc.get_referents() is called on at most this many objects at once
+BATCH_SIZE = 10_000
+
+
+def is_shared(obj):
+    """Return True for objects that should not be counted or followed."""
+    return isinstance(obj, SHARED_TYPES)
+
+
+def deep_sizeof(*roots):
+    """Return a report of the memory used by everything reachable from roots.
+
+    The report is a dict:
+        total_bytes   - sum of sys.getsizeof() over every reachable object
+        object_count  - number of distinct objects counted
+        by_type       - {type name: {"count": n, "bytes": b}}, largest first
+    """
+    getsizeof = sys.getsizeof
+    get_referents = gc.get_referents
+    seen = set()
+    seen_add = seen.add
+    # type -> [count, bytes, follow referents, is a dict], or None for shared
+    # types that are skipped. Deciding per type rather than per object keeps the loop to
+    # one lookup.
+    by_type = {}
+    total = 0
+
+    pending = list(roots)
+    while pending:
+        containers = []
+        keys = []
+        for obj in pending:
+            cls = type(obj)
+            try:
+                stats = by_type[cls]
+            except KeyError:
+                if issubclass(cls, SHARED_TYPES):
+                    stats = None
+                else:
+                    stats = [0, 0, not issubclass(cls, LEAF_TYPES), issubclass(cls, dict)]
+                by_type[cls] = stats
+            if stats is None:
+                continue
+            obj_id = id(obj)
+            if obj_id in seen:
+                continue
+            seen_add(obj_id)
+
+            size = getsizeof(obj)
+            total += size
+            stats[0] += 1
+            stats[1] += size
+
+            # Not gc.is_tracked(): CPython untracks dicts and tuples that only
+            # hold atomic values, but those values still need counting
+            if stats[2]:
+                containers.append(obj)
+            # A dict whose keys are all strings does not report them as referents
+            if stats[3]:
+                keys.extend(obj)
+
+        pending = keys
+        for start in range(0, len(containers), BATCH_SIZE):
+            pending.extend(get_referents(*containers[start:start + BATCH_SIZE]))
+
+    counted = [(cls, stats) for cls, stats in by_type.items() if stats is not None]
+    counted.sort(key=lambda item: item[1][1], reverse=True)
+    return {
+        "total_bytes": total,
+        "object_count": len(seen),
+        "by_type": {
+            cls.__qualname__: {"count": count, "bytes": size}
+            for cls, (count, size, _, _) in counted
+        },
+    }
+
+
+def format_report(report, limit=10):
+    """Return a deep_sizeof() report as printable text."""
+    lines = [
+        f"Total: {report['total_bytes']:,} bytes in {report['object_count']:,} objects",
+        f"  {'Type':<20} {'Count':>10} {'Bytes':>14}",
+    ]
+    for name, stats in list(report["by_type"].items())[:limit]:
+        lines.append(f"  {name:<20} {stats['count']:>10,} {stats['bytes']:>14,}")
+    return "\n".join(lines)
+
+
+def main():
+    """Compare shallow and deep sizes on a few examples"""
+    print("=" * 50)
+    print("DEEP MEMORY SIZE REPORT")
+    print("=" * 50)
+
+    nested = [3, 4]
+    original = [1, 2, nested]
+    shallow_copy = original.copy()
+    print("\noriginal = [1, 2, [3, 4]]; shallow_copy = original.copy()")
+    print(f"sys.getsizeof(original): {sys.getsizeof(original)} bytes")
+    print(f"deep size of original:   {deep_sizeof(original)['total_bytes']} bytes")
+    print(f"deep size of both lists: {deep_sizeof(original, shallow_copy)['total_bytes']} bytes"
+          " (the nested list is counted once)")
+
+    session = {
+        "players": [{"name": f"player{i}", "score": i * 100, "power_ups": ["Shield"]}
+                    for i in range(100_000)],
+    }
+    print("\nSession with 100,000 players:")
+    print(format_report(deep_sizeof(session)))
+
+
+if __name__ == "__main__":
+    main()
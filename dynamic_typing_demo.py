@@ -8,8 +8,11 @@ with static typing languages like Java, C++, or TypeScript.
 """
 
 import sys
+import time
 from typing import Any, Union, Optional
 
+from quiz_analytics import record_attempt
+
 
 def demonstrate_dynamic_typing():
     """
@@ -119,6 +122,57 @@ def demonstrate_static_typing_concepts():
     print("In true static languages, the second call would cause a compile-time error.")
 
 
+# Quiz questions; "correct" is the index of the right option.
+# Answer logs refer to questions by position, so only append new ones.
+TYPE_INFERENCE_QUESTIONS = [
+    {
+        "question": "What will be the type of 'x' after this code runs?\nx = 42\nx = 'hello'\nprint(type(x))",
+        "options": ["int", "str", "Union[int, str]", "Any"],
+        "correct": 1,
+        "explanation": "In Python, variables don't have fixed types. The type is determined by the current value."
+    },
+    {
+        "question": "In a static language like Java, what happens if you try to assign a string to an int variable?",
+        "options": ["Runtime error", "Compile-time error", "Automatic conversion", "Works fine"],
+        "correct": 1,
+        "explanation": "Static languages check types at compile time and prevent type mismatches."
+    },
+    {
+        "question": "What is 'duck typing' in Python?",
+        "options": [
+            "A way to create duck objects",
+            "Using type hints for waterfowl",
+            "Objects are judged by their behavior, not their type",
+            "A special typing module for animals"
+        ],
+        "correct": 2,
+        "explanation": "Duck typing means 'if it walks like a duck and quacks like a duck, it's a duck' - behavior matters more than explicit type."
+    },
+    {
+        "question": "What's the main advantage of dynamic typing?",
+        "options": [
+            "Better performance",
+            "More flexibility and less boilerplate",
+            "Fewer bugs",
+            "Better IDE support"
+        ],
+        "correct": 1,
+        "explanation": "Dynamic typing offers flexibility and requires less code, but can lead to runtime errors that static typing would catch earlier."
+    },
+    {
+        "question": "What's the main disadvantage of dynamic typing?",
+        "options": [
+            "Slower execution",
+            "Runtime type errors that could be caught at compile time",
+            "More memory usage",
+            "Harder to read"
+        ],
+        "correct": 1,
+        "explanation": "Type errors that would be caught at compile time in static languages only surface at runtime in dynamic languages."
+    }
+]
+
+
 def type_inference_quiz():
     """
     Interactive quiz on type inference implications.
@@ -127,55 +181,9 @@ def type_inference_quiz():
     print("TYPE INFERENCE QUIZ")
     print("=" * 60)
     
-    questions = [
-        {
-            "question": "What will be the type of 'x' after this code runs?\nx = 42\nx = 'hello'\nprint(type(x))",
-            "options": ["int", "str", "Union[int, str]", "Any"],
-            "correct": 1,
-            "explanation": "In Python, variables don't have fixed types. The type is determined by the current value."
-        },
-        {
-            "question": "In a static language like Java, what happens if you try to assign a string to an int variable?",
-            "options": ["Runtime error", "Compile-time error", "Automatic conversion", "Works fine"],
-            "correct": 1,
-            "explanation": "Static languages check types at compile time and prevent type mismatches."
-        },
-        {
-            "question": "What is 'duck typing' in Python?",
-            "options": [
-                "A way to create duck objects",
-                "Using type hints for waterfowl",
-                "Objects are judged by their behavior, not their type",
-                "A special typing module for animals"
-            ],
-            "correct": 2,
-            "explanation": "Duck typing means 'if it walks like a duck and quacks like a duck, it's a duck' - behavior matters more than explicit type."
-        },
-        {
-            "question": "What's the main advantage of dynamic typing?",
-            "options": [
-                "Better performance",
-                "More flexibility and less boilerplate",
-                "Fewer bugs",
-                "Better IDE support"
-            ],
-            "correct": 1,
-            "explanation": "Dynamic typing offers flexibility and requires less code, but can lead to runtime errors that static typing would catch earlier."
-        },
-        {
-            "question": "What's the main disadvantage of dynamic typing?",
-            "options": [
-                "Slower execution",
-                "Runtime type errors that could be caught at compile time",
-                "More memory usage",
-                "Harder to read"
-            ],
-            "correct": 1,
-            "explanation": "Type errors that would be caught at compile time in static languages only surface at runtime in dynamic languages."
-        }
-    ]
-    
+    questions = TYPE_INFERENCE_QUESTIONS
     score = 0
+    answers = []
     total_questions = len(questions)
     
     for i, q in enumerate(questions, 1):
@@ -185,6 +193,7 @@ def type_inference_quiz():
         for j, option in enumerate(q["options"]):
             print(f"  {j + 1}. {option}")
         
+        asked_at = time.monotonic()
         while True:
             try:
                 answer = int(input("\nYour answer (1-4): ")) - 1
@@ -195,6 +204,8 @@ def type_inference_quiz():
             except ValueError:
                 print("Please enter a valid number.")
         
+        answers.append({"choice": answer, "correct": answer == q["correct"],
+                        "seconds": round(time.monotonic() - asked_at, 2)})
         if answer == q["correct"]:
             print("✅ Correct!")
             score += 1
@@ -203,6 +214,8 @@ def type_inference_quiz():
         
         print(f"Explanation: {q['explanation']}")
     
+    record_attempt("type_inference", answers, score)
+
     print(f"\n" + "=" * 40)
     print(f"QUIZ RESULTS: {score}/{total_questions} correct")
     print("=" * 40)
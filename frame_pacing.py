@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Adaptive Frame Pacing
+=====================
+
+clock.tick(FPS) waits until the next frame is due, but it cannot help
+when the frame itself takes longer than 1/FPS seconds: the game slows
+down and every frame is late. FramePacer adds:
+
+- a frame budget (1000 / fps milliseconds) and timing of the work done
+  in each frame, with counts of late frames and dropped frames (frame
+  slots that passed without a new frame)
+- fixed-rate game updates: begin_frame() says how many updates to run,
+  so game time keeps up with real time even when frames are slow
+- should_redraw(): when the last frame ran over budget, redraws that
+  would only move animations forward are skipped
+- dynamic FPS: under sustained load the frame rate steps down (for
+  example 60 -> 45 -> 30 -> 20) and steps back up once the load drops
+- optional clock.tick_busy_loop() for more precise (but CPU-hungry)
+  frame timing
+
+With adaptive=False it behaves like a plain clock.tick(fps) loop that
+also keeps statistics.
+
+Run this file to simulate an overloaded machine with and without
+adaptive pacing.
+"""
+
+import argparse
+import collections
+import time
+
+import pygame
+
+LOAD_WINDOW = 30       # Frames of work times used to judge the load
+SLOW_DOWN_LOAD = 0.9   # Step the FPS down when work fills this much of the budget
+SPEED_UP_LOAD = 0.6    # Step back up when work would fill less of the faster budget
+MAX_CATCH_UP = 5       # Most game updates run in a single frame
+
+
+class FramePacer:
+    """Pace the game loop and keep frame statistics"""
+
+    def __init__(self, fps, adaptive=True, busy_loop=False, min_fps=None):
+        self.target_fps = fps
+        self.fps = fps
+        self.adaptive = adaptive
+        self.busy_loop = busy_loop
+        if min_fps is None:
+            min_fps = max(1, fps // 3)
+        # Frame rates to step through under load, fastest first
+        self.levels = sorted({rate for rate in (fps, fps * 3 // 4, fps // 2, fps // 3)
+                              if rate >= min_fps} | {fps}, reverse=True)
+        self.clock = pygame.time.Clock()
+        self.behind = False
+
+        self._work_times = collections.deque(maxlen=LOAD_WINDOW)
+        self._frame_start = None
+        self._last_start = None
+        self._pending_updates = 0.0
+
+        self.frames = 0
+        self.late_frames = 0
+        self.dropped_frames = 0
+        self.skipped_redraws = 0
+        self.fps_changes = 0
+        self.total_work = 0.0
+        self.last_work = 0.0
+
+    @property
+    def budget_ms(self):
+        """Milliseconds available for one frame at the current frame rate"""
+        return 1000 / self.fps
+
+    def begin_frame(self):
+        """Start a frame and return how many game updates to run in it"""
+        now = time.perf_counter()
+        self._frame_start = now
+        if not self.adaptive or self._last_start is None:
+            self._last_start = now
+            return 1
+        # Game updates happen at target_fps per second of real time
+        self._pending_updates += (now - self._last_start) * self.target_fps
+        self._last_start = now
+        updates = int(self._pending_updates + 0.5)
+        self._pending_updates -= updates
+        if updates > MAX_CATCH_UP:
+            # Too far behind to catch up: let game time slip instead
+            updates = MAX_CATCH_UP
+            self._pending_updates = 0.0
+        return updates
+
+    def should_redraw(self, essential=True):
+        """Return False if this redraw can be skipped to catch up.
+
+        Pass essential=False when only animations changed since the last
+        redraw; those are skipped while the pacer is behind.
+        """
+        if essential or not self.adaptive or not self.behind:
+            return True
+        self.skipped_redraws += 1
+        return False
+
+    def end_frame(self):
+        """Finish the frame: record its timing, adapt the FPS and wait"""
+        work = time.perf_counter() - self._frame_start
+        budget = 1 / self.fps
+        self.frames += 1
+        self.total_work += work
+        self.last_work = work
+        self.behind = work > budget
+        if self.behind:
+            self.late_frames += 1
+            # Every whole budget the frame overran is a frame slot with no new frame
+            self.dropped_frames += int(work / budget)
+
+        if self.adaptive:
+            self._work_times.append(work)
+            self._adapt()
+
+        if self.busy_loop:
+            self.clock.tick_busy_loop(self.fps)
+        else:
+            self.clock.tick(self.fps)
+
+    def _adapt(self):
+        """Step the FPS down under sustained load and back up when it passes"""
+        if len(self._work_times) < LOAD_WINDOW:
+            return
+        average = sum(self._work_times) / len(self._work_times)
+        level = self.levels.index(self.fps)
+        if average > SLOW_DOWN_LOAD / self.fps and level + 1 < len(self.levels):
+            self.fps = self.levels[level + 1]
+        elif level > 0 and average < SPEED_UP_LOAD / self.levels[level - 1]:
+            self.fps = self.levels[level - 1]
+        else:
+            return
+        self.fps_changes += 1
+        self._work_times.clear()
+
+    def stats(self):
+        """Return the frame statistics as a dict"""
+        return {
+            "frames": self.frames,
+            "late_frames": self.late_frames,
+            "dropped_frames": self.dropped_frames,
+            "skipped_redraws": self.skipped_redraws,
+            "fps_changes": self.fps_changes,
+            "target_fps": self.target_fps,
+            "current_fps": self.fps,
+            "average_work_ms": self.total_work / self.frames * 1000 if self.frames else 0.0,
+        }
+
+    def report(self):
+        """Return the frame statistics as printable text"""
+        stats = self.stats()
+        frames = max(stats["frames"], 1)
+        return "\n".join([
+            f"Frames: {stats['frames']} (average work {stats['average_work_ms']:.2f} ms)",
+            f"Late frames: {stats['late_frames']} ({stats['late_frames'] / frames:.1%})",
+            f"Dropped frames: {stats['dropped_frames']}",
+            f"Skipped redraws: {stats['skipped_redraws']}",
+            f"FPS: {stats['current_fps']} of {stats['target_fps']} "
+            f"({stats['fps_changes']} changes)",
+        ])
+
+
+# ========================================
+# Simulation
+# ========================================
+
+def simulate(pacer, seconds, update_ms, draw_ms, load_phases):
+    """Run a fake game loop whose work slows down during load_phases.
+
+    load_phases is a list of (start, end, factor) in seconds: between
+    start and end every update and draw takes factor times longer.
+    Returns the number of game updates run.
+    """
+    start = time.perf_counter()
+    updates = 0
+    while True:
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return updates
+        factor = 1.0
+        for phase_start, phase_end, phase_factor in load_phases:
+            if phase_start <= elapsed < phase_end:
+                factor = phase_factor
+        steps = pacer.begin_frame()
+        for _ in range(steps):
+            time.sleep(update_ms * factor / 1000)
+        updates += steps
+        # Every other frame only has animation changes
+        if pacer.should_redraw(essential=pacer.frames % 2 == 0):
+            time.sleep(draw_ms * factor / 1000)
+        pacer.end_frame()
+
+
+def main():
+    """Compare fixed and adaptive pacing on a simulated overloaded machine"""
+    parser = argparse.ArgumentParser(description="Simulate frame pacing under load")
+    parser.add_argument("--seconds", type=float, default=6.0, help="length of each run")
+    parser.add_argument("--fps", type=int, default=60, help="target frame rate")
+    parser.add_argument("--busy-loop", action="store_true", help="pace with tick_busy_loop()")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("ADAPTIVE FRAME PACING SIMULATION")
+    print("=" * 50)
+    # Normally 1 ms updates and 8 ms draws; 3x slower in the middle of the run
+    third = args.seconds / 3
+    phases = [(third, 2 * third, 3.0)]
+    print(f"Target {args.fps} FPS, work is 3x slower from {third:.1f}s to {2 * third:.1f}s\n")
+
+    pygame.init()
+    for adaptive in (False, True):
+        pacer = FramePacer(args.fps, adaptive=adaptive, busy_loop=args.busy_loop)
+        updates = simulate(pacer, args.seconds, update_ms=1, draw_ms=8, load_phases=phases)
+        print(f"--- {'adaptive' if adaptive else 'fixed'} pacing ---")
+        print(pacer.report())
+        print(f"Game updates: {updates} (real time needs {int(args.seconds * args.fps)})\n")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
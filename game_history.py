@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Game State History (Rewind / Undo)
+==================================
+
+Keeps the most recent frames of game state in a preallocated ring buffer
+so the game can rewind to any earlier frame.
+
+Every frame is stored as one fixed-width binary record inside a single
+bytearray, so recording a frame allocates no new Python objects and the
+garbage collector never sees the history:
+
+    player_health  int32
+    score          int64
+    status         uint8   (interned string id)
+    level          uint16
+    power_ups      3 x uint8 (interned string ids, 0 = empty slot)
+
+That is 18 bytes per frame - one hour at 60 FPS is about 4 MB.
+
+A byte holds 255 string ids. Each id counts the recorded frames that
+use it and is freed as soon as none does, so a game can go through any
+number of statuses. Only if the history itself holds 255 different
+strings are its oldest frames dropped, one by one, to make room.
+"""
+
+import struct
+
+# Fixed-width record layout (little-endian, no padding)
+SNAPSHOT_FORMAT = struct.Struct("<iqBH3B")
+SNAPSHOT_SIZE = SNAPSHOT_FORMAT.size
+# The status and power-up ids of a record (skipping the level)
+STRING_IDS_FORMAT = struct.Struct("<B2x3B")
+STRING_IDS_OFFSET = struct.calcsize("<iq")
+
+# Power-ups are capped at 3 by add_power_up(), so 3 slots are enough
+POWER_UP_SLOTS = 3
+
+
+class StringInterner:
+    """Map strings to small integer ids so they fit in one byte.
+
+    Id 0 is reserved for "no value" (an empty power-up slot). Every
+    intern() of a string counts as one reference to its id; release()
+    drops one, and an id with no references left is reused.
+    """
+
+    def __init__(self, limit=255):
+        self.limit = limit
+        self._ids = {}
+        self._names = [None]
+        self._refs = [0]
+        self._free = []
+
+    def intern(self, name):
+        """Return the id for name (assigning a new one if needed) and add a reference.
+
+        Raises ValueError if all ids are in use.
+        """
+        ident = self._ids.get(name)
+        if ident is None:
+            if self._free:
+                ident = self._free.pop()
+                self._names[ident] = name
+            else:
+                ident = len(self._names)
+                if ident > self.limit:
+                    raise ValueError(f"Too many distinct strings to intern (limit {self.limit})")
+                self._names.append(name)
+                self._refs.append(0)
+            self._ids[name] = ident
+        self._refs[ident] += 1
+        return ident
+
+    def retain(self, ident):
+        """Add a reference to an id that is already assigned (id 0 is ignored)."""
+        if ident:
+            self._refs[ident] += 1
+
+    def release(self, ident):
+        """Drop one reference to an id, freeing it for reuse when none are left."""
+        if ident:
+            refs = self._refs[ident] = self._refs[ident] - 1
+            if refs == 0:
+                del self._ids[self._names[ident]]
+                self._names[ident] = None
+                self._free.append(ident)
+
+    def in_use(self):
+        """Return the set of ids currently assigned."""
+        return set(self._ids.values())
+
+    def name(self, ident):
+        """Return the string for an id (None for id 0)."""
+        return self._names[ident]
+
+
+class GameHistory:
+    """Ring buffer of fixed-width game state snapshots.
+
+    record() is called once per frame from update_game_state(); rewind()
+    moves back to an earlier frame and forgets everything newer, so the
+    game continues recording from the restored state.
+    """
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("History capacity must be at least 1 frame")
+        self.capacity = capacity
+        self._buffer = bytearray(capacity * SNAPSHOT_SIZE)
+        self._head = 0       # Slot the next record() writes to
+        self._count = 0      # Number of valid records in the buffer
+        self._strings = StringInterner()
+
+        # Interned ids are only recomputed when the values change; the
+        # current ids hold a reference of their own, like each recorded frame
+        self._last_status = None
+        self._status_id = 0
+        self._last_power_ups = []
+        self._power_up_ids = (0,) * POWER_UP_SLOTS
+        self._string_ids = (0,) * (1 + POWER_UP_SLOTS)
+
+    def __len__(self):
+        return self._count
+
+    def record(self, player_health, score, status, power_ups, level):
+        """Store the current frame's state, overwriting the oldest frame when full.
+
+        Raises ValueError if a number does not fit its field.
+        """
+        if status != self._last_status:
+            status_id = self._intern(status)
+            self._strings.release(self._status_id)
+            self._status_id = status_id
+            self._last_status = status
+            self._string_ids = (status_id, *self._power_up_ids)
+
+        if power_ups != self._last_power_ups:
+            ids = []
+            for name in power_ups[-POWER_UP_SLOTS:]:
+                ids.append(self._intern(name))
+            ids.extend([0] * (POWER_UP_SLOTS - len(ids)))
+            for ident in self._power_up_ids:
+                self._strings.release(ident)
+            self._power_up_ids = tuple(ids)
+            self._last_power_ups = list(power_ups)
+            self._string_ids = (self._status_id, *self._power_up_ids)
+
+        head = self._head
+        offset = head * SNAPSHOT_SIZE
+        overwritten = self._ids_at(offset) if self._count == self.capacity else None
+        try:
+            SNAPSHOT_FORMAT.pack_into(self._buffer, offset,
+                                      player_health, score, self._status_id, level,
+                                      *self._power_up_ids)
+        except struct.error:
+            raise ValueError(
+                f"State does not fit the history: player_health must fit int32 (got {player_health}), "
+                f"score int64 (got {score}) and level uint16 (got {level})") from None
+        string_ids = self._string_ids
+        if overwritten != string_ids:  # Usually the same strings as the frame overwritten
+            for ident in string_ids:
+                self._strings.retain(ident)
+            for ident in overwritten or ():
+                self._strings.release(ident)
+
+        head += 1
+        self._head = 0 if head == self.capacity else head
+        if self._count < self.capacity:
+            self._count += 1
+
+    def _ids_at(self, offset):
+        return STRING_IDS_FORMAT.unpack_from(self._buffer, offset + STRING_IDS_OFFSET)
+
+    def _intern(self, name):
+        """Intern name; when the ids run out, drop the oldest frames until one is freed."""
+        while True:
+            try:
+                return self._strings.intern(name)
+            except ValueError:
+                if self._count == 0:
+                    raise
+                self._drop_frames(self._head - self._count, 1)
+
+    def _drop_frames(self, first_slot, count):
+        # Release the strings of count frames starting at first_slot
+        for slot in range(first_slot, first_slot + count):
+            for ident in self._ids_at(slot % self.capacity * SNAPSHOT_SIZE):
+                self._strings.release(ident)
+        self._count -= count
+
+    def snapshot(self, frames_ago=0):
+        """Return the state recorded frames_ago frames before the latest one.
+
+        Returns None if that frame is no longer (or not yet) in the history.
+        """
+        if not 0 <= frames_ago < self._count:
+            return None
+        slot = (self._head - 1 - frames_ago) % self.capacity
+        health, score, status_id, level, *power_up_ids = SNAPSHOT_FORMAT.unpack_from(
+            self._buffer, slot * SNAPSHOT_SIZE)
+        name = self._strings.name
+        return {
+            "player_health": health,
+            "score": score,
+            "status": name(status_id),
+            "level": level,
+            "power_ups": [name(ident) for ident in power_up_ids if ident],
+        }
+
+    def rewind(self, frames):
+        """Go back up to `frames` frames and drop every newer frame.
+
+        Rewinding further than the recorded history stops at the oldest
+        frame. Returns the restored state, or None if nothing is recorded.
+        """
+        if self._count == 0:
+            return None
+        frames = max(0, min(frames, self._count - 1))
+        state = self.snapshot(frames)
+        self._head = (self._head - frames) % self.capacity
+        self._drop_frames(self._head, frames)
+        return state
+
+    def clear(self):
+        """Forget all recorded frames."""
+        self._drop_frames(self._head - self._count, self._count)
+        self._head = 0
+
+
+def main():
+    """Small demonstration of recording and rewinding"""
+    print("=" * 50)
+    print("GAME STATE HISTORY DEMO")
+    print("=" * 50)
+
+    history = GameHistory(capacity=5 * 60)  # 5 seconds at 60 FPS
+    health, score, power_ups = 100, 0, []
+    for frame in range(600):
+        if frame % 60 == 0:
+            score += 100
+            health = max(0, health - 5)
+        if frame == 120:
+            power_ups.append("Shield")
+        history.record(health, score, "Alive", power_ups, 1)
+
+    print(f"Frames recorded: {len(history)} of {history.capacity}")
+    print(f"Bytes per frame: {SNAPSHOT_SIZE}")
+    print(f"Latest frame:      {history.snapshot(0)}")
+    print(f"1 second earlier:  {history.snapshot(60)}")
+    print(f"Rewind 2 seconds:  {history.rewind(120)}")
+    print(f"Frames remaining:  {len(history)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Game Metrics
+============
+
+Counters and gauges for monitoring running games, exported in the
+Prometheus text format:
+
+- over HTTP on localhost (http://127.0.0.1:PORT/metrics), or
+- written to a file every few seconds (for node_exporter's textfile
+  collector, or anything else that reads files).
+
+The game loop only does cheap dict updates (inc(), observe()). Values
+that already live somewhere else - the score, the text cache counters -
+are read by collector functions when the metrics are exported, so they
+cost the frame nothing. Exporting (formatting the text, serving HTTP,
+writing the file) always happens on a background daemon thread.
+
+Run this file to serve some example metrics.
+"""
+
+import argparse
+import http.server
+import os
+import threading
+import time
+
+# name -> (Prometheus type, help text) for the metrics the game reports
+GAME_METRICS = {
+    "game_frames_rendered_total": ("counter", "Frames drawn"),
+    "game_events_total": ("counter", "Events handled, by event type"),
+    "game_update_duration_seconds": ("summary", "Time spent in update_game_state()"),
+    "game_draw_duration_seconds": ("summary", "Time spent in draw_everything()"),
+    "game_score": ("gauge", "Current score"),
+    "game_player_health": ("gauge", "Current player health"),
+    "game_text_cache_hits_total": ("counter", "Rendered text served from the cache"),
+    "game_text_cache_misses_total": ("counter", "Text that had to be rendered"),
+    "game_text_cache_hit_ratio": ("gauge", "Fraction of text lookups served from the cache"),
+    "game_late_frames_total": ("counter", "Frames whose work took longer than the frame budget"),
+    "game_dropped_frames_total": ("counter", "Frame slots that passed without a new frame"),
+    "game_fps": ("gauge", "Current target frame rate"),
+}
+
+
+def _escape(value):
+    """Escape a label value for the Prometheus text format"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+class Metrics:
+    """A thread-safe-enough registry of counters, gauges and summaries.
+
+    Only the game thread writes values; exporter threads take a copy of
+    the value dict (a single atomic operation) before formatting it.
+    """
+
+    def __init__(self, descriptions=GAME_METRICS):
+        self.descriptions = dict(descriptions)
+        self._values = {}
+        self._collectors = []
+
+    def inc(self, name, amount=1, **labels):
+        """Add amount to a counter"""
+        key = (name, tuple(labels.items()))
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        """Set a gauge"""
+        self._values[(name, tuple(labels.items()))] = value
+
+    def observe(self, name, seconds):
+        """Record one duration in a summary (exported as _sum and _count)"""
+        values = self._values
+        key = (name + "_sum", ())
+        values[key] = values.get(key, 0.0) + seconds
+        key = (name + "_count", ())
+        values[key] = values.get(key, 0) + 1
+
+    def add_collector(self, collector):
+        """Call collector() at export time; it returns [(name, labels dict, value)]"""
+        self._collectors.append(collector)
+
+    def snapshot(self):
+        """Return {(name, labels): value} with every current value"""
+        values = dict(self._values)
+        for collector in self._collectors:
+            for name, labels, value in collector():
+                values[(name, tuple(labels.items()))] = value
+        return values
+
+    def render(self):
+        """Return the current values in the Prometheus text format"""
+        families = {}
+        for (name, labels), value in self.snapshot().items():
+            family = name
+            for suffix in ("_sum", "_count"):
+                if name.endswith(suffix) and name[:-len(suffix)] in self.descriptions:
+                    family = name[:-len(suffix)]
+            families.setdefault(family, []).append((name, labels, value))
+
+        lines = []
+        for family in sorted(families):
+            kind, help_text = self.descriptions.get(family, ("untyped", ""))
+            if help_text:
+                lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {kind}")
+            for name, labels, value in sorted(families[family], key=lambda sample: sample[:2]):
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# ========================================
+# Exporters
+# ========================================
+
+def start_http_exporter(metrics, port, host="127.0.0.1"):
+    """Serve /metrics on a daemon thread and return a function that stops it"""
+
+    class MetricsHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep the game's console clean
+
+    server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+
+    def stop():
+        server.shutdown()
+        server.server_close()
+
+    return stop
+
+
+def write_metrics_file(metrics, path):
+    """Write the metrics to path atomically (readers never see half a file)"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        f.write(metrics.render())
+    os.replace(temp_path, path)
+
+
+def start_file_exporter(metrics, path, interval=10.0):
+    """Write the metrics to path every interval seconds on a daemon thread.
+
+    Returns a function that stops the thread after a final write.
+    """
+    stopping = threading.Event()
+
+    def run():
+        while True:
+            stopped = stopping.wait(interval)
+            try:
+                write_metrics_file(metrics, path)
+            except OSError as e:
+                print(f"⚠️  Could not write metrics to {path}: {e}")
+            if stopped:
+                return
+
+    thread = threading.Thread(target=run, name="metrics-file", daemon=True)
+    thread.start()
+
+    def stop():
+        stopping.set()
+        thread.join()
+
+    return stop
+
+
+def main():
+    """Serve example metrics until interrupted"""
+    parser = argparse.ArgumentParser(description="Serve example game metrics")
+    parser.add_argument("--port", type=int, default=9108, help="HTTP port on localhost")
+    args = parser.parse_args()
+
+    metrics = Metrics()
+    start = time.perf_counter()
+    metrics.add_collector(lambda: [("game_score", {}, int(time.perf_counter() - start) * 100)])
+    stop = start_http_exporter(metrics, args.port)
+    print(f"Serving example metrics on http://127.0.0.1:{args.port}/metrics (Ctrl+C to stop)")
+    try:
+        while True:
+            metrics.inc("game_frames_rendered_total")
+            metrics.inc("game_events_total", type="KeyDown")
+            metrics.observe("game_draw_duration_seconds", 0.002)
+            time.sleep(1 / 60)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Saved Games
+===========
+
+Saves the full game state in a small, versioned, fixed-layout binary
+file (little-endian, no padding):
+
+    magic            4 bytes  b"GSAV"
+    version          uint16   (currently 1)
+    player_health    int32
+    max_health       int32
+    score            int64
+    status           16 bytes (UTF-8, zero padded; longer statuses are cut)
+    power_ups        3 x uint8 (index into POWER_UP_NAMES + 1, 0 = empty slot)
+    level            uint16
+    health_pulse     uint32
+    score_animation  int32
+    checksum         uint32   (CRC-32 of everything before it)
+
+That is 55 bytes. A save is written to a temporary file, flushed to
+disk with fsync() and then renamed over the old one, so a power cut
+leaves either the old save or the new one - never half of each.
+
+Autosaver writes saves on a background thread: the game loop only
+encodes the state (a few microseconds) and hands the bytes over. If the
+disk is slow, only the newest state is written.
+"""
+
+import os
+import struct
+import tempfile
+import threading
+import timeit
+import zlib
+
+SAVE_MAGIC = b"GSAV"
+SAVE_VERSION = 1
+HEADER_FORMAT = struct.Struct("<4sH")
+# Version -> layout of the state that follows the header
+STATE_FORMATS = {
+    1: struct.Struct("<iiq16s3BHIi"),
+}
+CHECKSUM_FORMAT = struct.Struct("<I")
+
+STATUS_SIZE = 16
+POWER_UP_SLOTS = 3
+# The game's power-ups (the template picks from this list too). Codes are
+# stored in save files and the live state: only ever append to this list
+POWER_UP_NAMES = ["Speed Boost", "Shield", "Double Points", "Health Regen", "Fire Power"]
+POWER_UP_CODES = {name: code for code, name in enumerate(POWER_UP_NAMES, start=1)}
+
+
+class SaveError(Exception):
+    """A save file is missing, damaged or from an unknown version"""
+
+
+def encode_status(status):
+    """Return status as UTF-8, cut to STATUS_SIZE bytes at a character boundary"""
+    return status.encode("utf-8")[:STATUS_SIZE].decode("utf-8", "ignore").encode("utf-8")
+
+
+def encode_save(player_health, max_health, score, status, power_ups, level,
+                health_pulse, score_animation):
+    """Return the game state as the bytes of a save file.
+
+    Raises ValueError for power-ups that can't be saved, and struct.error
+    for numbers that don't fit their field.
+    """
+    if len(power_ups) > POWER_UP_SLOTS:
+        raise ValueError(f"At most {POWER_UP_SLOTS} power-ups can be saved")
+    try:
+        slots = [POWER_UP_CODES[name] for name in power_ups]
+    except KeyError as e:
+        raise ValueError(f"Unknown power-up: {e.args[0]}") from None
+    slots += [0] * (POWER_UP_SLOTS - len(slots))
+
+    data = (HEADER_FORMAT.pack(SAVE_MAGIC, SAVE_VERSION)
+            + STATE_FORMATS[SAVE_VERSION].pack(player_health, max_health, score,
+                                               encode_status(status),
+                                               *slots, level, health_pulse, score_animation))
+    return data + CHECKSUM_FORMAT.pack(zlib.crc32(data))
+
+
+def decode_save(data):
+    """Return the game state in save file bytes as a dict.
+
+    Raises SaveError if the data is damaged or from an unknown version.
+    """
+    if len(data) < HEADER_FORMAT.size:
+        raise SaveError("Save file is too short")
+    magic, version = HEADER_FORMAT.unpack_from(data)
+    if magic != SAVE_MAGIC:
+        raise SaveError("Not a save file")
+    state_format = STATE_FORMATS.get(version)
+    if state_format is None:
+        raise SaveError(f"Unsupported save version {version}")
+    end = HEADER_FORMAT.size + state_format.size
+    if len(data) != end + CHECKSUM_FORMAT.size:
+        raise SaveError("Save file has the wrong size")
+    (checksum,) = CHECKSUM_FORMAT.unpack_from(data, end)
+    if zlib.crc32(data[:end]) != checksum:
+        raise SaveError("Save file is damaged (checksum mismatch)")
+
+    (player_health, max_health, score, status, slot1, slot2, slot3,
+     level, health_pulse, score_animation) = state_format.unpack_from(data, HEADER_FORMAT.size)
+    try:
+        power_ups = [POWER_UP_NAMES[code - 1] for code in (slot1, slot2, slot3) if code]
+    except IndexError:
+        raise SaveError("Save file contains an unknown power-up") from None
+    return {
+        "player_health": player_health,
+        "max_health": max_health,
+        "score": score,
+        "status": status.rstrip(b"\0").decode("utf-8"),
+        "power_ups": power_ups,
+        "level": level,
+        "health_pulse": health_pulse,
+        "score_animation": score_animation,
+    }
+
+
+def write_save_file(path, data):
+    """Replace the save at path with data, surviving a power cut at any point"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    # Make the rename itself durable (directories can't be opened on Windows)
+    if hasattr(os, "O_DIRECTORY"):
+        directory = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+
+def read_save_file(path):
+    """Return the game state saved at path as a dict (see decode_save())"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        raise SaveError(f"Could not read {path}: {e}") from e
+    return decode_save(data)
+
+
+class Autosaver:
+    """Write saves on a background thread.
+
+    submit() only stores the bytes in a one-item slot and wakes the
+    writer, so it never waits for the disk. A newer submit() replaces a
+    save that has not been written yet.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.saves_written = 0
+        self.last_error = None
+        self._pending = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def submit(self, data):
+        """Queue save file bytes for writing"""
+        with self._lock:
+            self._pending = data
+        self._wake.set()
+
+    def close(self):
+        """Write any pending save and stop the thread"""
+        with self._lock:
+            self._stopping = True
+        self._wake.set()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                data, self._pending = self._pending, None
+                stopping = self._stopping
+            if data is not None:
+                try:
+                    write_save_file(self.path, data)
+                    self.saves_written += 1
+                except OSError as e:
+                    self.last_error = e
+                    print(f"⚠️  Autosave to {self.path} failed: {e}")
+            if stopping:
+                return
+
+
+def main():
+    """Save, load and damage an example game state"""
+    print("=" * 50)
+    print("SAVED GAMES")
+    print("=" * 50)
+    state = {"player_health": 70, "max_health": 100, "score": 1200, "status": "Alive",
+             "power_ups": ["Shield", "Fire Power"], "level": 3, "health_pulse": 4521,
+             "score_animation": 0}
+    data = encode_save(**state)
+    print(f"Save size: {len(data)} bytes")
+    seconds = min(timeit.repeat(lambda: encode_save(**state), number=10_000, repeat=3)) / 10_000
+    print(f"Capturing the state takes {seconds * 1e6:.2f} microseconds")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "game_save.bin")
+        saver = Autosaver(path)
+        saver.submit(data)
+        saver.close()
+        print(f"Loaded back unchanged: {read_save_file(path) == state}")
+
+    damaged = bytearray(data)
+    damaged[10] ^= 0xFF
+    try:
+        decode_save(bytes(damaged))
+    except SaveError as e:
+        print(f"Damaged save detected: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,8 +14,18 @@ Requirements: pip install pygame
 """
 
 import pygame
+import os
 import sys
 import math
+import struct
+import time
+
+from frame_pacing import FramePacer
+from game_history import GameHistory
+from game_metrics import Metrics, start_file_exporter, start_http_exporter
+from game_save import POWER_UP_NAMES, Autosaver, SaveError, encode_save, read_save_file
+from live_state import LiveStateError, LiveStatePublisher
+from render_backends import create_backend
 
 # Initialize Pygame
 pygame.init()
@@ -24,6 +34,33 @@ pygame.init()
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
+REWIND_SECONDS = 30      # How much history the rewind key can reach
+# "surface" (pygame.draw + blits) or "renderer" (SDL2 Renderer/Texture)
+RENDER_BACKEND = os.environ.get("GAME_RENDER_BACKEND", "surface")
+# "fixed" (always FPS) or "adaptive" (skips animation redraws and lowers the
+# FPS when the machine can't keep up; see frame_pacing.py)
+FRAME_PACING = os.environ.get("GAME_FRAME_PACING", "fixed")
+# tick_busy_loop() paces frames more precisely but keeps a CPU core busy
+BUSY_LOOP_PACING = os.environ.get("GAME_BUSY_LOOP") == "1"
+# Saved game (see game_save.py): autosaved in the background, and only
+# loaded at start when GAME_AUTOLOAD=1 (F9 loads it at any time). It is kept
+# next to this file, not in the working directory; GAME_SAVE_FILE= (empty)
+# turns saving off, for test harnesses
+SAVE_FILE = os.environ.get("GAME_SAVE_FILE",
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_save.bin"))
+AUTOLOAD = os.environ.get("GAME_AUTOLOAD") == "1"
+AUTOSAVE_SECONDS = 5
+# Monitoring (see game_metrics.py): serve Prometheus metrics on this localhost
+# port, and/or write them to this file every METRICS_INTERVAL seconds
+METRICS_PORT = int(os.environ.get("GAME_METRICS_PORT", "0"))
+METRICS_FILE = os.environ.get("GAME_METRICS_FILE")
+METRICS_INTERVAL = 10
+# Shared memory name to publish the live state to (see live_state.py); unset = off
+LIVE_STATE_NAME = os.environ.get("GAME_LIVE_STATE")
+# The only events the game uses; SDL drops everything else (mouse motion, ...)
+ALLOWED_EVENTS = [pygame.QUIT, pygame.KEYDOWN]
+# Keys whose action does nothing more when repeated within one frame
+NON_STACKING_KEYS = {pygame.K_r, pygame.K_ESCAPE, pygame.K_F5, pygame.K_F9}
 
 # Colors (RGB)
 BLACK = (0, 0, 0)
@@ -52,28 +89,92 @@ DARK_RED = (128, 0, 0)
 health_pulse = 0         # Counter for health bar animation
 score_animation = 0      # Counter for score animation effect
 
+# Rewind history (one compact snapshot per frame)
+history = GameHistory(REWIND_SECONDS * FPS)
+
+# Writes saves off the game loop's thread (created in run_game)
+autosaver = None
+
+# Counters and timings for monitoring
+metrics = Metrics()
+metrics_exporters = []   # Functions that stop the running exporters
+frame_hooks = []         # Functions called at the start of every frame (see hot_reload.py)
+live_state = None        # Publishes the state for monitors (see live_state.py)
+
 # Pygame objects
-screen = None
+backend = None           # Everything is drawn through this (see render_backends.py)
+screen = None            # The display surface (surface backend only)
+pacer = None             # Frame timing (see frame_pacing.py)
 clock = None
 font = None
 small_font = None
+control_blits = None     # The controls list never changes, so it is rendered once
 
 def initialize_pygame():
     """Initialize pygame display and fonts"""
-    global screen, clock, font, small_font
+    global backend, screen, pacer, clock, font, small_font
     
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("Game UI Demo - Health, Status & Score")
-    clock = pygame.time.Clock()
+    backend = create_backend(RENDER_BACKEND, "Game UI Demo - Health, Status & Score",
+                             (SCREEN_WIDTH, SCREEN_HEIGHT))
+    screen = getattr(backend, "surface", None)
+    pacer = FramePacer(FPS, adaptive=FRAME_PACING == "adaptive", busy_loop=BUSY_LOOP_PACING)
+    clock = pacer.clock
     font = pygame.font.Font(None, 36)
     small_font = pygame.font.Font(None, 24)
+    
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(ALLOWED_EVENTS)
+    
+    start_metrics()
+    start_live_state()
+
+def collect_metrics():
+    """Values read when the metrics are exported (on the exporter's thread)"""
+    lookups = backend.cache_hits + backend.cache_misses
+    stats = pacer.stats()
+    return [
+        ("game_score", {}, score),
+        ("game_player_health", {}, player_health),
+        ("game_text_cache_hits_total", {}, backend.cache_hits),
+        ("game_text_cache_misses_total", {}, backend.cache_misses),
+        ("game_text_cache_hit_ratio", {}, backend.cache_hits / lookups if lookups else 0.0),
+        ("game_late_frames_total", {}, stats["late_frames"]),
+        ("game_dropped_frames_total", {}, stats["dropped_frames"]),
+        ("game_fps", {}, stats["current_fps"]),
+    ]
+
+def start_metrics():
+    """Start the metrics exporters configured by GAME_METRICS_PORT/GAME_METRICS_FILE"""
+    if not METRICS_PORT and not METRICS_FILE:
+        return
+    metrics.add_collector(collect_metrics)
+    if METRICS_PORT:
+        try:
+            metrics_exporters.append(start_http_exporter(metrics, METRICS_PORT))
+            print(f"Metrics: http://127.0.0.1:{METRICS_PORT}/metrics")
+        except OSError as e:
+            print(f"⚠️  Could not serve metrics on port {METRICS_PORT}: {e}")
+    if METRICS_FILE:
+        metrics_exporters.append(start_file_exporter(metrics, METRICS_FILE, METRICS_INTERVAL))
+        print(f"Metrics: written to {METRICS_FILE} every {METRICS_INTERVAL}s")
+
+def start_live_state():
+    """Publish the live state to the shared memory named by GAME_LIVE_STATE"""
+    global live_state
+    if not LIVE_STATE_NAME or live_state is not None:
+        return
+    try:
+        live_state = LiveStatePublisher(LIVE_STATE_NAME)
+        print(f"Live state: shared memory {LIVE_STATE_NAME!r} (python live_state.py {LIVE_STATE_NAME})")
+    except (OSError, LiveStateError) as e:
+        print(f"⚠️  Could not publish the live state: {e}")
 
 def draw_health_bar(x, y, width, height, current_health, max_health):
     """Draw a health bar with color changes based on health level"""
     global health_pulse
     
     # Background (dark red)
-    pygame.draw.rect(screen, DARK_RED, (x, y, width, height))
+    backend.rect(DARK_RED, (x, y, width, height))
     
     # Calculate health percentage and bar width
     health_percentage = current_health / max_health
@@ -91,16 +192,16 @@ def draw_health_bar(x, y, width, height, current_health, max_health):
         color = (min(255, color[0] + pulse), color[1], color[2])
     
     # Draw health bar
-    pygame.draw.rect(screen, color, (x, y, bar_width, height))
+    backend.rect(color, (x, y, bar_width, height))
     
     # Draw border
-    pygame.draw.rect(screen, WHITE, (x, y, width, height), 2)
+    backend.rect(WHITE, (x, y, width, height), 2)
     
     # Draw health text
     health_text = f"{current_health}/{max_health}"
-    text_surface = small_font.render(health_text, True, WHITE)
+    text_surface = backend.text(small_font, health_text, WHITE)
     text_rect = text_surface.get_rect(center=(x + width//2, y + height//2))
-    screen.blit(text_surface, text_rect)
+    backend.blits([(text_surface, text_rect.topleft)])
 
 def draw_status_panel(x, y):
     """Draw player status information"""
@@ -108,28 +209,33 @@ def draw_status_panel(x, y):
     
     # Status background
     status_bg = pygame.Rect(x, y, 300, 120)
-    pygame.draw.rect(screen, GRAY, status_bg)
-    pygame.draw.rect(screen, WHITE, status_bg, 2)
+    backend.rect(GRAY, status_bg)
+    backend.rect(WHITE, status_bg, 2)
+    
+    # Collect all text for this panel and draw it in one batch
+    blits = []
     
     # Status text
-    status_text = font.render(f"Status: {status}", True, WHITE)
-    screen.blit(status_text, (x + 10, y + 10))
+    status_text = backend.text(font, f"Status: {status}", WHITE)
+    blits.append((status_text, (x + 10, y + 10)))
     
     # Level
-    level_text = small_font.render(f"Level: {level}", True, WHITE)
-    screen.blit(level_text, (x + 10, y + 40))
+    level_text = backend.text(small_font, f"Level: {level}", WHITE)
+    blits.append((level_text, (x + 10, y + 40)))
     
     # Power-ups
     if power_ups:
-        power_text = small_font.render("Power-ups:", True, WHITE)
-        screen.blit(power_text, (x + 10, y + 60))
+        power_text = backend.text(small_font, "Power-ups:", WHITE)
+        blits.append((power_text, (x + 10, y + 60)))
         
         for i, power_up in enumerate(power_ups):
-            power_item = small_font.render(f"• {power_up}", True, YELLOW)
-            screen.blit(power_item, (x + 20, y + 80 + i * 20))
+            power_item = backend.text(small_font, f"• {power_up}", YELLOW)
+            blits.append((power_item, (x + 20, y + 80 + i * 20)))
     else:
-        no_power_text = small_font.render("No power-ups active", True, GRAY)
-        screen.blit(no_power_text, (x + 10, y + 60))
+        no_power_text = backend.text(small_font, "No power-ups active", GRAY)
+        blits.append((no_power_text, (x + 10, y + 60)))
+    
+    backend.blits(blits)
 
 
 def draw_score_panel(x, y):
@@ -138,26 +244,32 @@ def draw_score_panel(x, y):
     
     # Score background
     score_bg = pygame.Rect(x, y, 200, 80)
-    pygame.draw.rect(screen, BLUE, score_bg)
-    pygame.draw.rect(screen, WHITE, score_bg, 2)
+    backend.rect(BLUE, score_bg)
+    backend.rect(WHITE, score_bg, 2)
     
     # Score text with animation
-    score_text = font.render(f"Score: {score}", True, WHITE) 
+    score_text = backend.text(font, f"Score: {score}", WHITE) 
+    text_rect = score_text.get_rect()
     
     # Add a subtle animation when score changes
     if score_animation > 0:                                   
         scale = 1.0 + (score_animation * 0.1)
-        # Simple scaling effect
-        score_text = pygame.transform.scale(score_text, 
-            (int(score_text.get_width() * scale), 
-             int(score_text.get_height() * scale)))
+        # Simple scaling effect (the text is stretched to fill text_rect)
+        text_rect.size = (int(text_rect.width * scale), 
+                          int(text_rect.height * scale))
         score_animation -= 1                                
     
-    text_rect = score_text.get_rect(center=(x + 100, y + 40))
-    screen.blit(score_text, text_rect)
+    text_rect.center = (x + 100, y + 40)
+    backend.stretch(score_text, text_rect)
 
 def draw_controls_info():
     """Draw control instructions"""
+    global control_blits
+    
+    if control_blits is not None:
+        backend.blits(control_blits)
+        return
+    
     controls = [
         "Controls:",
         "H - Heal (+10)",
@@ -165,22 +277,25 @@ def draw_controls_info():
         "S - Add Score (+100)",
         "P - Add Power-up",
         "R - Reset Game",
+        "U - Rewind (1 second)",
+        "F5 - Save  F9 - Load",
         "ESC - Quit"
     ]
     
-    y_offset = SCREEN_HEIGHT - 200
+    y_offset = SCREEN_HEIGHT - 225
+    control_blits = []
     for i, control in enumerate(controls):
         color = YELLOW if i == 0 else WHITE
         font_to_use = font if i == 0 else small_font
-        text = font_to_use.render(control, True, color)
-        screen.blit(text, (10, y_offset + i * 25))
+        text = backend.text(font_to_use, control, color)
+        control_blits.append((text, (10, y_offset + i * 25)))
+    backend.blits(control_blits)
 
 def add_power_up():
     """Add a random power-up"""
     global power_ups
-    power_ups_list = ["Speed Boost", "Shield", "Double Points", "Health Regen", "Fire Power"]
     import random
-    new_power = random.choice(power_ups_list)
+    new_power = random.choice(POWER_UP_NAMES)
     if new_power not in power_ups:
         power_ups.append(new_power)
         # Limit to 3 power-ups
@@ -197,6 +312,70 @@ def update_game_state():
     if len(power_ups) > 0 and health_pulse % 300 == 0:  
         power_ups.pop(0)                                
 
+    # Remember this frame so it can be rewound later
+    history.record(player_health, score, status, power_ups, level)
+    
+    # Let monitors on this machine see the state (a few hundred nanoseconds)
+    if live_state is not None:
+        live_state.publish(player_health, max_health, score, level, status, power_ups,
+                           pacer.frames, pacer.fps, pacer.last_work * 1000,
+                           pacer.late_frames, pacer.dropped_frames)
+
+def rewind_game(frames):
+    """Restore the game state recorded `frames` frames ago"""
+    global player_health, score, status, power_ups, level
+
+    snapshot = history.rewind(frames)
+    if snapshot is None:
+        return
+    player_health = snapshot["player_health"]
+    score = snapshot["score"]
+    status = snapshot["status"]
+    power_ups = snapshot["power_ups"]
+    level = snapshot["level"]
+
+def capture_state():
+    """Return the game state as a dict (what a save file holds)"""
+    return {"player_health": player_health, "max_health": max_health, "score": score,
+            "status": status, "power_ups": list(power_ups), "level": level,
+            "health_pulse": health_pulse, "score_animation": score_animation}
+
+def save_game():
+    """Capture the game state and hand it to the autosave thread"""
+    if autosaver is None:
+        return
+    try:
+        autosaver.submit(encode_save(**capture_state()))
+    except (ValueError, struct.error) as e:
+        print(f"⚠️  Could not save the game: {e}")
+
+def load_game():
+    """Restore the game state from SAVE_FILE (returns False if there is no usable save)"""
+    if not SAVE_FILE:
+        return False
+    try:
+        state = read_save_file(SAVE_FILE)
+    except SaveError as e:
+        if os.path.exists(SAVE_FILE):
+            print(f"⚠️  Could not load {SAVE_FILE}: {e}")
+        return False
+    apply_state(state)
+    return True
+
+def apply_state(state):
+    """Restore a game state returned by capture_state() or read from a save"""
+    global player_health, max_health, score, status, power_ups, level
+    global health_pulse, score_animation
+
+    player_health = state["player_health"]
+    max_health = state["max_health"]
+    score = state["score"]
+    status = state["status"]
+    power_ups = state["power_ups"]
+    level = state["level"]
+    health_pulse = state["health_pulse"]
+    score_animation = state["score_animation"]
+
 # ========================================
 # STUDENT TEMPLATE: USER INPUT SECTION
 # ========================================
@@ -222,6 +401,12 @@ def handle_input(event):
 
         elif event.key == pygame.K_r:  # Reset
             reset_game()
+        elif event.key == pygame.K_u:  # Rewind one second
+            rewind_game(FPS)
+        elif event.key == pygame.K_F5:  # Save
+            save_game()
+        elif event.key == pygame.K_F9:  # Load the last save
+            load_game()
         elif event.key == pygame.K_ESCAPE:  # Quit
             return False
     return True
@@ -248,12 +433,12 @@ def draw_everything():
     """Draw everything to the screen"""
     global player_health, max_health
     
-    screen.fill(BLACK)
+    backend.clear(BLACK)
     
     # Draw title
-    title = font.render("Game UI Demo", True, WHITE)
+    title = backend.text(font, "Game UI Demo", WHITE)
     title_rect = title.get_rect(center=(SCREEN_WIDTH//2, 30))
-    screen.blit(title, title_rect)
+    backend.blits([(title, title_rect.topleft)])
     
     # Draw health bar
     draw_health_bar(50, 80, 300, 40, player_health, max_health)
@@ -268,36 +453,111 @@ def draw_everything():
     draw_controls_info()
     
     # Draw some decorative elements
-    pygame.draw.circle(screen, GREEN, (700, 100), 20)
-    pygame.draw.circle(screen, RED, (750, 100), 20)
-    pygame.draw.circle(screen, BLUE, (725, 130), 15)
+    backend.circle(GREEN, (700, 100), 20)
+    backend.circle(RED, (750, 100), 20)
+    backend.circle(BLUE, (725, 130), 15)
     
-    pygame.display.flip()
+    backend.present()
 
-def run_game():
-    """Main game loop"""
+def collect_input():
+    """Read this frame's events in one batch and fold repeated key presses
+    
+    Returns a list of (event, count): a key pressed several times in a row
+    becomes one entry with the number of presses.
+    """
+    actions = []
+    for event in pygame.event.get():
+        metrics.inc("game_events_total", type=pygame.event.event_name(event.type))
+        if (actions and event.type == pygame.KEYDOWN
+                and actions[-1][0].type == pygame.KEYDOWN
+                and actions[-1][0].key == event.key):
+            actions[-1][1] += 1
+        else:
+            actions.append([event, 1])
+    return actions
+
+def handle_repeated_input(event, count):
+    """Handle count presses of the same key, read in one frame
+    
+    Every press goes through handle_input(), so the game behaves the same
+    however fast the keys are pressed; only R, ESC, F5 and F9 (where a
+    second press changes nothing) are handled once.
+    """
+    if event.key in NON_STACKING_KEYS:
+        count = 1
+    for _ in range(count):
+        if not handle_input(event):
+            return False
+    return True
+
+def run_game(initial_state=None):
+    """Main game loop (starting from initial_state, a capture_state() dict, if given)"""
+    global autosaver, live_state
     running = True
+    drawn_state = None
     
     print("Game UI Demo Started!")
     print("Use the keyboard controls to interact with the game elements.")
     
+    autosaver = Autosaver(SAVE_FILE) if SAVE_FILE else None
+    if initial_state is not None:
+        apply_state(initial_state)
+    # Continue where the last session stopped (even after a power cut)
+    elif AUTOLOAD and load_game():
+        print(f"Loaded saved game from {SAVE_FILE}")
+    next_autosave = time.monotonic() + AUTOSAVE_SECONDS
+    
     while running:
+        # How many game updates are due (more than one after a slow frame)
+        updates = pacer.begin_frame()
+        for hook in frame_hooks:
+            hook()
+        
         # Handle events
-        for event in pygame.event.get():
+        for event, count in collect_input():
             if event.type == pygame.QUIT:
                 running = False
+                break
+            if event.type == pygame.KEYDOWN:
+                running = handle_repeated_input(event, count)
             else:
                 running = handle_input(event)
+            if not running:
+                break
+        
+        if time.monotonic() >= next_autosave:
+            save_game()
+            next_autosave += AUTOSAVE_SECONDS
         
         # Update game state
-        update_game_state()
+        start = time.perf_counter()
+        for _ in range(updates):
+            update_game_state()
+        if updates:
+            metrics.observe("game_update_duration_seconds", (time.perf_counter() - start) / updates)
         
-        # Draw everything
-        draw_everything()
+        # Draw everything (a frame where only animations moved can be skipped
+        # when the game is running behind)
+        state = (player_health, max_health, score, status, tuple(power_ups), level)
+        if pacer.should_redraw(essential=state != drawn_state):
+            start = time.perf_counter()
+            draw_everything()
+            metrics.observe("game_draw_duration_seconds", time.perf_counter() - start)
+            metrics.inc("game_frames_rendered_total")
+            drawn_state = state
         
         # Control frame rate
-        clock.tick(FPS)
-    
+        pacer.end_frame()
+    
+    save_game()
+    if autosaver is not None:
+        autosaver.close()
+    print(pacer.report())
+    for stop in metrics_exporters:
+        stop()
+    if live_state is not None:
+        live_state.close()
+        live_state = None
     pygame.quit()
     sys.exit()
 
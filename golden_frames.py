@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Golden-Frame Regression Check
+=============================
+
+Makes sure a rendering change (a new backend, a cache, batching, ...)
+leaves every pixel of the game exactly as it was.
+
+1. A script of game states is generated: health at and around every
+   colour threshold, the low-health pulse, score animations, long
+   statuses, every power-up, big scores and levels, plus random mixes.
+2. Each state is drawn offscreen (SDL's dummy video driver) by the
+   template's own draw_everything().
+3. Each frame is hashed with SHA-256 straight from the surface's pixel
+   memory through the buffer protocol - no tobytes()/tostring() copy of
+   the frame, and padded rows are skipped. Like the diff image, only
+   colours count: the unused fourth byte of 32-bit pixels (its contents
+   are undefined) is zeroed in the surface itself before hashing.
+4. --record stores the hashes as the golden set (--images also keeps a
+   PNG of every frame, about 60 MB for the default 2000 frames); a
+   normal run compares against it and saves an image only for frames
+   that differ: a diff (golden | current | changed pixels in red) when
+   the golden PNG was kept, else the current frame.
+
+Thousands of frames are checked in a few seconds. The golden set also
+stores the states, so a check replays exactly what was recorded. Fonts
+differ between pygame/SDL versions, so record on the machine (or CI
+image) that will run the check.
+
+Usage:
+    python golden_frames.py --template my_game.py --record     # before the change
+    python golden_frames.py --template my_game.py              # after it
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+
+import pygame
+
+from game_save import POWER_UP_NAMES
+from template_loader import HERE, TEMPLATE_PATH, load_template
+
+GOLDEN_DIR = os.path.join(HERE, "golden_frames")
+GOLDEN_FILE = "golden.json"
+GOLDEN_VERSION = 2        # 2: the unused pixel byte is no longer hashed
+DEFAULT_FRAMES = 2000
+STATUSES = ["Alive", "Dead", "Poisoned", "Invincible!!", "Critical"]
+DIFF_COLOR = (255, 0, 0)
+MAX_DIFF_IMAGES = 20       # A change usually alters many frames the same way
+
+
+# ========================================
+# Scripted states
+# ========================================
+
+def scripted_states(count, max_health=100, seed=0):
+    """Return count game states: the edge cases first, then random ones"""
+    states = []
+
+    def add(**changes):
+        state = {"player_health": max_health, "max_health": max_health, "score": 0,
+                 "status": "Alive", "power_ups": [], "level": 1,
+                 "health_pulse": 0, "score_animation": 0}
+        state.update(changes)
+        states.append(state)
+
+    # Health around the colour thresholds (60% and 30%)
+    for percent in (0, 1, 29, 30, 31, 59, 60, 61, 99, 100):
+        add(player_health=max_health * percent // 100)
+    # The low-health pulse over one full cycle (sin(pulse * 0.1))
+    for pulse in range(0, 63, 3):
+        add(player_health=max_health // 5, health_pulse=pulse)
+    for animation in range(11):
+        add(score=1200, score_animation=animation)
+    for size in range(len(POWER_UP_NAMES) + 1):
+        add(power_ups=POWER_UP_NAMES[:size][-3:])
+    for status in STATUSES:
+        add(status=status)
+    add(score=10 ** 12, level=999)
+
+    rng = random.Random(seed)
+    while len(states) < count:
+        add(player_health=rng.randint(0, max_health),
+            score=rng.choice([0, 100, rng.randrange(0, 100_000, 100)]),
+            status=rng.choice(STATUSES),
+            power_ups=rng.sample(POWER_UP_NAMES, rng.randint(0, 3)),
+            level=rng.randint(1, 20),
+            health_pulse=rng.randint(0, 1000),
+            score_animation=rng.choice([0, 0, 0, rng.randint(1, 10)]))
+    return states[:count]
+
+
+def apply_state(game, state):
+    for name, value in state.items():
+        setattr(game, name, list(value) if isinstance(value, list) else value)
+
+
+# ========================================
+# Rendering and hashing
+# ========================================
+
+def unused_byte(surface):
+    """Return the offset of the byte no colour uses in a 32-bit pixel (XRGB), or None"""
+    if surface.get_bytesize() != 4:
+        return None
+    used = 0
+    for mask in surface.get_masks():
+        used |= mask
+    for shift in range(0, 32, 8):
+        if ~used & 0xFFFFFFFF == 0xFF << shift:
+            return shift // 8 if sys.byteorder == "little" else 3 - shift // 8
+    return None
+
+
+@functools.lru_cache(maxsize=4)
+def zeros(count):
+    return bytes(count)
+
+
+def frame_hash(surface):
+    """Return the SHA-256 of a surface's colours, read from its pixel memory.
+
+    The unused byte of 32-bit pixels is set to 0 in the surface first, so
+    the rows can be hashed in place.
+    """
+    digest = hashlib.sha256()
+    row_bytes = surface.get_width() * surface.get_bytesize()
+    pitch = surface.get_pitch()
+    unused = unused_byte(surface)
+    # get_buffer() works for any pitch (get_view("0") refuses padded rows);
+    # the surface stays locked until the buffer is released
+    with memoryview(surface.get_buffer()) as pixels:
+        if unused is not None:
+            # The pitch of a 32-bit surface is a multiple of 4, so this
+            # stride hits the unused byte of every pixel (and some padding)
+            pixels[unused::4] = zeros(len(pixels) // 4)
+        if pitch == row_bytes:
+            digest.update(pixels[:surface.get_height() * pitch])
+        else:
+            # Skip the padding at the end of each row (its contents are undefined)
+            for start in range(0, surface.get_height() * pitch, pitch):
+                digest.update(pixels[start:start + row_bytes])
+    return digest.hexdigest()
+
+
+def render_frame(game, state):
+    """Draw one state with the template's draw_everything() and return the frame"""
+    apply_state(game, state)
+    game.draw_everything()
+    return game.backend.to_surface()
+
+
+def pixel_format(surface):
+    return [surface.get_bitsize(), list(surface.get_masks())]
+
+
+def environment(game, surface):
+    """What the golden hashes depend on, besides the drawing code"""
+    return {"pygame": pygame.version.ver, "sdl": ".".join(map(str, pygame.get_sdl_version())),
+            "backend": game.backend.name, "size": list(surface.get_size()),
+            "format": pixel_format(surface)}
+
+
+# ========================================
+# Recording and checking
+# ========================================
+
+def record(game, states, golden_dir, save_images=False):
+    """Render the states and store their hashes (and, if asked, images) as the golden set"""
+    images_dir = os.path.join(golden_dir, "frames")
+    os.makedirs(images_dir if save_images else golden_dir, exist_ok=True)
+    frames = []
+    surface = None
+    for number, state in enumerate(states):
+        surface = render_frame(game, state)
+        frames.append({"state": state, "sha256": frame_hash(surface)})
+        if save_images:
+            pygame.image.save(surface, os.path.join(images_dir, f"{number:05d}.png"))
+
+    golden = dict(version=GOLDEN_VERSION, **environment(game, surface), frames=frames)
+    path = os.path.join(golden_dir, GOLDEN_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(golden, f, indent=1)
+    os.replace(tmp_path, path)
+    return golden
+
+
+def load_golden(golden_dir):
+    """Return the stored golden set, or None if there is none"""
+    try:
+        with open(os.path.join(golden_dir, GOLDEN_FILE)) as f:
+            golden = json.load(f)
+    except OSError:
+        return None
+    if golden.get("version") != GOLDEN_VERSION:
+        raise ValueError(f"{golden_dir} was recorded by an incompatible version - record it again")
+    return golden
+
+
+def write_diff_image(golden_image, current, path):
+    """Save golden | current | differences side by side; return the changed pixel count"""
+    width, height = current.get_size()
+    # Compare colours only: the display's unused fourth byte is not saved in the PNG
+    golden_rgb = pygame.Surface((width, height), depth=24)
+    golden_rgb.blit(golden_image, (0, 0))
+    current_rgb = pygame.Surface((width, height), depth=24)
+    current_rgb.blit(current, (0, 0))
+    # compare() makes matching pixels white and different ones black
+    comparison = pygame.PixelArray(golden_rgb).compare(pygame.PixelArray(current_rgb)).make_surface()
+    changed = pygame.mask.from_threshold(comparison, (0, 0, 0), (1, 1, 1, 255))
+
+    highlight = current.copy()
+    highlight.fill((80, 80, 80), special_flags=pygame.BLEND_MULT)
+    changed.to_surface(highlight, setcolor=DIFF_COLOR, unsetcolor=None)
+
+    image = pygame.Surface((width * 3, height))
+    image.blit(golden_rgb, (0, 0))
+    image.blit(current, (width, 0))
+    image.blit(highlight, (width * 2, 0))
+    pygame.image.save(image, path)
+    return changed.count()
+
+
+def check(game, golden, golden_dir, diff_dir, max_diffs=MAX_DIFF_IMAGES):
+    """Render every golden state again and return the frames that changed.
+
+    Each mismatch is {"frame", "state", "diff", "changed_pixels"}; diff is
+    the path of the image written for it: a diff image if the golden image
+    was saved, else the current frame (changed_pixels is then None). It is
+    None after max_diffs images have been written.
+    """
+    mismatches = []
+    for number, frame in enumerate(golden["frames"]):
+        surface = render_frame(game, frame["state"])
+        if frame_hash(surface) == frame["sha256"]:
+            continue
+        mismatch = {"frame": number, "state": frame["state"], "diff": None, "changed_pixels": None}
+        golden_path = os.path.join(golden_dir, "frames", f"{number:05d}.png")
+        if len(mismatches) < max_diffs:
+            os.makedirs(diff_dir, exist_ok=True)
+            if os.path.exists(golden_path):
+                mismatch["diff"] = os.path.join(diff_dir, f"{number:05d}_diff.png")
+                mismatch["changed_pixels"] = write_diff_image(pygame.image.load(golden_path),
+                                                              surface, mismatch["diff"])
+            else:
+                mismatch["diff"] = os.path.join(diff_dir, f"{number:05d}_current.png")
+                pygame.image.save(surface, mismatch["diff"])
+        mismatches.append(mismatch)
+    return mismatches
+
+
+def start_game(template, backend):
+    """Load the template and open its (offscreen) window"""
+    game = load_template(template)
+    game.RENDER_BACKEND = backend
+    game.initialize_pygame()
+    return game
+
+
+def main():
+    """Parse arguments and record or check the golden frames"""
+    parser = argparse.ArgumentParser(description="Check that rendering changes are pixel-identical")
+    parser.add_argument("--template", default=TEMPLATE_PATH,
+                        help="completed game template to take the drawing code from")
+    parser.add_argument("--golden", default=GOLDEN_DIR, help="folder of the golden set")
+    parser.add_argument("--record", action="store_true", help="store the current frames as golden")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="frames to record")
+    parser.add_argument("--backend", default="surface", choices=["surface", "renderer"],
+                        help="render backend to draw with")
+    parser.add_argument("--images", action="store_true",
+                        help="also record a PNG of every frame, for diff images on mismatch")
+    parser.add_argument("--max-diffs", type=int, default=MAX_DIFF_IMAGES,
+                        help="images of changed frames to write at most")
+    parser.add_argument("--diff-dir", default=None, help="where to write diff images "
+                        "(default: a diffs folder in the golden set)")
+    args = parser.parse_args()
+
+    # Offscreen, and without the game's side channels
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    for name in ("GAME_METRICS_PORT", "GAME_METRICS_FILE", "GAME_LIVE_STATE"):
+        os.environ.pop(name, None)
+    os.environ["GAME_SAVE_FILE"] = ""  # No save file next to the game
+
+    print("=" * 50)
+    print("GOLDEN-FRAME REGRESSION CHECK")
+    print("=" * 50)
+    try:
+        game = start_game(args.template, args.backend)
+    except SyntaxError as e:
+        print(f"❌ {os.path.basename(args.template)} does not run yet: {e.msg} (line {e.lineno})")
+        print("Fill in the STUDENT sections, or pass --template with a completed copy.")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    if args.record:
+        states = scripted_states(args.frames, game.max_health)
+        record(game, states, args.golden, save_images=args.images)
+        print(f"✅ Recorded {len(states)} golden frames in {time.perf_counter() - start:.2f}s "
+              f"to {args.golden}")
+        return
+
+    golden = load_golden(args.golden)
+    if golden is None:
+        print(f"❌ No golden set in {args.golden} - run with --record first")
+        sys.exit(1)
+    current = environment(game, game.backend.to_surface())
+    different = [key for key, value in current.items() if golden.get(key) != value]
+    if different:
+        for key in different:
+            print(f"⚠️  Golden set was recorded with {key} {golden.get(key)}, now {current[key]}")
+        print("   Frames may differ for that reason alone - record the golden set again here.")
+
+    diff_dir = args.diff_dir or os.path.join(args.golden, "diffs")
+    mismatches = check(game, golden, args.golden, diff_dir, args.max_diffs)
+    elapsed = time.perf_counter() - start
+    total = len(golden["frames"])
+    print(f"Checked {total} frames in {elapsed:.2f}s ({elapsed / total * 1000:.2f} ms per frame)")
+    if not mismatches:
+        print("✅ Every frame is pixel-identical")
+        return
+    print(f"❌ {len(mismatches)} frames changed:")
+    for mismatch in mismatches[:20]:
+        if mismatch["changed_pixels"] is not None:
+            pixels = f"{mismatch['changed_pixels']:,} pixels, {mismatch['diff']}"
+        else:
+            pixels = f"frame saved to {mismatch['diff']}" if mismatch["diff"] else "no image"
+        print(f"   frame {mismatch['frame']}: {pixels}")
+    if len(mismatches) > 20:
+        print(f"   ... and {len(mismatches) - 20} more")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
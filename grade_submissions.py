@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Submission Grading Harness
+==========================
+
+Grades completed copies of "game_score_demo template.py" automatically.
+Every submission runs in its own forked process (up to --jobs at once)
+under SDL's dummy video driver, with a wall-clock timeout and memory and
+CPU limits, so an infinite loop or a runaway allocation only fails that
+one submission.
+
+The checks follow the README:
+- the game variables (player_health, max_health, score, status,
+  power_ups, level) are defined
+- the game draws a frame without errors (no undefined variables)
+- H heals by 10 and never goes above max_health
+- D damages by 10 and never goes below 0
+- S adds 100 to the score
+- R (reset_game) restores the starting values
+- ESC makes handle_input() return False
+
+Keys are tested by calling handle_input() with synthetic KEYDOWN events.
+Submissions are first pre-checked statically (submission_precheck.py);
+the ones with common mistakes are rejected without starting a process.
+
+Usage:
+    python grade_submissions.py submissions/                  # a folder of .py files
+    python grade_submissions.py a.py b.py --report report.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import sys
+import time
+import traceback
+
+try:
+    import resource
+except ImportError:  # Windows: no resource limits
+    resource = None
+
+import pygame
+
+from submission_precheck import precheck_files
+from template_loader import load_template
+
+GAME_VARIABLES = ["player_health", "max_health", "score", "status", "power_ups", "level"]
+CHECKS = ["variables", "draws", "heal", "heal_clamp", "damage", "damage_clamp",
+          "score", "reset", "quit"]
+DEFAULT_TIMEOUT = 10.0     # Seconds per submission (wall clock)
+DEFAULT_MEMORY_MB = 1024   # Address space limit per submission
+
+
+def press(game, key):
+    """Send one synthetic key press to the game and return handle_input()'s result"""
+    return game.handle_input(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+
+def check_health_key(game, key, start, expected):
+    game.player_health = start
+    press(game, key)
+    if game.player_health != expected:
+        return f"health {start} -> {game.player_health}, expected {expected}"
+    return None
+
+
+def run_checks(game, defaults):
+    """Run every check on a loaded submission and return {name: error or None}"""
+    max_health = defaults["max_health"]
+
+    def reset():
+        for name in GAME_VARIABLES:
+            value = defaults[name]
+            setattr(game, name, list(value) if isinstance(value, list) else value)
+
+    def check_score():
+        game.score = 0
+        press(game, pygame.K_s)
+        return None if game.score == 100 else f"score 0 -> {game.score}, expected 100"
+
+    def check_reset():
+        game.player_health, game.score, game.status = 30, 500, "Dead"
+        game.power_ups, game.level = ["Shield"], 3
+        press(game, pygame.K_r)
+        wrong = [f"{name}={getattr(game, name)!r} (expected {defaults[name]!r})"
+                 for name in GAME_VARIABLES if getattr(game, name) != defaults[name]]
+        return ", ".join(wrong) or None
+
+    def check_quit():
+        return None if press(game, pygame.K_ESCAPE) is False else "ESC did not return False"
+
+    checks = {
+        "draws": game.draw_everything,
+        "heal": lambda: check_health_key(game, pygame.K_h, max_health - 30, max_health - 20),
+        "heal_clamp": lambda: check_health_key(game, pygame.K_h, max_health - 5, max_health),
+        "damage": lambda: check_health_key(game, pygame.K_d, 50, 40),
+        "damage_clamp": lambda: check_health_key(game, pygame.K_d, 5, 0),
+        "score": check_score,
+        "reset": check_reset,
+        "quit": check_quit,
+    }
+    results = {}
+    for name, check in checks.items():
+        reset()
+        try:
+            results[name] = check()
+        except Exception as e:
+            results[name] = f"{type(e).__name__}: {e}"
+    return results
+
+
+def grade_submission(path):
+    """Load one submission and check it (runs inside the worker process)"""
+    result = {"path": path, "status": "graded", "error": None,
+              "checks": {name: "not run" for name in CHECKS}}
+    try:
+        game = load_template(path, "submission")
+    except SyntaxError as e:
+        result.update(status="syntax_error", error=f"{e.msg} (line {e.lineno})")
+        return result
+    except MemoryError:
+        raise
+    except Exception as e:
+        result.update(status="import_error", error=f"{type(e).__name__}: {e}")
+        return result
+
+    missing = [name for name in GAME_VARIABLES if not hasattr(game, name)]
+    result["checks"]["variables"] = f"missing: {', '.join(missing)}" if missing else None
+    if missing:
+        return result
+    defaults = {name: getattr(game, name) for name in GAME_VARIABLES}
+    defaults["power_ups"] = list(defaults["power_ups"])
+
+    game.initialize_pygame()
+    result["checks"].update(run_checks(game, defaults))
+    return result
+
+
+def _limit_resources(timeout, memory_mb):
+    if resource is None:
+        return
+    if memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    # CPU time backstop in case the process ignores the parent's kill
+    cpu = int(timeout) + 1
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+
+
+def _worker(path, conn, timeout, memory_mb):
+    """Entry point of a forked grading process"""
+    # The submission's own prints would only clutter the report
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+    try:
+        _limit_resources(timeout, memory_mb)
+        result = grade_submission(path)
+    except MemoryError:
+        result = {"path": path, "status": "memory_limit", "error": "MemoryError", "checks": {}}
+    except BaseException as e:
+        result = {"path": path, "status": "crashed", "checks": {},
+                  "error": "".join(traceback.format_exception_only(type(e), e)).strip()}
+    conn.send(result)
+    conn.close()
+    os._exit(0)
+
+
+def _failed(path, status, error):
+    return {"path": path, "status": status, "error": error,
+            "checks": {name: "not run" for name in CHECKS}}
+
+
+def grade_all(paths, jobs=None, timeout=DEFAULT_TIMEOUT, memory_mb=DEFAULT_MEMORY_MB,
+              progress=None):
+    """Grade every path in parallel and return the results in path order"""
+    jobs = jobs or os.cpu_count() or 1
+    context = multiprocessing.get_context("fork")
+    pending = list(reversed(paths))
+    running = {}   # connection -> (process, path, deadline)
+    results = {}
+
+    while pending or running:
+        while pending and len(running) < jobs:
+            path = pending.pop()
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=_worker, args=(path, sender, timeout, memory_mb))
+            process.start()
+            sender.close()
+            running[receiver] = (process, path, time.monotonic() + timeout)
+
+        next_deadline = min(deadline for _, _, deadline in running.values())
+        ready = multiprocessing.connection.wait(
+            list(running), timeout=max(0.0, next_deadline - time.monotonic()))
+
+        finished = []
+        for conn in ready:
+            process, path, _ = running[conn]
+            try:
+                results[path] = conn.recv()
+            except EOFError:
+                process.join()
+                results[path] = _failed(path, "crashed", f"exit code {process.exitcode}")
+            finished.append(conn)
+        now = time.monotonic()
+        for conn, (process, path, deadline) in running.items():
+            if conn not in finished and now >= deadline:
+                process.kill()
+                results[path] = _failed(path, "timeout", f"no result after {timeout:g}s")
+                finished.append(conn)
+
+        for conn in finished:
+            process, path, _ = running.pop(conn)
+            process.join()
+            conn.close()
+            if progress:
+                progress(results[path])
+
+    return [results[path] for path in paths]
+
+
+def summarize(results):
+    """Return totals and per-check failure counts for a list of results"""
+    statuses = {}
+    failures = {name: 0 for name in CHECKS}
+    passed = 0
+    for result in results:
+        statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+        checks = result["checks"]
+        for name in CHECKS:
+            if checks.get(name, "not run") is not None:
+                failures[name] += 1
+        result["passed"] = all(checks.get(name, "not run") is None for name in CHECKS)
+        passed += result["passed"]
+    return {"submissions": len(results), "passed": passed, "statuses": statuses,
+            "failures_by_check": failures}
+
+
+def find_submissions(inputs):
+    """Expand folders into the .py files they contain"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(sorted(os.path.join(item, name) for name in os.listdir(item)
+                                if name.endswith(".py")))
+        else:
+            paths.append(item)
+    return [os.path.abspath(path) for path in paths]
+
+
+def print_summary(summary, seconds):
+    print(f"\nGraded {summary['submissions']} submissions in {seconds:.1f}s")
+    print(f"✅ Passed every check: {summary['passed']}")
+    for status, count in sorted(summary["statuses"].items()):
+        if status != "graded":
+            print(f"❌ {status}: {count}")
+    print(f"\n{'Check':<14} {'Failed':>7}")
+    print("-" * 22)
+    for name, count in summary["failures_by_check"].items():
+        print(f"{name:<14} {count:>7}")
+
+
+def main():
+    """Parse arguments, grade the submissions and write the report"""
+    parser = argparse.ArgumentParser(description="Grade completed game templates")
+    parser.add_argument("inputs", nargs="+", help="submission files or folders of them")
+    parser.add_argument("--jobs", type=int, default=None, help="parallel submissions (default: CPUs)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="seconds allowed per submission")
+    parser.add_argument("--memory-mb", type=int, default=DEFAULT_MEMORY_MB,
+                        help="memory limit per submission (0 for none)")
+    parser.add_argument("--report", default="grading_report.json", help="JSON report to write")
+    parser.add_argument("--no-precheck", action="store_true",
+                        help="run every submission, even ones the static pre-check rejects")
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        print("❌ The grading harness needs fork() (Linux or macOS)")
+        sys.exit(1)
+
+    # Set before forking so every submission inherits it
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    for name in ("GAME_METRICS_PORT", "GAME_METRICS_FILE", "GAME_LIVE_STATE"):
+        os.environ.pop(name, None)
+    os.environ["GAME_SAVE_FILE"] = ""  # No save file next to the game
+
+    print("=" * 50)
+    print("SUBMISSION GRADING")
+    print("=" * 50)
+    paths = find_submissions(args.inputs)
+    print(f"{len(paths)} submissions, {args.jobs or os.cpu_count()} at a time")
+
+    start = time.perf_counter()
+    rejected = {}
+    if not args.no_precheck:
+        for path, check in precheck_files(paths, args.jobs).items():
+            if not check["ok"]:
+                problems = [f"{p['kind']} (line {p['line']}): {p['message']}" for p in check["problems"]]
+                rejected[path] = dict(_failed(path, "rejected", "; ".join(problems)),
+                                      problems=check["problems"])
+        print(f"Pre-check rejected {len(rejected)} in {time.perf_counter() - start:.2f}s")
+    to_grade = [path for path in paths if path not in rejected]
+    done = []
+
+    def progress(result):
+        done.append(result)
+        if len(done) % 100 == 0 or len(done) == len(to_grade):
+            print(f"  {len(done)}/{len(to_grade)} graded")
+
+    graded = grade_all(to_grade, args.jobs, args.timeout, args.memory_mb, progress)
+    graded = dict(zip(to_grade, graded))
+    results = [rejected.get(path) or graded[path] for path in paths]
+    summary = summarize(results)
+    print_summary(summary, time.perf_counter() - start)
+
+    with open(args.report, "w") as f:
+        json.dump({"summary": summary, "submissions": results}, f, indent=2)
+    print(f"\nReport saved to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
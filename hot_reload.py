@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Hot Reload Dev Mode
+===================
+
+Runs the game template and reloads its code while it runs: save the
+file and the changed functions take effect on the next frame, with the
+current game state, window, fonts and caches kept alive.
+
+How a reload works:
+1. Between frames, the file's modification time is checked.
+2. The new source is compiled and run in a scratch namespace (so the
+   running game's variables are untouched).
+3. Every function defined in the file gets the new code: existing
+   function objects have their __code__ replaced, so references held
+   elsewhere (collectors, callbacks) run the new code too, and new
+   functions are created with types.FunctionType on the game's live
+   globals. UPPER_CASE constants (colours, sizes, ...) are updated;
+   game state variables are not.
+4. A test frame is drawn. If anything raises - while compiling, while
+   running the new module code, while applying it or while drawing -
+   the previous code is put back and the game keeps running. If the new
+   code raises later (in handle_input(), say), it is rolled back then.
+
+Changes to run_game() itself only apply after a rollback or a restart,
+because the running loop keeps executing its old code.
+
+Usage:
+    python hot_reload.py                 # the template
+    python hot_reload.py my_game.py      # a completed copy
+"""
+
+import argparse
+import os
+import sys
+import time
+import traceback
+import types
+
+import pygame
+
+from template_loader import TEMPLATE_PATH, load_template
+
+POLL_SECONDS = 0.25        # How often the file's modification time is checked
+CONSTANT_TYPES = (int, float, str, bool, tuple)
+
+
+class HotReloader:
+    """Reload the functions of a loaded game module from its source file"""
+
+    def __init__(self, module, path):
+        self.module = module
+        self.path = path
+        self.reloads = 0
+        self.failures = 0
+        self._mtime = os.stat(path).st_mtime_ns
+        self._next_poll = 0.0
+        self._undo = []          # How to undo the last successful reload
+
+    def poll(self):
+        """Reload if the file changed; called between frames"""
+        now = time.monotonic()
+        if now < self._next_poll:
+            return False
+        self._next_poll = now + POLL_SECONDS
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return False  # Editors briefly remove the file while saving
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        return self.reload()
+
+    def reload(self):
+        """Load the current source and apply it; roll back if anything raises"""
+        start = time.perf_counter()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                source = f.read()
+            code = compile(source, self.path, "exec")
+            scratch = {"__name__": self.module.__name__ + "_reload", "__file__": self.path}
+            exec(code, scratch)
+        except Exception:
+            self._report_failure("loading")
+            return False
+
+        undo = []
+        try:
+            self._apply(scratch, undo)
+            if getattr(self.module, "backend", None) is not None:
+                self.module.draw_everything()  # Test frame
+        except Exception:
+            self._undo_changes(undo)
+            self._report_failure("applying")
+            return False
+
+        self._undo = undo
+        self.reloads += 1
+        print(f"🔄 Reloaded {os.path.basename(self.path)} "
+              f"({len(undo)} changes, {(time.perf_counter() - start) * 1000:.1f} ms)")
+        return True
+
+    def _apply(self, scratch, undo):
+        """Move changed functions and constants into the live module"""
+        live = self.module.__dict__
+        for name, new in scratch.items():
+            old = live.get(name)
+            if isinstance(new, types.FunctionType):
+                if new.__code__.co_filename != self.path:
+                    continue  # Imported, not defined in the template
+                if isinstance(old, types.FunctionType):
+                    if (old.__code__ == new.__code__ and old.__defaults__ == new.__defaults__):
+                        continue
+                    undo.append(("code", old, (old.__code__, old.__defaults__, old.__kwdefaults__)))
+                    old.__code__ = new.__code__
+                    old.__defaults__ = new.__defaults__
+                    old.__kwdefaults__ = new.__kwdefaults__
+                else:
+                    undo.append(("name", name, old))
+                    live[name] = types.FunctionType(new.__code__, live, name,
+                                                    new.__defaults__, new.__closure__)
+            elif name.isupper() and isinstance(new, CONSTANT_TYPES) and old != new:
+                undo.append(("name", name, old))
+                live[name] = new
+
+    def _undo_changes(self, undo):
+        live = self.module.__dict__
+        for kind, target, previous in reversed(undo):
+            if kind == "code":
+                target.__code__, target.__defaults__, target.__kwdefaults__ = previous
+            elif previous is None:
+                live.pop(target, None)
+            else:
+                live[target] = previous
+
+    def rollback(self):
+        """Undo the last successful reload; returns False if there is none"""
+        if not self._undo:
+            return False
+        self._undo_changes(self._undo)
+        self._undo = []
+        print("↩️  Rolled back to the previous code")
+        return True
+
+    def _report_failure(self, stage):
+        self.failures += 1
+        print(f"❌ Reload failed while {stage} - keeping the previous code:")
+        traceback.print_exc()
+
+
+def run_dev_mode(path):
+    """Run the game with hot reloading until it exits"""
+    game = load_template(path)
+    reloader = HotReloader(game, path)
+    game.frame_hooks.append(reloader.poll)
+    game.initialize_pygame()
+    print(f"Watching {path} - save it to reload")
+
+    state = None
+    while True:
+        try:
+            game.run_game(state)
+            return
+        except Exception:
+            traceback.print_exc()
+            if not reloader.rollback():
+                raise
+            # Hand the exact current state to the restarted loop in memory
+            # rather than through the save file
+            state = game.capture_state()
+            if game.autosaver is not None:
+                game.autosaver.close()
+
+
+def main():
+    """Parse arguments and start the dev mode"""
+    parser = argparse.ArgumentParser(description="Run the game and reload code changes live")
+    parser.add_argument("template", nargs="?", default=TEMPLATE_PATH,
+                        help="game template to run (default: the student template)")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("HOT RELOAD DEV MODE")
+    print("=" * 50)
+    path = os.path.abspath(args.template)
+    try:
+        run_dev_mode(path)
+    except SyntaxError as e:
+        print(f"❌ {os.path.basename(path)} does not run yet: {e.msg} (line {e.lineno})")
+        sys.exit(1)
+    except pygame.error as e:
+        print(f"❌ Could not open the game window: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Live Game State in Shared Memory
+================================
+
+The game publishes its live state into a small shared memory block
+(multiprocessing.shared_memory) every update, so monitors, overlays and
+spectator views on the same machine can read it at any time - no
+sockets, no serialization, no parsing of the game's output.
+
+Layout (little-endian, no padding):
+
+    offset  0  magic            4 bytes  b"GLIV"
+    offset  4  version          uint16   (currently 2)
+    offset  6  payload size     uint16
+    offset  8  owner pid        uint32   (the game writing the block)
+    offset 12  (reserved)       4 bytes
+    offset 16  sequence         uint64   (odd while a write is in progress)
+    offset 24  player_health    int32
+               max_health       int32
+               score            int64
+               level            uint16
+               power_ups        3 x uint8 (codes from game_save.POWER_UP_NAMES, 0 = empty)
+               status           16 bytes (UTF-8, zero padded)
+               frames           uint64   frames finished so far
+               fps              uint16   current target frame rate
+               frame_ms         float64  work time of the last frame
+               late_frames      uint32
+               dropped_frames   uint32
+
+A value that does not fit its field (a level over 65535, a score over
+2**63) is stored as the nearest value that does, rather than failing
+the game's update.
+
+Writes are lock-free with a sequence counter (a "seqlock"): the writer
+makes the counter odd, writes the state and makes it even again. A
+reader reads the counter, the state and the counter again, and retries
+if the counter was odd or changed in between - so it never sees half an
+update and the game never waits for a reader.
+
+Publishing costs a few hundred nanoseconds: the status and power-up
+bytes are cached, and the counter and state are written with two
+struct.pack_into() calls. There is no timestamp (reading the clock
+would cost more than the rest); a monitor sees that a game stopped
+when the sequence stops changing.
+
+Only one game writes a block. A block left behind by a game that crashed
+is taken over, but only once its owner pid is no longer running; while
+it is, a second game with the same name fails with LiveStateError.
+
+Usage:
+    GAME_LIVE_STATE=game_live python "game_score_demo template.py"
+    python live_state.py game_live                 # live monitor
+    python live_state.py game_live --json          # print the state once
+    python live_state.py --benchmark               # cost of publish()
+"""
+
+import argparse
+import json
+import os
+import re
+import struct
+import sys
+import time
+import timeit
+from multiprocessing import shared_memory
+
+from game_save import POWER_UP_CODES, POWER_UP_NAMES, POWER_UP_SLOTS, encode_status
+
+LIVE_MAGIC = b"GLIV"
+LIVE_VERSION = 2          # 2: the owner pid is in the header
+HEADER_FORMAT = struct.Struct("<4sHHI4x")
+SEQUENCE_FORMAT = struct.Struct("<Q")
+SEQUENCE_OFFSET = HEADER_FORMAT.size
+PAYLOAD_OFFSET = SEQUENCE_OFFSET + SEQUENCE_FORMAT.size
+PAYLOAD_FORMAT = struct.Struct("<iiqH3s16sQHdII")
+# The writer's first pack_into(): the (odd) sequence followed by the payload
+WRITE_FORMAT = struct.Struct("<Q" + PAYLOAD_FORMAT.format[1:])
+SEGMENT_SIZE = PAYLOAD_OFFSET + PAYLOAD_FORMAT.size
+# The struct code of each payload field ("i", "H", "16s", ...)
+FIELD_CODES = re.findall(r"\d*[a-zA-Z?]", PAYLOAD_FORMAT.format[1:])
+
+# A reader first retries at once (the write takes nanoseconds), then sleeps
+# between tries so a writer that was preempted mid-write can finish
+SPIN_RETRIES = 100
+READ_RETRIES = 1100
+RETRY_SLEEP = 0.0001
+STALE_SECONDS = 2.0        # A game that has not written for this long is shown as stopped
+CACHE_LIMIT = 256          # Encoded statuses and power-up combinations kept
+FIELDS = ["player_health", "max_health", "score", "level", "power_ups", "status",
+          "frames", "fps", "frame_ms", "late_frames", "dropped_frames"]
+
+# Blocks created by publishers in this process (still registered for cleanup)
+_published = set()
+
+
+class LiveStateError(Exception):
+    """The shared memory block is missing or not a live game state"""
+
+
+def _attach(name):
+    """Open an existing block without letting this process delete it on exit"""
+    try:
+        return shared_memory.SharedMemory(name, track=False)  # Python 3.13+
+    except TypeError:
+        pass
+    block = shared_memory.SharedMemory(name)
+    if name in _published:
+        return block
+    # Before 3.13 every process that opens a block registers it for cleanup,
+    # so a monitor exiting would remove the game's block
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(block._name, "shared_memory")
+    except (ImportError, AttributeError):
+        pass
+    return block
+
+
+def clamp_fields(values):
+    """Return the payload values limited to what their fixed-width fields can hold"""
+    clamped = []
+    for value, code in zip(values, FIELD_CODES):
+        if code in "bhilqBHILQ":
+            bits = struct.calcsize(code) * 8
+            low, high = (-(1 << bits - 1), (1 << bits - 1) - 1) if code.islower() else (0, (1 << bits) - 1)
+            try:
+                value = min(max(int(value), low), high)
+            except (TypeError, ValueError, OverflowError):
+                value = 0
+        elif code == "d":
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                value = 0.0
+        clamped.append(value)
+    return clamped
+
+
+def process_running(pid):
+    """Return True if a process with this pid exists"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Another user's process
+    except OSError:
+        return False
+    return True
+
+
+class LiveStatePublisher:
+    """Write the game's state into a named shared memory block (game side)"""
+
+    def __init__(self, name):
+        try:
+            self._block = shared_memory.SharedMemory(name, create=True, size=SEGMENT_SIZE)
+        except FileExistsError:
+            self._block = self._take_over(name)
+        _published.add(name)
+        self.name = name
+        self._buffer = self._block.buf
+        self._sequence = 0
+        self._write = WRITE_FORMAT.pack_into
+        self._write_sequence = SEQUENCE_FORMAT.pack_into
+        self._status_cache = {}
+        self._power_up_cache = {}
+        HEADER_FORMAT.pack_into(self._buffer, 0, LIVE_MAGIC, LIVE_VERSION, PAYLOAD_FORMAT.size,
+                                os.getpid())
+        SEQUENCE_FORMAT.pack_into(self._buffer, SEQUENCE_OFFSET, 0)
+
+    @staticmethod
+    def _take_over(name):
+        """Open a block left behind by a game that crashed (it is removed on close)"""
+        block = shared_memory.SharedMemory(name)
+        problem = None
+        if block.size < SEGMENT_SIZE:
+            problem = "exists and is too small"
+        else:
+            magic, version, _, owner = HEADER_FORMAT.unpack_from(block.buf)
+            if magic != LIVE_MAGIC:
+                problem = "exists and is not a live game state"
+            elif version != LIVE_VERSION:
+                problem = f"was written by another version (remove /dev/shm/{name} if no game uses it)"
+            elif process_running(owner):
+                problem = f"is in use by a running game (pid {owner})"
+        if problem:
+            block.close()
+            raise LiveStateError(f"Shared memory {name!r} {problem}")
+        return block
+
+    def publish(self, player_health, max_health, score, level, status, power_ups,
+                frames=0, fps=0, frame_ms=0.0, late_frames=0, dropped_frames=0):
+        """Write the current state (called once per game update)"""
+        status_bytes = self._status_cache.get(status)
+        if status_bytes is None:
+            status_bytes = self._encode_status(status)
+        power_up_key = tuple(power_ups)
+        power_up_bytes = self._power_up_cache.get(power_up_key)
+        if power_up_bytes is None:
+            power_up_bytes = self._encode_power_ups(power_up_key)
+
+        buffer = self._buffer
+        sequence = self._sequence + 1
+        try:
+            self._write(buffer, SEQUENCE_OFFSET, sequence, player_health, max_health, score, level,
+                        power_up_bytes, status_bytes, frames, fps, frame_ms, late_frames,
+                        dropped_frames)
+        except struct.error:
+            # A value that does not fit its field (level over 65535, ...) is stored
+            # as the nearest one that does. The sequence is still odd, so readers
+            # wait for this second write.
+            self._write(buffer, SEQUENCE_OFFSET, sequence, *clamp_fields(
+                (player_health, max_health, score, level, power_up_bytes, status_bytes,
+                 frames, fps, frame_ms, late_frames, dropped_frames)))
+        self._sequence = sequence = sequence + 1
+        self._write_sequence(buffer, SEQUENCE_OFFSET, sequence)
+
+    def _encode_status(self, status):
+        # Longer statuses are cut (at a character boundary) rather than failing a frame
+        data = encode_status(status)
+        if len(self._status_cache) >= CACHE_LIMIT:
+            self._status_cache.clear()
+        self._status_cache[status] = data
+        return data
+
+    def _encode_power_ups(self, power_ups):
+        codes = [POWER_UP_CODES.get(name, 0) for name in power_ups[-POWER_UP_SLOTS:]]
+        data = bytes(codes + [0] * (POWER_UP_SLOTS - len(codes)))
+        if len(self._power_up_cache) >= CACHE_LIMIT:
+            self._power_up_cache.clear()
+        self._power_up_cache[power_ups] = data
+        return data
+
+    def close(self):
+        """Remove the block (readers see it disappear)"""
+        self._buffer = None
+        self._block.close()
+        try:
+            self._block.unlink()
+        except FileNotFoundError:
+            pass
+        _published.discard(self.name)
+
+
+class LiveStateReader:
+    """Read a game's live state (monitor side)"""
+
+    def __init__(self, name):
+        try:
+            self._block = _attach(name)
+        except FileNotFoundError:
+            raise LiveStateError(f"No live game state named {name!r}") from None
+        magic, version, payload_size, _ = HEADER_FORMAT.unpack_from(self._block.buf)
+        if magic != LIVE_MAGIC or version != LIVE_VERSION or payload_size != PAYLOAD_FORMAT.size:
+            self._block.close()
+            raise LiveStateError(f"Shared memory {name!r} is not a live game state "
+                                 f"(version {LIVE_VERSION})")
+        self.name = name
+        self.retries = 0
+
+    def read(self):
+        """Return a consistent copy of the state as a dict, or None before the first write"""
+        buffer = self._block.buf
+        for attempt in range(READ_RETRIES):
+            if attempt >= SPIN_RETRIES:
+                time.sleep(RETRY_SLEEP)
+            (before,) = SEQUENCE_FORMAT.unpack_from(buffer, SEQUENCE_OFFSET)
+            if before & 1:
+                self.retries += 1
+                continue
+            values = PAYLOAD_FORMAT.unpack_from(buffer, PAYLOAD_OFFSET)
+            (after,) = SEQUENCE_FORMAT.unpack_from(buffer, SEQUENCE_OFFSET)
+            if before != after:
+                self.retries += 1
+                continue
+            if before == 0:
+                return None
+            state = dict(zip(FIELDS, values))
+            state["power_ups"] = [POWER_UP_NAMES[code - 1] for code in state["power_ups"]
+                                  if 0 < code <= len(POWER_UP_NAMES)]
+            state["status"] = state["status"].rstrip(b"\0").decode("utf-8")
+            state["sequence"] = before
+            return state
+        raise LiveStateError("No consistent state (did the game stop in the middle of a write?)")
+
+    def close(self):
+        self._block.close()
+
+
+def format_state(state, stopped=False):
+    """Return a one-line summary of a live state"""
+    running = "⚠️  stopped" if stopped else "✅ running"
+    power_ups = ", ".join(state["power_ups"]) or "none"
+    return (f"{running} | health {state['player_health']}/{state['max_health']} | "
+            f"score {state['score']} | level {state['level']} | {state['status']} | "
+            f"power-ups: {power_ups} | frame {state['frames']} at {state['fps']} FPS, "
+            f"{state['frame_ms']:.2f} ms, {state['late_frames']} late")
+
+
+def monitor(name, interval):
+    """Print the state of a running game until Ctrl+C"""
+    reader = None
+    last_sequence = None
+    last_change = time.monotonic()
+    try:
+        while True:
+            if reader is None:
+                try:
+                    reader = LiveStateReader(name)
+                except LiveStateError:
+                    print(f"\rWaiting for a game publishing {name!r}...", end="", flush=True)
+                    time.sleep(interval)
+                    continue
+            try:
+                state = reader.read()
+            except LiveStateError as e:
+                print(f"\r⚠️  {e}", end="", flush=True)
+                time.sleep(interval)
+                continue
+            if state is None:
+                line = "Game started, no update yet"
+            else:
+                if state["sequence"] != last_sequence:
+                    last_sequence = state["sequence"]
+                    last_change = time.monotonic()
+                line = format_state(state, time.monotonic() - last_change > STALE_SECONDS)
+            print(f"\r{line:<150}", end="", flush=True)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        if reader is not None:
+            reader.close()
+
+
+def benchmark():
+    """Measure publish() and read() on a temporary block"""
+    name = f"live_state_benchmark_{time.time_ns()}"
+    publisher = LiveStatePublisher(name)
+    reader = LiveStateReader(name)
+    try:
+        power_ups = ["Shield", "Fire Power"]
+        number = 200_000
+        seconds = min(timeit.repeat(
+            "publish(70, 100, 1200, 3, 'Alive', power_ups, 12345, 60, 1.25, 2, 0)",
+            globals={"publish": publisher.publish, "power_ups": power_ups},
+            number=number, repeat=5))
+        print(f"publish(): {seconds / number * 1e9:.0f} ns")
+        seconds = min(timeit.repeat(reader.read, number=number // 10, repeat=5))
+        print(f"read():    {seconds / (number // 10) * 1e9:.0f} ns")
+        print(format_state(reader.read()))
+    finally:
+        reader.close()
+        publisher.close()
+
+
+def main():
+    """Parse arguments and monitor a game (or run the benchmark)"""
+    parser = argparse.ArgumentParser(description="Read a running game's live state")
+    parser.add_argument("name", nargs="?", default="game_live",
+                        help="shared memory name the game publishes to (GAME_LIVE_STATE)")
+    parser.add_argument("--interval", type=float, default=0.1, help="seconds between updates")
+    parser.add_argument("--json", action="store_true", help="print the state once as JSON")
+    parser.add_argument("--benchmark", action="store_true", help="measure publish() and read()")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print("=" * 50)
+        print("LIVE STATE BENCHMARK")
+        print("=" * 50)
+        benchmark()
+        return
+    if args.json:
+        try:
+            reader = LiveStateReader(args.name)
+        except LiveStateError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(reader.read(), indent=2))
+        reader.close()
+        return
+    monitor(args.name, args.interval)
+
+
+if __name__ == "__main__":
+    main()
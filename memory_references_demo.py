@@ -8,8 +8,13 @@ and the differences between object identity (id()) and equality (==).
 """
 
 import sys
+import time
 from typing import Any, List, Dict
 
+from alias_tracer import format_report, trace_aliases
+from deep_size import deep_sizeof
+from quiz_analytics import record_attempt
+
 
 def demonstrate_memory_references():
     """
@@ -250,6 +255,120 @@ def demonstrate_copy_vs_reference():
     print(f"  deep_copy: {deep_copy}")  # Nested list is independent!
 
 
+def demonstrate_memory_usage():
+    """
+    Show how much memory objects really use, and why aliases cost nothing extra.
+    """
+    print("\n" + "=" * 70)
+    print("SHALLOW SIZE vs DEEP SIZE")
+    print("=" * 70)
+    
+    original = [1, 2, [3, 4]]
+    shallow_copy = original.copy()
+    
+    print("original = [1, 2, [3, 4]]")
+    print("shallow_copy = original.copy()")
+    print(f"sys.getsizeof(original): {sys.getsizeof(original)} bytes  # the outer list only")
+    print(f"deep size of original: {deep_sizeof(original)['total_bytes']} bytes  # including contents")
+    print(f"deep size of shallow_copy: {deep_sizeof(shallow_copy)['total_bytes']} bytes")
+    print(f"deep size of both together: {deep_sizeof(original, shallow_copy)['total_bytes']} bytes")
+    print("  The nested list [3, 4] is shared, so it is only counted once!")
+    
+    alias = original
+    print("\nalias = original")
+    print(f"deep size of original and alias: {deep_sizeof(original, alias)['total_bytes']} bytes")
+    print("  An alias is just another name - it adds no memory at all.")
+
+
+def demonstrate_alias_tracing():
+    """
+    Find shared objects automatically instead of comparing id() values by hand.
+    """
+    print("\n" + "=" * 70)
+    print("TRACING ALIASES")
+    print("=" * 70)
+    
+    original = [1, 2, [3, 4]]
+    shallow_copy = original.copy()
+    print("original = [1, 2, [3, 4]]")
+    print("shallow_copy = original.copy()")
+    print(format_report(trace_aliases({"original": original, "shallow_copy": shallow_copy})))
+    
+    # A classic bug: [[]] * 3 repeats a reference to ONE list
+    print("\nboard = [[]] * 3")
+    board = [[]] * 3
+    print(format_report(trace_aliases({"board": board})))
+    print("  Use [[] for _ in range(3)] to get three separate lists.")
+
+
+# Quiz questions; "correct" is the index of the right option.
+# Answer logs refer to questions by position, so only append new ones.
+MEMORY_REFERENCES_QUESTIONS = [
+    {
+        "question": "What will be the output of this code?\na = [1, 2, 3]\nb = a\nb.append(4)\nprint(a)",
+        "options": ["[1, 2, 3]", "[1, 2, 3, 4]", "Error", "[4]"],
+        "correct": 1,
+        "explanation": "Since b is an alias of a (same object), modifying b also modifies a."
+    },
+    {
+        "question": "What does 'a is b' check in Python?",
+        "options": [
+            "Whether a and b have the same value",
+            "Whether a and b are the same object in memory",
+            "Whether a and b are the same type",
+            "Whether a and b are both mutable"
+        ],
+        "correct": 1,
+        "explanation": "'is' checks object identity (same memory address), not value equality."
+    },
+    {
+        "question": "What will be the result of this code?\nlist1 = [1, 2, 3]\nlist2 = [1, 2, 3]\nprint(list1 is list2)",
+        "options": ["True", "False", "Error", "None"],
+        "correct": 1,
+        "explanation": "Even though the lists have the same contents, they are different objects in memory."
+    },
+    {
+        "question": "What is 'aliasing' in Python?",
+        "options": [
+            "Creating a copy of an object",
+            "Having multiple variables point to the same object",
+            "Converting one type to another",
+            "A special Python operator"
+        ],
+        "correct": 1,
+        "explanation": "Aliasing occurs when multiple variables reference the same object in memory."
+    },
+    {
+        "question": "What's the difference between shallow copy and deep copy?",
+        "options": [
+            "No difference, they're the same",
+            "Shallow copy copies nested objects, deep copy doesn't",
+            "Deep copy copies nested objects, shallow copy doesn't",
+            "Shallow copy is faster but less accurate"
+        ],
+        "correct": 2,
+        "explanation": "Deep copy creates independent copies of nested objects, while shallow copy shares nested objects."
+    },
+    {
+        "question": "What will this code output?\na = 42\nb = 42\nprint(a is b)",
+        "options": ["True", "False", "Error", "Depends on Python version"],
+        "correct": 0,
+        "explanation": "Python optimizes small integers by reusing the same object, so a and b point to the same 42."
+    },
+    {
+        "question": "When should you use 'is' vs '==' for comparison?",
+        "options": [
+            "Always use 'is' for better performance",
+            "Always use '==' for better readability",
+            "Use 'is' for identity, '==' for value equality",
+            "Use 'is' for mutable objects, '==' for immutable"
+        ],
+        "correct": 2,
+        "explanation": "Use 'is' when you need to check if two variables point to the same object, '==' when you need to check if values are equal."
+    }
+]
+
+
 def memory_references_quiz():
     """
     Interactive quiz on memory references and object identity.
@@ -258,72 +377,9 @@ def memory_references_quiz():
     print("MEMORY REFERENCES QUIZ")
     print("=" * 70)
     
-    questions = [
-        {
-            "question": "What will be the output of this code?\na = [1, 2, 3]\nb = a\nb.append(4)\nprint(a)",
-            "options": ["[1, 2, 3]", "[1, 2, 3, 4]", "Error", "[4]"],
-            "correct": 1,
-            "explanation": "Since b is an alias of a (same object), modifying b also modifies a."
-        },
-        {
-            "question": "What does 'a is b' check in Python?",
-            "options": [
-                "Whether a and b have the same value",
-                "Whether a and b are the same object in memory",
-                "Whether a and b are the same type",
-                "Whether a and b are both mutable"
-            ],
-            "correct": 1,
-            "explanation": "'is' checks object identity (same memory address), not value equality."
-        },
-        {
-            "question": "What will be the result of this code?\nlist1 = [1, 2, 3]\nlist2 = [1, 2, 3]\nprint(list1 is list2)",
-            "options": ["True", "False", "Error", "None"],
-            "correct": 1,
-            "explanation": "Even though the lists have the same contents, they are different objects in memory."
-        },
-        {
-            "question": "What is 'aliasing' in Python?",
-            "options": [
-                "Creating a copy of an object",
-                "Having multiple variables point to the same object",
-                "Converting one type to another",
-                "A special Python operator"
-            ],
-            "correct": 1,
-            "explanation": "Aliasing occurs when multiple variables reference the same object in memory."
-        },
-        {
-            "question": "What's the difference between shallow copy and deep copy?",
-            "options": [
-                "No difference, they're the same",
-                "Shallow copy copies nested objects, deep copy doesn't",
-                "Deep copy copies nested objects, shallow copy doesn't",
-                "Shallow copy is faster but less accurate"
-            ],
-            "correct": 2,
-            "explanation": "Deep copy creates independent copies of nested objects, while shallow copy shares nested objects."
-        },
-        {
-            "question": "What will this code output?\na = 42\nb = 42\nprint(a is b)",
-            "options": ["True", "False", "Error", "Depends on Python version"],
-            "correct": 0,
-            "explanation": "Python optimizes small integers by reusing the same object, so a and b point to the same 42."
-        },
-        {
-            "question": "When should you use 'is' vs '==' for comparison?",
-            "options": [
-                "Always use 'is' for better performance",
-                "Always use '==' for better readability",
-                "Use 'is' for identity, '==' for value equality",
-                "Use 'is' for mutable objects, '==' for immutable"
-            ],
-            "correct": 2,
-            "explanation": "Use 'is' when you need to check if two variables point to the same object, '==' when you need to check if values are equal."
-        }
-    ]
-    
+    questions = MEMORY_REFERENCES_QUESTIONS
     score = 0
+    answers = []
     total_questions = len(questions)
     
     for i, q in enumerate(questions, 1):
@@ -333,6 +389,7 @@ def memory_references_quiz():
         for j, option in enumerate(q["options"]):
             print(f"  {j + 1}. {option}")
         
+        asked_at = time.monotonic()
         while True:
             try:
                 answer = int(input("\nYour answer (1-4): ")) - 1
@@ -343,6 +400,8 @@ def memory_references_quiz():
             except ValueError:
                 print("Please enter a valid number.")
         
+        answers.append({"choice": answer, "correct": answer == q["correct"],
+                        "seconds": round(time.monotonic() - asked_at, 2)})
         if answer == q["correct"]:
             print("✅ Correct!")
             score += 1
@@ -351,6 +410,8 @@ def memory_references_quiz():
         
         print(f"Explanation: {q['explanation']}")
     
+    record_attempt("memory_references", answers, score)
+
     print(f"\n" + "=" * 50)
     print(f"QUIZ RESULTS: {score}/{total_questions} correct")
     print("=" * 50)
@@ -423,6 +484,8 @@ def main():
     demonstrate_pseudocode_aliasing()
     demonstrate_id_vs_equals()
     demonstrate_copy_vs_reference()
+    demonstrate_memory_usage()
+    demonstrate_alias_tracing()
     demonstrate_common_pitfalls()
     
     # Ask if user wants to take the quiz
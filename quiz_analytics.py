@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Quiz Answer Analytics
+=====================
+
+The quizzes in dynamic_typing_demo.py and memory_references_demo.py can
+log every finished attempt as one JSON line (set QUIZ_ANSWER_LOG to a
+file path):
+
+    {"quiz": "memory_references", "session": "...", "time": 1760000000.0,
+     "score": 5, "answers": [{"choice": 1, "correct": true, "seconds": 4.2}, ...]}
+
+This module turns those append-only logs into per-question statistics:
+
+- accuracy
+- how often each option (including every distractor) is chosen
+- time-to-answer percentiles (from a log-scale histogram)
+- discrimination: the point-biserial correlation between answering the
+  question correctly and the score on the rest of the quiz (good
+  questions are answered correctly more often by stronger students)
+
+Everything is computed in a single streaming pass with summaries that
+only hold sums and counts, so:
+- memory does not grow with the size of the logs
+- summaries of different log files (or byte ranges of one big file) are
+  computed in parallel and simply added together
+- a state file remembers the summaries and how far each log was read,
+  so a refresh only reads the lines appended since the last one
+
+Usage:
+    python quiz_analytics.py answers.jsonl                       # report
+    python quiz_analytics.py logs/*.jsonl --state state.json     # incremental
+    python quiz_analytics.py --sample 100000 sample.jsonl        # make test data
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+import uuid
+
+ANSWER_LOG_ENV = "QUIZ_ANSWER_LOG"
+STATE_VERSION = 1
+
+# Time histogram: bucket 0 is under TIME_MIN seconds, then each bucket is
+# TIME_GROWTH times wider than the previous one (about 19% apart), so
+# percentiles are accurate to within about 10%.
+TIME_MIN = 0.1
+TIME_GROWTH = 2 ** 0.25
+TIME_BUCKETS = 64
+MAX_OPTIONS = 16           # Choice indexes from 0 to MAX_OPTIONS - 1 are accepted
+
+# Large files are split into ranges of about this many bytes for the workers
+CHUNK_BYTES = 32 * 1024 * 1024
+
+
+# ========================================
+# Logging attempts (called by the quizzes)
+# ========================================
+
+def record_attempt(quiz, answers, score):
+    """Append a finished quiz attempt to the answer log, if one is configured.
+
+    answers is a list of {"choice": int, "correct": bool, "seconds": float},
+    one per question in order.
+    """
+    path = os.environ.get(ANSWER_LOG_ENV)
+    if not path:
+        return
+    line = json.dumps({"quiz": quiz, "session": uuid.uuid4().hex, "time": time.time(),
+                       "score": score, "answers": answers}) + "\n"
+    try:
+        # One write() in append mode, so concurrent quizzes never interleave lines
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+    except OSError as e:
+        print(f"⚠️  Could not log quiz answers to {path}: {e}")
+
+
+# ========================================
+# Mergeable summaries
+# ========================================
+
+def new_question_summary(options=4):
+    """Return an empty summary for one question"""
+    return {
+        "attempts": 0,
+        "correct": 0,
+        "choices": [0] * options,
+        "time_buckets": [0] * TIME_BUCKETS,
+        # Sums for the point-biserial correlation (x = correct, y = rest score)
+        "sum_rest": 0,
+        "sum_rest_squared": 0,
+        "sum_rest_correct": 0,
+    }
+
+
+def time_bucket(seconds):
+    if seconds < TIME_MIN:
+        return 0
+    return min(TIME_BUCKETS - 1, 1 + int(math.log(seconds / TIME_MIN, TIME_GROWTH)))
+
+
+def bucket_seconds(bucket):
+    """Return a representative time for a bucket (its geometric middle)"""
+    if bucket == 0:
+        return TIME_MIN / 2
+    return TIME_MIN * TIME_GROWTH ** (bucket - 0.5)
+
+
+def parse_attempt(attempt):
+    """Return (quiz, [(choice, correct, seconds), ...]) for a logged attempt.
+
+    Raises ValueError (or KeyError/TypeError) if any part of it is invalid.
+    """
+    quiz = attempt["quiz"]
+    if not isinstance(quiz, str):
+        raise ValueError(f"quiz must be a string, not {quiz!r}")
+    answers = []
+    for answer in attempt["answers"]:
+        choice, correct, seconds = answer["choice"], answer["correct"], answer["seconds"]
+        if type(choice) is not int or not 0 <= choice < MAX_OPTIONS:
+            raise ValueError(f"choice must be an option index below {MAX_OPTIONS}, not {choice!r}")
+        if not isinstance(correct, bool):
+            raise ValueError(f"correct must be true or false, not {correct!r}")
+        # Also rejects NaN and infinity
+        if isinstance(seconds, bool) or not isinstance(seconds, (int, float)) or not 0 <= seconds < math.inf:
+            raise ValueError(f"seconds must be a time of 0 or more, not {seconds!r}")
+        answers.append((choice, correct, seconds))
+    return quiz, answers
+
+
+def add_attempt(summaries, attempt):
+    """Add one logged attempt to summaries ({"quiz:question": summary}).
+
+    The whole attempt is checked first, so an invalid one raises without
+    changing any summary.
+    """
+    quiz, answers = parse_attempt(attempt)
+    total = sum(1 for _, correct, _ in answers if correct)
+    for number, (choice, correct, seconds) in enumerate(answers, 1):
+        key = f"{quiz}:{number}"
+        summary = summaries.get(key)
+        if summary is None:
+            summary = summaries[key] = new_question_summary()
+        correct = 1 if correct else 0
+        rest = total - correct
+        summary["attempts"] += 1
+        summary["correct"] += correct
+        choices = summary["choices"]
+        if choice >= len(choices):
+            choices.extend([0] * (choice + 1 - len(choices)))
+        choices[choice] += 1
+        summary["time_buckets"][time_bucket(seconds)] += 1
+        summary["sum_rest"] += rest
+        summary["sum_rest_squared"] += rest * rest
+        summary["sum_rest_correct"] += rest * correct
+
+
+def merge_summaries(into, other):
+    """Add the summaries in other to into (and return into)"""
+    for key, summary in other.items():
+        target = into.get(key)
+        if target is None:
+            into[key] = {name: list(value) if isinstance(value, list) else value
+                         for name, value in summary.items()}
+            continue
+        for name, value in summary.items():
+            if isinstance(value, list):
+                values = target[name]
+                if len(values) < len(value):
+                    values.extend([0] * (len(value) - len(values)))
+                for i, count in enumerate(value):
+                    values[i] += count
+            else:
+                target[name] += value
+    return into
+
+
+def time_percentile(summary, fraction):
+    """Return the approximate time (seconds) below which fraction of answers fall"""
+    buckets = summary["time_buckets"]
+    target = fraction * sum(buckets)
+    seen = 0
+    for bucket, count in enumerate(buckets):
+        seen += count
+        if count and seen >= target:
+            return bucket_seconds(bucket)
+    return None
+
+
+def discrimination(summary):
+    """Point-biserial correlation of correctness with the rest score (None if undefined)"""
+    n = summary["attempts"]
+    x, y = summary["correct"], summary["sum_rest"]
+    covariance = n * summary["sum_rest_correct"] - x * y
+    variance_x = n * x - x * x
+    variance_y = n * summary["sum_rest_squared"] - y * y
+    if variance_x <= 0 or variance_y <= 0:
+        return None
+    return covariance / math.sqrt(variance_x * variance_y)
+
+
+# ========================================
+# Streaming over log files
+# ========================================
+
+def summarize_range(job):
+    """Summarize the complete lines that start in [start, end) of a log file.
+
+    Returns (summaries, bad line count).
+    """
+    path, start, end = job
+    summaries = {}
+    bad_lines = 0
+    with open(path, "rb") as f:
+        if start > 0:
+            # Skip the rest of a line that began before this range
+            f.seek(start - 1)
+            f.readline()
+        position = f.tell()
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            try:
+                add_attempt(summaries, json.loads(line))
+            except (ValueError, KeyError, TypeError, IndexError):
+                bad_lines += 1
+    return summaries, bad_lines
+
+
+def complete_size(path):
+    """Return the size of the file up to its last newline (skips a line being written)"""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        position = size
+        while position > 0:
+            step = min(64 * 1024, position)
+            position -= step
+            f.seek(position)
+            block = f.read(step)
+            newline = block.rfind(b"\n")
+            if newline >= 0:
+                return position + newline + 1
+    return 0
+
+
+def load_state(path):
+    """Return the saved state ({"offsets": {...}, "summaries": {...}}) or an empty one"""
+    empty = {"version": STATE_VERSION, "offsets": {}, "summaries": {}}
+    if not path:
+        return empty
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    return state if state.get("version") == STATE_VERSION else empty
+
+
+def save_state(path, state):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def update(state, log_paths, jobs=None):
+    """Read everything appended to log_paths since state was saved and merge it in.
+
+    Returns (lines read in bytes, bad lines).
+    """
+    work = []
+    new_offsets = {}
+    for path in log_paths:
+        key = os.path.abspath(path)
+        start = state["offsets"].get(key, 0)
+        end = complete_size(path)
+        if end < start:
+            raise ValueError(f"{path} is shorter than when it was last read - "
+                             "rebuild the statistics without --state")
+        new_offsets[key] = end
+        for chunk_start in range(start, end, CHUNK_BYTES):
+            work.append((path, chunk_start, min(end, chunk_start + CHUNK_BYTES)))
+
+    if len(work) > 1 and (jobs or os.cpu_count() or 1) > 1:
+        with multiprocessing.Pool(jobs) as pool:
+            results = pool.map(summarize_range, work)
+    else:
+        results = [summarize_range(job) for job in work]
+
+    bad_lines = 0
+    for summaries, bad in results:
+        merge_summaries(state["summaries"], summaries)
+        bad_lines += bad
+    read = sum(new_offsets[os.path.abspath(p)] - state["offsets"].get(os.path.abspath(p), 0)
+               for p in log_paths)
+    state["offsets"].update(new_offsets)
+    return read, bad_lines
+
+
+# ========================================
+# Report
+# ========================================
+
+def question_banks():
+    """Return {quiz name: question list} for the quizzes that log answers"""
+    from dynamic_typing_demo import TYPE_INFERENCE_QUESTIONS
+    from memory_references_demo import MEMORY_REFERENCES_QUESTIONS
+    return {"type_inference": TYPE_INFERENCE_QUESTIONS,
+            "memory_references": MEMORY_REFERENCES_QUESTIONS}
+
+
+def build_report(summaries):
+    """Return per-question statistics computed from the summaries"""
+    banks = question_banks()
+    report = []
+    for key in sorted(summaries, key=lambda k: (k.split(":")[0], int(k.split(":")[1]))):
+        summary = summaries[key]
+        quiz, number = key.split(":")
+        question = None
+        bank = banks.get(quiz, [])
+        if int(number) <= len(bank):
+            question = bank[int(number) - 1]
+        attempts = summary["attempts"]
+        report.append({
+            "quiz": quiz,
+            "question": int(number),
+            "text": question["question"].split("\n")[0] if question else None,
+            "correct_option": question["correct"] if question else None,
+            "attempts": attempts,
+            "accuracy": summary["correct"] / attempts if attempts else None,
+            "choice_rates": [count / attempts if attempts else 0.0
+                             for count in summary["choices"]],
+            "seconds_p50": time_percentile(summary, 0.5),
+            "seconds_p90": time_percentile(summary, 0.9),
+            "discrimination": discrimination(summary),
+        })
+    return report
+
+
+def print_report(report):
+    print(f"{'Question':<22} {'Attempts':>9} {'Correct':>8} {'Choices (correct*)':<26} "
+          f"{'p50 s':>6} {'p90 s':>6} {'Discr.':>7}")
+    print("-" * 90)
+    for row in report:
+        choices = " ".join(
+            f"{rate:.0%}{'*' if option == row['correct_option'] else ''}"
+            for option, rate in enumerate(row["choice_rates"]))
+        discrimination_text = "n/a" if row["discrimination"] is None else f"{row['discrimination']:+.2f}"
+        print(f"{row['quiz'] + ' Q' + str(row['question']):<22} {row['attempts']:>9,} "
+              f"{row['accuracy']:>8.1%} {choices:<26} {row['seconds_p50']:>6.1f} "
+              f"{row['seconds_p90']:>6.1f} {discrimination_text:>7}")
+
+
+# ========================================
+# Sample data
+# ========================================
+
+def write_sample_log(path, attempts, seed=0):
+    """Append attempts from simulated students of varying ability to path"""
+    rng = random.Random(seed)
+    banks = question_banks()
+    with open(path, "a") as f:
+        for _ in range(attempts):
+            quiz = rng.choice(list(banks))
+            ability = rng.gauss(0, 1)
+            answers = []
+            for number, question in enumerate(banks[quiz]):
+                difficulty = (number % 3) - 1
+                chance = 1 / (1 + math.exp(difficulty - 1.5 * ability))
+                correct = rng.random() < chance
+                choice = question["correct"]
+                if not correct:
+                    choice = rng.choice([i for i in range(len(question["options"]))
+                                         if i != question["correct"]])
+                answers.append({"choice": choice, "correct": correct,
+                                "seconds": round(rng.lognormvariate(1.6 - 0.2 * ability, 0.6), 2)})
+            score = sum(answer["correct"] for answer in answers)
+            f.write(json.dumps({"quiz": quiz, "session": uuid.uuid4().hex, "time": time.time(),
+                                "score": score, "answers": answers}) + "\n")
+
+
+def main():
+    """Parse arguments and print (or write) the per-question statistics"""
+    parser = argparse.ArgumentParser(description="Per-question analytics from quiz answer logs")
+    parser.add_argument("logs", nargs="*", help="answer log files (JSON lines)")
+    parser.add_argument("--state", help="state file for incremental refreshes")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPUs)")
+    parser.add_argument("--json", help="also write the report to this JSON file")
+    parser.add_argument("--sample", type=int, metavar="ATTEMPTS",
+                        help="append simulated attempts to the (single) log file and exit")
+    args = parser.parse_args()
+
+    if args.sample:
+        if len(args.logs) != 1:
+            parser.error("--sample needs exactly one log file")
+        write_sample_log(args.logs[0], args.sample)
+        print(f"Appended {args.sample:,} simulated attempts to {args.logs[0]}")
+        return
+    if not args.logs:
+        parser.error("give at least one answer log")
+
+    print("=" * 90)
+    print("QUIZ ANSWER ANALYTICS")
+    print("=" * 90)
+    state = load_state(args.state)
+    start = time.perf_counter()
+    read, bad_lines = update(state, args.logs, args.jobs)
+    print(f"Read {read / 1e6:.1f} MB of new answers in {time.perf_counter() - start:.2f}s"
+          + (f" ({bad_lines} unreadable lines skipped)" if bad_lines else ""))
+    if args.state:
+        save_state(args.state, state)
+
+    report = build_report(state["summaries"])
+    print()
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Rendering Backends for the Game UI
+==================================
+
+The game draws through one small interface so the same drawing code can
+run on two different backends:
+
+- SurfaceBackend: the classic pygame way - software drawing with
+  pygame.draw and blits onto the display surface from set_mode().
+- RendererBackend: SDL2's Renderer/Texture API (pygame._sdl2.video).
+  Text and shapes are uploaded once as textures and the renderer
+  composes them. It asks for SDL's software renderer, so it also works
+  on machines without a GPU.
+
+Interface (both backends):
+    clear(color)                      fill the whole frame
+    rect(color, rect, width=0)        filled rectangle, or border of `width` pixels
+    circle(color, center, radius)     filled circle
+    text(font, text, color)           rendered text, cached; has get_rect()
+    image(surface)                    prepare a Surface for repeated drawing
+    blits([(image, pos), ...])        draw many images in one call; items may
+                                      also be (image, pos, area) to draw part
+                                      of an image
+    stretch(image, rect)              draw an image scaled to fill rect
+    present()                         show the frame
+
+Run this file to benchmark both backends on a UI-like frame.
+"""
+
+import os
+import time
+
+import pygame
+
+# Rendered text is cached per (font, text, color) up to this many entries
+TEXT_CACHE_LIMIT = 256
+
+
+class SurfaceBackend:
+    """Draw with pygame.draw and blits onto a Surface (the set_mode display)."""
+
+    name = "surface"
+
+    def __init__(self, surface):
+        self.surface = surface
+        self._text_cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # pygame-ce has fblits(), which skips building the list of dirty rects
+        # (but only takes (image, pos) pairs, not (image, pos, area))
+        self._blit_many = getattr(surface, "fblits", None)
+
+    def clear(self, color):
+        self.surface.fill(color)
+
+    def rect(self, color, rect, width=0):
+        pygame.draw.rect(self.surface, color, rect, width)
+
+    def circle(self, color, center, radius):
+        pygame.draw.circle(self.surface, color, center, radius)
+
+    def text(self, font, text, color):
+        key = (font, text, color)
+        image = self._text_cache.get(key)
+        if image is not None:
+            self.cache_hits += 1
+            return image
+        self.cache_misses += 1
+        if len(self._text_cache) >= TEXT_CACHE_LIMIT:
+            self._text_cache.clear()
+        # convert_alpha() matches the display format, so blitting needs no conversion
+        image = font.render(text, True, color).convert_alpha()
+        self._text_cache[key] = image
+        return image
+
+    def image(self, surface):
+        return surface.convert_alpha()
+
+    def blits(self, blits):
+        if self._blit_many is not None and all(len(item) == 2 for item in blits):
+            self._blit_many(blits)
+        else:
+            self.surface.blits(blits, doreturn=False)
+
+    def stretch(self, image, rect):
+        if rect.size != image.get_size():
+            image = pygame.transform.scale(image, rect.size)
+        self.surface.blit(image, rect.topleft)
+
+    def present(self):
+        pygame.display.flip()
+
+    def to_surface(self):
+        """Return the current frame as a Surface"""
+        return self.surface
+
+
+class RendererBackend:
+    """Draw with SDL2's Renderer, composing cached textures."""
+
+    name = "renderer"
+
+    def __init__(self, title, size, software=True):
+        from pygame._sdl2 import video
+        self._video = video
+        self.window = video.Window(title, size=size)
+        # accelerated=0 asks SDL for its software renderer (no GPU needed)
+        self.renderer = video.Renderer(self.window, accelerated=0 if software else -1)
+        self._text_cache = {}
+        self._circle_cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def clear(self, color):
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.clear()
+
+    def rect(self, color, rect, width=0):
+        self.renderer.draw_color = pygame.Color(color)
+        rect = pygame.Rect(rect)
+        if width == 0:
+            self.renderer.fill_rect(rect)
+            return
+        # Same as pygame.draw.rect: the border grows inwards
+        for _ in range(width):
+            self.renderer.draw_rect(rect)
+            rect = rect.inflate(-2, -2)
+
+    def circle(self, color, center, radius):
+        key = (color, radius)
+        texture = self._circle_cache.get(key)
+        if texture is None:
+            image = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(image, color, (radius, radius), radius)
+            texture = self._video.Texture.from_surface(self.renderer, image)
+            self._circle_cache[key] = texture
+        texture.draw(dstrect=(center[0] - radius, center[1] - radius))
+
+    def text(self, font, text, color):
+        key = (font, text, color)
+        texture = self._text_cache.get(key)
+        if texture is not None:
+            self.cache_hits += 1
+            return texture
+        self.cache_misses += 1
+        if len(self._text_cache) >= TEXT_CACHE_LIMIT:
+            self._text_cache.clear()
+        texture = self._video.Texture.from_surface(self.renderer, font.render(text, True, color))
+        self._text_cache[key] = texture
+        return texture
+
+    def image(self, surface):
+        return self._video.Texture.from_surface(self.renderer, surface)
+
+    def blits(self, blits):
+        for item in blits:
+            if len(item) == 2:
+                item[0].draw(dstrect=item[1])
+            else:
+                texture, pos, area = item
+                area = pygame.Rect(area)
+                texture.draw(srcrect=area, dstrect=(pos[0], pos[1], area.width, area.height))
+
+    def stretch(self, texture, rect):
+        texture.draw(dstrect=rect)
+
+    def present(self):
+        self.renderer.present()
+
+    def to_surface(self):
+        """Return the current frame as a Surface (read back from the renderer)"""
+        return self.renderer.to_surface()
+
+
+def create_backend(name, title, size):
+    """Open the game window with the named backend ("surface" or "renderer")"""
+    if name == "renderer":
+        return RendererBackend(title, size)
+    if name != "surface":
+        raise ValueError(f"Unknown render backend: {name}")
+    screen = pygame.display.set_mode(size)
+    pygame.display.set_caption(title)
+    return SurfaceBackend(screen)
+
+
+# ========================================
+# Benchmark
+# ========================================
+
+def draw_sample_frame(backend, font, small_font, frame):
+    """Draw a frame that looks like the game UI"""
+    white, gray, blue, yellow = (255, 255, 255), (128, 128, 128), (0, 0, 255), (255, 255, 0)
+    backend.clear((0, 0, 0))
+    backend.blits([(backend.text(font, "Game UI Demo", white), (330, 15))])
+
+    backend.rect((128, 0, 0), (50, 80, 300, 40))
+    backend.rect((0, 255, 0), (50, 80, 150 + frame % 150, 40))
+    backend.rect(white, (50, 80, 300, 40), 2)
+    backend.blits([(backend.text(small_font, f"{50 + frame % 50}/100", white), (180, 92))])
+
+    backend.rect(gray, (50, 150, 300, 120))
+    backend.rect(white, (50, 150, 300, 120), 2)
+    backend.blits([
+        (backend.text(font, "Status: Alive", white), (60, 160)),
+        (backend.text(small_font, "Level: 1", white), (60, 190)),
+        (backend.text(small_font, "Power-ups:", white), (60, 210)),
+        (backend.text(small_font, "• Shield", yellow), (70, 230)),
+        (backend.text(small_font, "• Speed Boost", yellow), (70, 250)),
+    ])
+
+    backend.rect(blue, (400, 150, 200, 80))
+    backend.rect(white, (400, 150, 200, 80), 2)
+    backend.blits([(backend.text(font, f"Score: {frame // 10 * 100}", white), (440, 178))])
+
+    controls = ["Controls:", "H - Heal (+10)", "D - Take Damage (-10)", "S - Add Score (+100)",
+                "P - Add Power-up", "R - Reset Game", "U - Rewind (1 second)", "ESC - Quit"]
+    backend.blits([(backend.text(font if i == 0 else small_font, line, yellow if i == 0 else white),
+                    (10, 400 + i * 25)) for i, line in enumerate(controls)])
+
+    backend.circle((0, 255, 0), (700, 100), 20)
+    backend.circle((255, 0, 0), (750, 100), 20)
+    backend.circle((0, 0, 255), (725, 130), 15)
+    backend.present()
+
+
+def run_benchmark(frames=2000):
+    """Time the sample frame on both backends and print ms/frame"""
+    size = (800, 600)
+    results = {}
+    for name in ("surface", "renderer"):
+        pygame.init()
+        try:
+            backend = create_backend(name, f"Backend benchmark ({name})", size)
+        except pygame.error as e:
+            print(f"{name:<10} unavailable: {e}")
+            pygame.quit()
+            continue
+        font = pygame.font.Font(None, 36)
+        small_font = pygame.font.Font(None, 24)
+        for frame in range(50):  # Warm the caches
+            draw_sample_frame(backend, font, small_font, frame)
+        start = time.perf_counter()
+        for frame in range(frames):
+            draw_sample_frame(backend, font, small_font, frame)
+        results[name] = (time.perf_counter() - start) / frames * 1000
+        print(f"{name:<10} {results[name]:.3f} ms/frame")
+        pygame.quit()
+    return results
+
+
+def main():
+    """Benchmark both rendering backends"""
+    print("=" * 50)
+    print("RENDER BACKEND BENCHMARK")
+    print("=" * 50)
+    print(f"Video driver: {os.environ.get('SDL_VIDEODRIVER', 'default')}")
+    run_benchmark()
+
+
+if __name__ == "__main__":
+    main()
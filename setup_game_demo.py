@@ -6,9 +6,49 @@ Setup script for the Game UI Demo
 This script helps you install pygame and run the game demo.
 """
 
+import argparse
+import hashlib
+import json
+import re
 import subprocess
 import sys
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from importlib import metadata as importlib_metadata
+except ImportError:  # Python 3.7
+    importlib_metadata = None
+
+# Where the result of the pygame check is remembered between runs
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "score-example")
+CHECK_CACHE_FILE = os.path.join(CACHE_DIR, "pygame_check.json")
+MAX_CACHED_ENVIRONMENTS = 8
+
+# Offline installs
+DEFAULT_WHEELHOUSE = "wheelhouse"
+HASH_MANIFEST = "SHA256SUMS"     # "<sha256>  <wheel file name>" per line, as written by sha256sum
+
+# Run in a short-lived subprocess so SDL is never initialized in this one
+SDL_PROBE = """
+import json, os
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+result = {"video": False, "font": False, "video_driver": None, "error": None}
+try:
+    import pygame
+    pygame.display.init()
+    result["video_driver"] = pygame.display.get_driver()
+    result["video"] = True
+    pygame.font.init()
+    pygame.font.Font(None, 24).render("ok", True, (255, 255, 255))
+    result["font"] = True
+except Exception as e:
+    result["error"] = f"{type(e).__name__}: {e}"
+print(json.dumps(result))
+"""
 
 def install_pygame():
     """Install pygame using pip"""
@@ -22,22 +62,352 @@ def install_pygame():
         print("   pip install pygame")
         return False
 
-def check_pygame():
+def environment_key():
+    """Return a key that changes whenever the interpreter or its packages change.
+
+    Installing or removing a package changes the modification time of
+    the site-packages directory it lives in. The display settings are
+    included because they decide whether SDL video works.
+    """
+    state = [sys.executable, sys.version]
+    for name in ("SDL_VIDEODRIVER", "DISPLAY", "WAYLAND_DISPLAY"):
+        state.append(os.environ.get(name))
+    for path in sys.path:
+        if os.path.basename(path) not in ("site-packages", "dist-packages"):
+            continue
+        try:
+            state.append([path, os.stat(path).st_mtime_ns])
+        except OSError:
+            continue
+    return hashlib.sha256(json.dumps(state).encode()).hexdigest()
+
+def load_check_cache():
+    """Return the cached check results ({environment key: result})"""
+    try:
+        with open(CHECK_CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_check_cache(cache):
+    """Write the check results, keeping only the most recent environments"""
+    entries = list(cache.items())[-MAX_CACHED_ENVIRONMENTS:]
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = CHECK_CACHE_FILE + f".{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(dict(entries), f, indent=2)
+        os.replace(tmp_path, CHECK_CACHE_FILE)
+    except OSError:
+        pass  # The cache is only an optimization
+
+def normalize_name(name):
+    """Normalize a distribution name the way pip does (PEP 503)"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+def distribution_version(name):
+    """Return the installed version of a distribution without importing it (None if missing)"""
+    if importlib_metadata is None:
+        if normalize_name(name) != "pygame":
+            return None
+        try:
+            import pygame
+        except ImportError:
+            return None
+        return pygame.version.ver
+    try:
+        return importlib_metadata.version(name)
+    except importlib_metadata.PackageNotFoundError:
+        return None
+
+def pygame_version():
+    """Return the installed pygame version without importing pygame (None if missing)"""
+    return distribution_version("pygame")
+
+def probe_sdl(timeout=30):
+    """Check SDL video and font support in a separate, short-lived process"""
+    try:
+        output = subprocess.run([sys.executable, "-c", SDL_PROBE], capture_output=True,
+                                text=True, timeout=timeout).stdout
+        return json.loads(output.strip().splitlines()[-1])
+    except (subprocess.TimeoutExpired, ValueError, IndexError, OSError) as e:
+        return {"video": False, "font": False, "video_driver": None,
+                "error": f"SDL probe failed: {e}"}
+
+def check_environment(refresh=False):
+    """Return the pygame/SDL check result, re-running it only when the environment changed"""
+    key = environment_key()
+    cache = load_check_cache()
+    entry = cache.pop(key, {})
+    cached = not refresh and "version" in entry
+    if not cached:
+        entry["version"] = pygame_version()
+        entry["sdl"] = probe_sdl() if entry["version"] is not None else None
+    cache[key] = entry
+    if not cached:
+        save_check_cache(cache)
+    return {"version": entry["version"], "sdl": entry["sdl"], "cached": cached}
+
+def installed_versions(names):
+    """Return {name: installed version or None}, using the environment cache when fresh"""
+    key = environment_key()
+    cache = load_check_cache()
+    entry = cache.pop(key, {})
+    packages = entry.setdefault("packages", {})
+    missing = [name for name in names if normalize_name(name) not in packages]
+    for name in missing:
+        packages[normalize_name(name)] = distribution_version(name)
+    cache[key] = entry
+    if missing:
+        save_check_cache(cache)
+    return {name: packages[normalize_name(name)] for name in names}
+
+def check_pygame(refresh=False):
     """Check if pygame is already installed"""
+    result = check_environment(refresh)
+    if result["version"] is None:
+        print("❌ Pygame is not installed")
+        return False
+
+    source = " (cached)" if result["cached"] else ""
+    print(f"✅ Pygame is already installed (version {result['version']}){source}")
+    sdl = result["sdl"]
+    if sdl["video"] and sdl["font"]:
+        print(f"✅ SDL video ({sdl['video_driver']}) and fonts are available")
+    else:
+        print(f"⚠️  SDL is not fully usable: {sdl['error']}")
+    return True
+
+def read_requirements(path="requirements.txt"):
+    """Parse a requirements file into [{"name", "specifiers", "hashes"}].
+
+    Supports "name", "name>=1.0,<3" and pip's "--hash=sha256:..." options.
+    Other pip options (-r, -e, --index-url, ...) are not supported offline.
+    """
+    with open(path) as f:
+        text = f.read().replace("\\\n", " ")
+
+    requirements = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if line.startswith("-"):
+            raise ValueError(f"Unsupported option in {path}: {line}")
+        hashes = re.findall(r"--hash=sha256:([0-9a-fA-F]{64})", line)
+        line = re.sub(r"--hash=\S+", "", line).split(";", 1)[0].strip()
+        match = re.match(r"^([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*(.*)$", line)
+        if not match:
+            raise ValueError(f"Cannot parse requirement in {path}: {line}")
+        specifiers = []
+        for spec in match.group(2).split(","):
+            if not spec.strip():
+                continue
+            spec_match = re.match(r"(~=|===|==|!=|>=|<=|>|<)\s*(\S+)$", spec.strip())
+            if not spec_match:
+                raise ValueError(f"Cannot parse version specifier {spec.strip()!r} in {path}: {line}")
+            specifiers.append(spec_match.groups())
+        requirements.append({"name": match.group(1), "specifiers": specifiers,
+                             "hashes": [h.lower() for h in hashes]})
+    return requirements
+
+def version_tuple(version):
+    """Turn "2.6.1" into (2, 6, 1); pre-release suffixes are ignored"""
+    parts = []
+    for part in version.split("."):
+        digits = re.match(r"\d+", part)
+        if not digits:
+            break
+        parts.append(int(digits.group()))
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
+def version_satisfies(version, specifiers):
+    """Return True if version matches every (operator, version) specifier"""
+    current = version_tuple(version)
+    for op, wanted in specifiers:
+        if wanted.endswith(".*"):
+            prefix = version_tuple(wanted[:-2])
+            matches = current[:len(prefix)] == prefix
+            if (op == "==") != matches:
+                return False
+            continue
+        target = version_tuple(wanted)
+        if op == "~=":
+            prefix = version_tuple(wanted.rsplit(".", 1)[0])
+            ok = current >= target and current[:len(prefix)] == prefix
+        else:
+            ok = {
+                "==": current == target, "===": version == wanted, "!=": current != target,
+                ">=": current >= target, "<=": current <= target,
+                ">": current > target, "<": current < target,
+            }[op]
+        if not ok:
+            return False
+    return True
+
+def file_sha256(path):
+    """Return the SHA-256 of a file, reading it in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def read_hash_manifest(wheelhouse):
+    """Return {wheel file name: sha256} from the wheelhouse's SHA256SUMS (empty if missing)"""
+    manifest = {}
+    try:
+        with open(os.path.join(wheelhouse, HASH_MANIFEST)) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2:
+                    manifest[parts[1].lstrip("*")] = parts[0].lower()
+    except FileNotFoundError:
+        pass
+    return manifest
+
+def verified_wheels(requirement, wheelhouse, manifest):
+    """Hash every matching wheel for this requirement and return {version: [sha256]}.
+
+    A wheel is trusted if its hash is listed in the requirement's --hash
+    options or, when there are none, in the wheelhouse manifest.
+    Raises ValueError if a wheel is present but cannot be trusted.
+    """
+    name = normalize_name(requirement["name"])
+    trusted = {}
+    for file_name in sorted(os.listdir(wheelhouse)):
+        if not file_name.endswith(".whl"):
+            continue
+        # Wheel names are "{distribution}-{version}-...-{platform}.whl"
+        distribution, version = file_name.split("-")[:2]
+        if normalize_name(distribution) != name:
+            continue
+        if not version_satisfies(version, requirement["specifiers"]):
+            continue
+        actual = file_sha256(os.path.join(wheelhouse, file_name))
+        expected = requirement["hashes"] or [manifest.get(file_name)]
+        if actual not in expected:
+            raise ValueError(f"Hash mismatch or missing hash for {file_name}")
+        trusted.setdefault(version, []).append(actual)
+    if not trusted:
+        raise ValueError(f"No matching wheel for {requirement['name']} in {wheelhouse}")
+    return trusted
+
+def pin_from_wheelhouse(requirement, wheelhouse, manifest):
+    """Return (version, requirement line pinned to it with its hashes) for the newest trusted wheel"""
+    wheels = verified_wheels(requirement, wheelhouse, manifest)
+    version = max(wheels, key=version_tuple)
+    # pip re-checks the hash of the wheel it picks; that needs an exact pin
+    line = f"{requirement['name']}=={version}"
+    line += "".join(f" --hash=sha256:{h}" for h in wheels[version])
+    return version, line
+
+def install_from_wheelhouse(lines, wheelhouse):
+    """Install pinned requirement lines from the wheelhouse in one pip run, without network access.
+
+    pip resolves dependencies too. In --require-hashes mode every
+    dependency must itself be pinned with a hash, so a requirements file
+    that leaves one out fails instead of installing something unchecked.
+    """
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write("\n".join(lines) + "\n")
     try:
-        import pygame
-        print(f"✅ Pygame is already installed (version {pygame.version.ver})")
+        subprocess.run([sys.executable, "-m", "pip", "install", "--no-index",
+                        "--find-links", wheelhouse, "--require-hashes", "-r", f.name],
+                       check=True, capture_output=True, text=True)
+    finally:
+        os.remove(f.name)
+
+def install_requirements_offline(wheelhouse=DEFAULT_WHEELHOUSE, requirements_path="requirements.txt",
+                                 jobs=None):
+    """Install every requirement from a local wheelhouse.
+
+    Requirements that are already satisfied are skipped. The wheels are
+    hash-checked in parallel, then everything is installed with a single
+    pip run (pip does not support concurrent installs into one
+    environment). Nothing is installed if any wheel is missing or fails
+    its hash check.
+    """
+    try:
+        requirements = read_requirements(requirements_path)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return False
+    versions = installed_versions([r["name"] for r in requirements])
+
+    pending = []
+    for requirement in requirements:
+        version = versions[requirement["name"]]
+        if version is not None and version_satisfies(version, requirement["specifiers"]):
+            print(f"✅ {requirement['name']} {version} already satisfied")
+        else:
+            pending.append(requirement)
+    if not pending:
         return True
-    except ImportError:
-        print("❌ Pygame is not installed")
+
+    manifest = read_hash_manifest(wheelhouse)
+
+    def pin(requirement):
+        try:
+            return requirement, *pin_from_wheelhouse(requirement, wheelhouse, manifest), None
+        except (OSError, ValueError) as e:
+            return requirement, None, None, str(e)
+
+    with ThreadPoolExecutor(max_workers=jobs or min(8, len(pending))) as pool:
+        pinned = list(pool.map(pin, pending))
+    failed = [(requirement, error) for requirement, _, _, error in pinned if error is not None]
+    for requirement, error in failed:
+        print(f"❌ Cannot install {requirement['name']}: {error}")
+    if failed:
+        return False
+
+    try:
+        install_from_wheelhouse([line for _, _, line, _ in pinned], wheelhouse)
+    except subprocess.CalledProcessError as e:
+        # Show pip's error with the lines that explain it (which packages, ...)
+        lines = (e.stderr or "").splitlines()
+        first = next((i for i, line in enumerate(lines) if line.startswith("ERROR")), len(lines))
+        print(f"❌ pip failed: {lines[first] if lines[first:] else 'no error output'}")
+        for line in lines[first + 1:first + 10]:
+            print(f"   {line}")
         return False
+    except OSError as e:
+        print(f"❌ Could not run pip: {e}")
+        return False
+    for requirement, version, _, _ in pinned:
+        print(f"✅ Installed {requirement['name']} {version} from {wheelhouse}")
+    return True
+
+def run_demo(script):
+    """Run a demo script, through the warm launcher when its zygote is running"""
+    import warm_launcher
+    if warm_launcher.is_running():
+        print("🔥 Starting from the warm launcher")
+        return warm_launcher.launch(script)
+    return subprocess.run([sys.executable, script]).returncode
 
 def main():
     """Main setup function"""
+    parser = argparse.ArgumentParser(description="Set up the Game UI Demo")
+    parser.add_argument("--offline", action="store_true",
+                        help="install requirements.txt from a local wheelhouse and exit")
+    parser.add_argument("--wheelhouse", default=DEFAULT_WHEELHOUSE,
+                        help="directory of .whl files for --offline (default: %(default)s)")
+    parser.add_argument("--jobs", type=int, help="wheels hash-checked in parallel for --offline")
+    args = parser.parse_args()
+
     print("=" * 50)
     print("GAME UI DEMO SETUP")
     print("=" * 50)
     
+    if args.offline:
+        if not install_requirements_offline(args.wheelhouse, jobs=args.jobs):
+            sys.exit(1)
+        check_pygame()
+        return
+    
     # Check if pygame is installed
     if not check_pygame():
         response = input("Would you like to install pygame now? (y/n): ").lower().strip()
@@ -66,7 +436,7 @@ def main():
     response = input("\nWould you like to run the demo now? (y/n): ").lower().strip()
     if response in ['y', 'yes']:
         try:
-            subprocess.run([sys.executable, "game_ui_demo.py"])
+            run_demo("game_ui_demo.py")
         except KeyboardInterrupt:
             print("\nDemo stopped by user")
         except Exception as e:
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Multi-Entity Stress Mode
+========================
+
+Draws thousands of players at once, each with the game's health bar and
+score panel, over a world several screens wide that the camera pans
+across (like a spectator view).
+
+Two ways of drawing the same entities are compared:
+
+- naive: call draw_health_bar() and draw_score_panel() from the game
+  template for every entity, one drawing call per rectangle and text.
+- batched:
+    1. Culling - entities outside the camera view are skipped, and so
+       are entities completely hidden behind the ones drawn on top of
+       them (tracked on a coarse coverage grid, front to back).
+    2. Batching - the bar backgrounds, the bar fills of each colour band
+       (green/yellow/red), the borders, the score panels and the texts
+       are each drawn with a single blits() call from pre-rendered
+       images.
+
+Batching draws layer by layer, so where two visible entities partly
+overlap, every bar is drawn below every score panel. Entities that do
+not overlap look exactly the same in both modes.
+
+Usage:
+    python stress_mode.py --template my_game.py                 # watch 2000 entities
+    python stress_mode.py --template my_game.py --naive         # ... drawn the naive way
+    python stress_mode.py --template my_game.py --report        # frame time vs entity count
+
+The template's STUDENT sections must be filled in, so --template
+usually points at a completed copy of "game_score_demo template.py".
+"""
+
+import argparse
+import math
+import os
+import random
+import time
+
+import pygame
+
+from render_backends import TEXT_CACHE_LIMIT
+from template_loader import TEMPLATE_PATH, load_template
+
+# Entity layout: health bar on top, score panel (always 200x80) below it
+ENTITY_WIDTH = 200
+BAR_HEIGHT = 20
+PANEL_GAP = 4
+PANEL_HEIGHT = 80
+ENTITY_HEIGHT = BAR_HEIGHT + PANEL_GAP + PANEL_HEIGHT
+
+WORLD_SCREENS = 3              # The world is this many screens wide and tall
+CAMERA_SPEED = 4               # Pixels per frame when panning
+COVERAGE_CELL = 10             # Occlusion grid resolution in pixels
+ENTITY_COUNTS = (100, 500, 1000, 2000, 5000, 10000)
+
+
+class Entity:
+    """One player in the stress test"""
+
+    __slots__ = ("x", "y", "health", "max_health", "score")
+
+    def __init__(self, x, y, health, max_health, score):
+        self.x = x
+        self.y = y
+        self.health = health
+        self.max_health = max_health
+        self.score = score
+
+
+def make_entities(count, world_width, world_height, seed=0):
+    """Scatter count entities over the world (later entities are drawn on top)"""
+    rng = random.Random(seed)
+    return [
+        Entity(rng.randrange(world_width - ENTITY_WIDTH),
+               rng.randrange(world_height - ENTITY_HEIGHT),
+               rng.randint(1, 100), 100,
+               rng.randrange(0, 5001, 100))
+        for _ in range(count)
+    ]
+
+
+def draw_entities_naive(game, entities, camera):
+    """Draw every entity with the template's own drawing functions"""
+    cx, cy = camera
+    # draw_score_panel() shows the game's global score, so it is lent to each
+    # entity and the player's own score is put back afterwards
+    player_score = game.score
+    try:
+        for entity in entities:
+            x = entity.x - cx
+            y = entity.y - cy
+            game.draw_health_bar(x, y, ENTITY_WIDTH, BAR_HEIGHT, entity.health, entity.max_health)
+            game.score = entity.score
+            game.draw_score_panel(x, y + BAR_HEIGHT + PANEL_GAP)
+    finally:
+        game.score = player_score
+
+
+class CoverageGrid:
+    """A coarse map of which parts of the screen are already covered.
+
+    The screen is split into square cells. A cell is only marked once an
+    opaque rectangle covers all of it, and a rectangle only counts as
+    hidden when every cell it touches is marked, so nothing visible is
+    ever culled.
+    """
+
+    def __init__(self, width, height, cell=COVERAGE_CELL):
+        self.cell = cell
+        self.cols = -(-width // cell)
+        self.rows = -(-height // cell)
+        self.cells = bytearray(self.cols * self.rows)
+        self._empty = bytes(len(self.cells))
+        self._full = b"\x01" * self.cols
+
+    def reset(self):
+        self.cells[:] = self._empty
+
+    def is_covered(self, left, top, right, bottom):
+        """Return True if the rectangle (clipped to the screen) is fully covered"""
+        cell, cols, cells = self.cell, self.cols, self.cells
+        x0 = max(left, 0) // cell
+        x1 = min((right - 1) // cell + 1, cols)
+        for row in range(max(top, 0) // cell, min((bottom - 1) // cell + 1, self.rows)):
+            start = row * cols
+            if 0 in cells[start + x0:start + x1]:
+                return False
+        return True
+
+    def cover(self, left, top, right, bottom):
+        """Mark every cell lying completely inside the rectangle"""
+        cell, cols, cells = self.cell, self.cols, self.cells
+        x0 = max(-(-left // cell), 0)
+        x1 = min(right // cell, cols)
+        if x1 <= x0:
+            return
+        fill = self._full[:x1 - x0]
+        for row in range(max(-(-top // cell), 0), min(bottom // cell, self.rows)):
+            start = row * cols
+            cells[start + x0:start + x1] = fill
+
+
+class BatchedEntityRenderer:
+    """Cull hidden entities and draw the rest in a few blits() calls"""
+
+    def __init__(self, game):
+        self.game = game
+        backend = game.backend
+        self.grid = CoverageGrid(game.SCREEN_WIDTH, game.SCREEN_HEIGHT)
+        self.last_frame = {"entities": 0, "drawn": 0, "offscreen": 0, "occluded": 0}
+        self._labels = {}
+        self._bands = {}
+
+        # The same pictures draw_health_bar() and draw_score_panel() produce
+        image = pygame.Surface((ENTITY_WIDTH, BAR_HEIGHT))
+        image.fill(game.DARK_RED)
+        self.bar_background = backend.image(image)
+
+        image = pygame.Surface((ENTITY_WIDTH, BAR_HEIGHT), pygame.SRCALPHA)
+        pygame.draw.rect(image, game.WHITE, image.get_rect(), 2)
+        self.bar_border = backend.image(image)
+
+        image = pygame.Surface((ENTITY_WIDTH, PANEL_HEIGHT))
+        image.fill(game.BLUE)
+        pygame.draw.rect(image, game.WHITE, image.get_rect(), 2)
+        self.panel = backend.image(image)
+
+    def band_image(self, color):
+        """Return a full-width bar in color; each entity draws part of it"""
+        image = self._bands.get(color)
+        if image is None:
+            surface = pygame.Surface((ENTITY_WIDTH, BAR_HEIGHT))
+            surface.fill(color)
+            image = self._bands[color] = self.game.backend.image(surface)
+        return image
+
+    def label(self, font, text):
+        """Return (image, half width, half height) for white text, for centring"""
+        key = (font, text)
+        label = self._labels.get(key)
+        if label is None:
+            if len(self._labels) >= TEXT_CACHE_LIMIT:
+                self._labels.clear()
+            image = self.game.backend.text(font, text, self.game.WHITE)
+            rect = image.get_rect()
+            label = self._labels[key] = (image, rect.width // 2, rect.height // 2)
+        return label
+
+    def visible_entities(self, entities, camera):
+        """Return [(entity, x, y)] of entities that can be seen, back to front"""
+        cx, cy = camera
+        width, height = self.game.SCREEN_WIDTH, self.game.SCREEN_HEIGHT
+        grid = self.grid
+        grid.reset()
+        visible = []
+        offscreen = occluded = 0
+
+        # Front to back: an entity is hidden if everything drawn after it covers it
+        for entity in reversed(entities):
+            left = entity.x - cx
+            top = entity.y - cy
+            right = left + ENTITY_WIDTH
+            bottom = top + ENTITY_HEIGHT
+            if right <= 0 or bottom <= 0 or left >= width or top >= height:
+                offscreen += 1
+                continue
+            # Only the bar and the panel are drawn (and opaque), not the gap between them
+            bar_bottom = top + BAR_HEIGHT
+            panel_top = bottom - PANEL_HEIGHT
+            if (grid.is_covered(left, top, right, bar_bottom)
+                    and grid.is_covered(left, panel_top, right, bottom)):
+                occluded += 1
+                continue
+            grid.cover(left, top, right, bar_bottom)
+            grid.cover(left, panel_top, right, bottom)
+            visible.append((entity, left, top))
+
+        visible.reverse()
+        self.last_frame = {"entities": len(entities), "drawn": len(visible),
+                           "offscreen": offscreen, "occluded": occluded}
+        return visible
+
+    def draw(self, entities, camera):
+        """Draw the entities as seen from camera (the world position of the top left)"""
+        game = self.game
+        font, small_font = game.font, game.small_font
+        label = self.label
+
+        # Same colours as draw_health_bar(), including the low-health pulse
+        pulse = int(50 * math.sin(game.health_pulse * 0.1))
+        red = (min(255, game.RED[0] + pulse), game.RED[1], game.RED[2])
+        green_image = self.band_image(game.GREEN)
+        yellow_image = self.band_image(game.YELLOW)
+        red_image = self.band_image(red)
+
+        backgrounds, borders, panels, bar_texts, score_texts = [], [], [], [], []
+        green, yellow, red = [], [], []
+        bar_background, bar_border, panel = self.bar_background, self.bar_border, self.panel
+        half_width = ENTITY_WIDTH // 2
+        panel_offset = BAR_HEIGHT + PANEL_GAP
+
+        for entity, x, y in self.visible_entities(entities, camera):
+            health_percentage = entity.health / entity.max_health
+            bar_width = int(ENTITY_WIDTH * health_percentage)
+            backgrounds.append((bar_background, (x, y)))
+            if bar_width > 0:
+                area = (0, 0, bar_width, BAR_HEIGHT)
+                if health_percentage > 0.6:
+                    green.append((green_image, (x, y), area))
+                elif health_percentage > 0.3:
+                    yellow.append((yellow_image, (x, y), area))
+                else:
+                    red.append((red_image, (x, y), area))
+            borders.append((bar_border, (x, y)))
+            image, w, h = label(small_font, f"{entity.health}/{entity.max_health}")
+            bar_texts.append((image, (x + half_width - w, y + BAR_HEIGHT // 2 - h)))
+
+            panels.append((panel, (x, y + panel_offset)))
+            image, w, h = label(font, f"Score: {entity.score}")
+            score_texts.append((image, (x + half_width - w, y + panel_offset + PANEL_HEIGHT // 2 - h)))
+
+        backend = game.backend
+        backend.blits(backgrounds)
+        backend.blits(green)
+        backend.blits(yellow)
+        backend.blits(red)
+        backend.blits(borders)
+        backend.blits(bar_texts)
+        backend.blits(panels)
+        backend.blits(score_texts)
+
+
+def camera_position(frame, game):
+    """Pan diagonally back and forth across the world"""
+    span_x = game.SCREEN_WIDTH * (WORLD_SCREENS - 1)
+    span_y = game.SCREEN_HEIGHT * (WORLD_SCREENS - 1)
+    step = frame * CAMERA_SPEED
+    x = step % (2 * span_x)
+    y = step % (2 * span_y)
+    return (x if x <= span_x else 2 * span_x - x, y if y <= span_y else 2 * span_y - y)
+
+
+def start_game(template):
+    """Load the template and open its window"""
+    game = load_template(template)
+    game.initialize_pygame()
+    game.score_animation = 0
+    return game
+
+
+def world_size(game):
+    return game.SCREEN_WIDTH * WORLD_SCREENS, game.SCREEN_HEIGHT * WORLD_SCREENS
+
+
+def time_frames(game, draw, entities, frames):
+    """Return the average milliseconds per frame for drawing entities"""
+    backend = game.backend
+    for frame in range(5):  # Warm the text and image caches
+        backend.clear(game.BLACK)
+        draw(entities, camera_position(frame, game))
+    start = time.perf_counter()
+    for frame in range(frames):
+        game.health_pulse += 1
+        backend.clear(game.BLACK)
+        draw(entities, camera_position(frame, game))
+        backend.present()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def run_report(game, counts=ENTITY_COUNTS, frames=60):
+    """Time both drawing modes at each entity count and print how they scale"""
+    batched = BatchedEntityRenderer(game)
+    rows = []
+    print(f"{'Entities':>8} {'Drawn':>7} {'Occluded':>9} {'Naive ms':>9} "
+          f"{'Batched ms':>11} {'Speedup':>8}")
+    print("-" * 58)
+    for count in counts:
+        entities = make_entities(count, *world_size(game))
+        naive_ms = time_frames(game, lambda e, c: draw_entities_naive(game, e, c), entities, frames)
+        batched_ms = time_frames(game, batched.draw, entities, frames)
+        stats = batched.last_frame
+        rows.append({"entities": count, "naive_ms": naive_ms, "batched_ms": batched_ms, **stats})
+        print(f"{count:>8} {stats['drawn']:>7} {stats['occluded']:>9} {naive_ms:>9.2f} "
+              f"{batched_ms:>11.2f} {naive_ms / batched_ms:>7.1f}x")
+
+    # Cost per extra entity, from the smallest to the largest run
+    if len(rows) > 1:
+        first, last = rows[0], rows[-1]
+        added = (last["entities"] - first["entities"]) / 1000
+        print(f"\nPer 1000 extra entities: naive +{(last['naive_ms'] - first['naive_ms']) / added:.2f} ms, "
+              f"batched +{(last['batched_ms'] - first['batched_ms']) / added:.2f} ms")
+    return rows
+
+
+def run_viewer(game, count, naive=False):
+    """Show count entities with the camera panning until ESC or the window closes"""
+    entities = make_entities(count, *world_size(game))
+    batched = BatchedEntityRenderer(game)
+    backend, clock = game.backend, game.clock
+    frame = 0
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_b:
+                naive = not naive
+
+        game.health_pulse += 1
+        backend.clear(game.BLACK)
+        camera = camera_position(frame, game)
+        if naive:
+            draw_entities_naive(game, entities, camera)
+            drawn = count
+        else:
+            batched.draw(entities, camera)
+            drawn = batched.last_frame["drawn"]
+        backend.present()
+        clock.tick(game.FPS)
+        frame += 1
+        if frame % 30 == 0:
+            mode = "naive" if naive else "batched"
+            pygame.display.set_caption(f"Stress mode ({mode}, B to switch) - {count} entities, "
+                                       f"{drawn} drawn, {clock.get_fps():.0f} FPS")
+    pygame.quit()
+
+
+def main():
+    """Parse arguments and run the viewer or the scaling report"""
+    parser = argparse.ArgumentParser(description="Draw thousands of health bars and score panels")
+    parser.add_argument("--template", default=TEMPLATE_PATH,
+                        help="completed game template to take the drawing code from")
+    parser.add_argument("--entities", type=int, default=2000, help="entities in the viewer")
+    parser.add_argument("--naive", action="store_true", help="start the viewer in naive mode")
+    parser.add_argument("--report", action="store_true",
+                        help="print frame time vs entity count instead of opening the viewer")
+    parser.add_argument("--counts", type=int, nargs="+", default=list(ENTITY_COUNTS),
+                        help="entity counts for the report")
+    parser.add_argument("--frames", type=int, default=60, help="frames timed per report row")
+    args = parser.parse_args()
+
+    print("=" * 58)
+    print("MULTI-ENTITY STRESS MODE")
+    print("=" * 58)
+    try:
+        game = start_game(args.template)
+    except SyntaxError as e:
+        print(f"❌ {os.path.basename(args.template)} does not run yet: {e.msg} (line {e.lineno})")
+        print("Fill in the STUDENT sections, or pass --template with a completed copy.")
+        return
+    except pygame.error as e:
+        print(f"❌ Could not open the game window: {e}")
+        return
+
+    if args.report:
+        print(f"Video driver: {os.environ.get('SDL_VIDEODRIVER', 'default')}, "
+              f"backend: {game.backend.name}, {args.frames} frames per row\n")
+        run_report(game, args.counts, args.frames)
+        pygame.quit()
+    else:
+        run_viewer(game, args.entities, args.naive)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Static Pre-Check for Template Submissions
+=========================================
+
+Finds the README's "Common Student Mistakes" by reading the code's
+syntax tree - without importing pygame or running anything - so broken
+submissions are rejected in milliseconds, before the runtime grading
+harness (grade_submissions.py) spends a process on them:
+
+- empty_branch      an if/elif with no code in it (a SyntaxError
+                    "expected an indented block"), or with only `pass`
+- syntax_error      any other SyntaxError
+- undefined_variable  a game variable (player_health, max_health, ...)
+                    that is never defined at module level
+- missing_global    a function assigns a module-level variable without
+                    declaring it `global` (score += 100 fails with
+                    UnboundLocalError; score = 0 silently creates a local)
+- incomplete_reset  reset_game() does not reset every game variable
+                    (assigning it with `global`, or emptying or refilling
+                    it in place - power_ups.clear(), power_ups[:] = [] -
+                    both count)
+
+Results are cached by the SHA-256 of the file's contents, and folders
+are analyzed in parallel with a multiprocessing pool.
+
+Usage:
+    python submission_precheck.py submissions/
+    python submission_precheck.py my_game.py --json
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import time
+
+# Bump when the checks change, so cached results are not reused
+ANALYZER_VERSION = 2
+# The same per-user cache folder as setup_game_demo.py's pygame check
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "score-example")
+PRECHECK_CACHE_FILE = os.path.join(CACHE_DIR, "precheck_cache.json")
+MAX_CACHED_RESULTS = 100_000
+# Below this many files a pool costs more than it saves
+POOL_THRESHOLD = 32
+
+GAME_VARIABLES = ["player_health", "max_health", "score", "status", "power_ups", "level"]
+# Variables reset_game() must set (max_health never changes)
+RESET_VARIABLES = ["player_health", "score", "status", "power_ups", "level"]
+# Methods that change a list (or dict) in place - no `global` needed
+MUTATING_METHODS = {"append", "clear", "extend", "insert", "pop", "remove", "reverse",
+                    "sort", "update", "setdefault", "popitem"}
+# Comprehensions and lambdas have their own scope, like nested functions
+NESTED_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef,
+                 ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+
+def _problem(kind, line, message):
+    return {"kind": kind, "line": line, "message": message}
+
+
+def _module_globals(tree):
+    """Return the names assigned at module level"""
+    names = set()
+    for node in tree.body:
+        targets = []
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, (ast.AnnAssign, ast.AugAssign)):
+            targets = [node.target]
+        elif isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.update((alias.asname or alias.name).split(".")[0] for alias in node.names)
+        for target in targets:
+            names.update(n.id for n in ast.walk(target) if isinstance(n, ast.Name))
+    return names
+
+
+def _function_scope(function):
+    """Return (global names, parameters, [(name, line, augmented)] assigned,
+    {names changed in place}) for a function"""
+    declared = set()
+    assigned = []
+    mutated = set()
+    pending = list(function.body)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, NESTED_SCOPES):
+            continue  # Nested scopes have names of their own
+        pending.extend(ast.iter_child_nodes(node))
+        if isinstance(node, ast.Global):
+            declared.update(node.names)
+        elif isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name):
+            assigned.append((node.target.id, node.lineno, True))
+        elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            assigned.append((node.id, node.lineno, False))
+        elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+              and isinstance(node.func.value, ast.Name) and node.func.attr in MUTATING_METHODS):
+            mutated.add(node.func.value.id)           # power_ups.clear()
+        elif (isinstance(node, ast.Subscript) and isinstance(node.ctx, (ast.Store, ast.Del))
+              and isinstance(node.value, ast.Name)):
+            mutated.add(node.value.id)                # power_ups[:] = []
+    arguments = function.args
+    parameters = {arg.arg for arg in arguments.posonlyargs + arguments.args + arguments.kwonlyargs}
+    for arg in (arguments.vararg, arguments.kwarg):
+        if arg is not None:
+            parameters.add(arg.arg)
+    return declared, parameters, assigned, mutated
+
+
+def _is_empty_body(body):
+    return all(isinstance(node, ast.Pass) for node in body)
+
+
+def analyze_source(source, filename="<submission>"):
+    """Return the list of problems found in a submission's source"""
+    try:
+        tree = ast.parse(source, filename)
+    except SyntaxError as e:
+        if "expected an indented block" in (e.msg or ""):
+            # Python 3.10+ names the statement: "... after 'if' statement on line 350"
+            match = re.search(r"on line (\d+)", e.msg)
+            line = int(match.group(1)) if match else e.lineno
+            return [_problem("empty_branch", line, f"Branch has no code: {e.msg}")]
+        return [_problem("syntax_error", e.lineno, e.msg)]
+
+    problems = []
+    module_globals = _module_globals(tree)
+    # A `global` + assignment inside a function also defines the variable
+    defined_in_functions = set()
+    functions = [node for node in tree.body if isinstance(node, ast.FunctionDef)]
+    scopes = {function.name: _function_scope(function) for function in functions}
+    for declared, _, assigned, _ in scopes.values():
+        defined_in_functions.update(name for name, _, _ in assigned if name in declared)
+
+    for name in GAME_VARIABLES:
+        if name not in module_globals:
+            used = [node.lineno for node in ast.walk(tree)
+                    if isinstance(node, ast.Name) and node.id == name]
+            where = f" (used on line {used[0]})" if used else ""
+            if name in defined_in_functions:
+                message = f"{name} is only set inside functions - define it at the top of the file"
+            else:
+                message = f"{name} is never defined{where}"
+            problems.append(_problem("undefined_variable", used[0] if used else None, message))
+
+    for function in functions:
+        declared, parameters, assigned, _ = scopes[function.name]
+        reported = set()
+        for name, line, augmented in assigned:
+            if name in declared or name in parameters or name in reported:
+                continue
+            # += on any module variable fails; a plain assignment to a helper
+            # variable is usually a deliberate local, but never for game variables
+            if name not in module_globals or (not augmented and name not in GAME_VARIABLES):
+                continue
+            reported.add(name)
+            if augmented:
+                message = (f"{function.name}() changes {name} without `global {name}` "
+                           f"(UnboundLocalError)")
+            else:
+                message = (f"{function.name}() assigns {name} without `global {name}` "
+                           f"(the game's {name} never changes)")
+            problems.append(_problem("missing_global", line, message))
+
+        for node in ast.walk(function):
+            if isinstance(node, ast.If):
+                if _is_empty_body(node.body):
+                    problems.append(_problem("empty_branch", node.lineno,
+                                             f"Branch in {function.name}() only contains pass"))
+
+    if "reset_game" in scopes:
+        declared, parameters, assigned, mutated = scopes["reset_game"]
+        local = {name for name, _, _ in assigned if name not in declared} | parameters
+        reset = {name for name, _, _ in assigned if name in declared}
+        # Emptying the game's list in place resets it just as well as assigning it
+        reset.update(name for name in mutated if name not in local)
+        missing = [name for name in RESET_VARIABLES if name not in reset]
+        if missing:
+            line = next(f.lineno for f in functions if f.name == "reset_game")
+            problems.append(_problem("incomplete_reset", line,
+                                     f"reset_game() does not reset: {', '.join(missing)}"))
+
+    problems.sort(key=lambda problem: problem["line"] or 0)
+    return problems
+
+
+def _analyze_job(job):
+    digest, path, source = job
+    return digest, analyze_source(source, path)
+
+
+def load_cache():
+    """Return the cached results ({sha256: problems})"""
+    try:
+        with open(PRECHECK_CACHE_FILE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != ANALYZER_VERSION:
+        return {}
+    return cache.get("results", {})
+
+
+def save_cache(results):
+    """Write the cached results, keeping only the most recent ones"""
+    entries = list(results.items())[-MAX_CACHED_RESULTS:]
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = PRECHECK_CACHE_FILE + f".{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": ANALYZER_VERSION, "results": dict(entries)}, f)
+        os.replace(tmp_path, PRECHECK_CACHE_FILE)
+    except OSError:
+        pass  # The cache is only an optimization
+
+
+def precheck_files(paths, jobs=None, use_cache=True):
+    """Check every file and return {path: {"sha256", "ok", "problems", "cached"}}"""
+    cache = load_cache() if use_cache else {}
+    results = {}
+    jobs_by_digest = {}
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        results[path] = {"sha256": digest, "cached": digest in cache}
+        if digest not in cache and digest not in jobs_by_digest:
+            jobs_by_digest[digest] = (digest, path, data.decode("utf-8", errors="replace"))
+
+    work = list(jobs_by_digest.values())
+    if len(work) >= POOL_THRESHOLD and (jobs or os.cpu_count() or 1) > 1:
+        with multiprocessing.Pool(jobs) as pool:
+            analyzed = pool.map(_analyze_job, work, chunksize=max(1, len(work) // 64))
+    else:
+        analyzed = [_analyze_job(job) for job in work]
+    cache.update(analyzed)
+    if use_cache and analyzed:
+        save_cache(cache)
+
+    for result in results.values():
+        result["problems"] = cache[result["sha256"]]
+        result["ok"] = not result["problems"]
+    return results
+
+
+def find_python_files(inputs):
+    """Expand folders into the .py files they contain"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(sorted(os.path.join(item, name) for name in os.listdir(item)
+                                if name.endswith(".py")))
+        else:
+            paths.append(item)
+    return paths
+
+
+def main():
+    """Parse arguments and pre-check the submissions"""
+    parser = argparse.ArgumentParser(description="Find common template mistakes without running code")
+    parser.add_argument("inputs", nargs="+", help="submission files or folders of them")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPUs)")
+    parser.add_argument("--no-cache", action="store_true", help="ignore cached results")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    paths = find_python_files(args.inputs)
+    start = time.perf_counter()
+    results = precheck_files(paths, args.jobs, use_cache=not args.no_cache)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 50)
+    print("SUBMISSION PRE-CHECK")
+    print("=" * 50)
+    for path, result in results.items():
+        if result["ok"]:
+            print(f"✅ {path}")
+            continue
+        print(f"❌ {path}")
+        for problem in result["problems"]:
+            line = f"line {problem['line']}: " if problem["line"] else ""
+            print(f"   {problem['kind']}: {line}{problem['message']}")
+    rejected = sum(not result["ok"] for result in results.values())
+    cached = sum(result["cached"] for result in results.values())
+    print(f"\n{len(results)} files, {rejected} rejected, {cached} from cache, "
+          f"{elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
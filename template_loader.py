@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Template Loader
+===============
+
+"game_score_demo template.py" has a space in its name, so it cannot be
+imported with a normal import statement. load_template() imports it (or
+a student's completed copy of it) as a module, without running main(),
+so other tools can call its drawing and game functions directly.
+"""
+
+import importlib.util
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_PATH = os.path.join(HERE, "game_score_demo template.py")
+
+
+def load_template(path=TEMPLATE_PATH, module_name="game_template"):
+    """Import the game template at path and return the module.
+
+    Raises SyntaxError if the STUDENT sections have not been filled in yet.
+    """
+    # The template imports game_history and render_backends from this folder,
+    # even when a completed copy lives somewhere else
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,28 @@
+import gc
+import sys
+
+from deep_size import deep_sizeof
+
+
+def test_untracked_dict_counts_its_keys_and_values():
+    value = "x" * 100_000
+    data = {"a": value}
+    assert not gc.is_tracked(data)
+    assert deep_sizeof(data)["total_bytes"] == (
+        sys.getsizeof(data) + sys.getsizeof("a") + sys.getsizeof(value))
+
+
+def test_untracked_tuple_counts_its_items():
+    value = "x" * 100_000
+    data = (value,)
+    gc.collect()  # Tuples are untracked by the collector itself
+    assert not gc.is_tracked(data)
+    assert deep_sizeof(data)["total_bytes"] == sys.getsizeof(data) + sys.getsizeof(value)
+
+
+def test_shared_objects_are_counted_once():
+    nested = [3, 4]
+    original = [1, 2, nested]
+    alone = deep_sizeof(original)["total_bytes"]
+    both = deep_sizeof(original, original.copy())["total_bytes"]
+    assert both == alone + sys.getsizeof(original.copy())
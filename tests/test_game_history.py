@@ -0,0 +1,49 @@
+import pytest
+
+from game_history import GameHistory
+
+
+def test_more_distinct_statuses_than_ids():
+    history = GameHistory(capacity=10)
+    for frame in range(1000):
+        history.record(100, frame, f"status {frame}", ["Shield"], 1)
+    assert len(history) == 10
+    for frames_ago in range(10):
+        state = history.snapshot(frames_ago)
+        assert state["status"] == f"status {999 - frames_ago}"
+        assert state["power_ups"] == ["Shield"]
+
+
+def test_history_full_of_distinct_statuses_keeps_the_newest_frames():
+    history = GameHistory(capacity=1000)
+    for frame in range(600):
+        history.record(100, frame, f"status {frame}", [], 1)
+    latest = history.snapshot(0)
+    assert latest["status"] == "status 599" and latest["score"] == 599
+    assert history.snapshot(len(history) - 1)["status"] == f"status {600 - len(history)}"
+
+
+def test_equal_status_strings_share_an_id():
+    history = GameHistory(capacity=10)
+    for frame in range(300):
+        history.record(100, frame, "".join(["Al", "ive"]), [], 1)
+    assert history.rewind(5)["status"] == "Alive"
+
+
+def test_ids_are_freed_when_no_frame_uses_them():
+    history = GameHistory(capacity=4)
+    for frame in range(20):
+        history.record(100, frame, f"status {frame}", [f"power {frame}"], 1)
+    # 4 frames plus the current values share 8 strings
+    assert len(history._strings.in_use()) == 8
+    history.rewind(2)
+    history.clear()
+    history.record(100, 0, "Alive", [], 1)
+    assert {history._strings.name(ident) for ident in history._strings.in_use()} == {"Alive"}
+
+
+def test_numbers_too_big_for_their_field_are_rejected():
+    history = GameHistory(capacity=4)
+    with pytest.raises(ValueError, match="level"):
+        history.record(100, 0, "Alive", [], 70_000)
+    assert len(history) == 0
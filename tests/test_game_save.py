@@ -0,0 +1,26 @@
+import struct
+
+import pytest
+
+from game_save import STATUS_SIZE, decode_save, encode_save
+
+STATE = {"player_health": 70, "max_health": 100, "score": 1200, "status": "Alive",
+         "power_ups": ["Shield", "Fire Power"], "level": 3, "health_pulse": 4521,
+         "score_animation": 0}
+
+
+def test_round_trip():
+    assert decode_save(encode_save(**STATE)) == STATE
+
+
+def test_long_status_is_cut_at_a_character_boundary():
+    state = dict(STATE, status="Invincible for now ✨")
+    status = decode_save(encode_save(**state))["status"]
+    assert status == "Invincible for n"
+    state = dict(STATE, status="é" * STATUS_SIZE)
+    assert decode_save(encode_save(**state))["status"] == "é" * (STATUS_SIZE // 2)
+
+
+def test_out_of_range_numbers_raise_struct_error():
+    with pytest.raises(struct.error):
+        encode_save(**dict(STATE, level=70_000))
@@ -0,0 +1,25 @@
+import pygame
+
+from golden_frames import frame_hash
+
+
+def test_padded_rows_hash_like_the_same_pixels_unpadded():
+    parent = pygame.Surface((10, 4), depth=32)
+    parent.fill((10, 20, 30))
+    parent.fill((200, 100, 50), (3, 1, 2, 2))
+    padded = parent.subsurface((2, 0, 5, 4))
+    assert padded.get_pitch() != padded.get_width() * padded.get_bytesize()
+    assert frame_hash(padded) == frame_hash(padded.copy())
+
+
+def test_unused_pixel_byte_is_not_hashed():
+    surface = pygame.Surface((4, 2), depth=32)
+    surface.fill((1, 2, 3))
+    before = frame_hash(surface)
+    unused = next(i for i in range(4) if not any(mask >> (8 * i) & 0xFF
+                                                 for mask in surface.get_masks()))
+    with memoryview(surface.get_buffer()) as pixels:
+        pixels[unused] = 0xAB
+    assert frame_hash(surface) == before
+    surface.set_at((0, 0), (1, 2, 4))
+    assert frame_hash(surface) != before
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+import time
+from multiprocessing import shared_memory
+
+import pytest
+
+from live_state import (HEADER_FORMAT, LIVE_MAGIC, LIVE_VERSION, PAYLOAD_FORMAT, SEGMENT_SIZE,
+                        LiveStateError, LiveStatePublisher, LiveStateReader)
+
+
+def test_out_of_range_values_are_clamped():
+    publisher = LiveStatePublisher(f"live_state_test_{time.time_ns()}")
+    reader = LiveStateReader(publisher.name)
+    try:
+        publisher.publish(2**40, 100, 10**30, 70_000, "Alive", ["Shield"], fps=-5)
+        state = reader.read()
+    finally:
+        reader.close()
+        publisher.close()
+    assert state["player_health"] == 2**31 - 1
+    assert state["score"] == 2**63 - 1
+    assert state["level"] == 65535
+    assert state["fps"] == 0
+    assert state["power_ups"] == ["Shield"]
+    assert state["sequence"] == 2
+
+
+def test_block_of_a_running_game_is_not_taken_over():
+    publisher = LiveStatePublisher(f"live_state_test_{time.time_ns()}")
+    reader = LiveStateReader(publisher.name)
+    try:
+        publisher.publish(1, 2, 3, 4, "Alive", [])
+        with pytest.raises(LiveStateError, match="running game"):
+            LiveStatePublisher(publisher.name)
+        assert reader.read()["sequence"] == 2
+    finally:
+        reader.close()
+        publisher.close()
+
+
+def test_block_of_a_dead_game_is_taken_over():
+    finished = subprocess.Popen([sys.executable, "-c", "pass"])
+    finished.wait()
+    # What a game that crashed leaves behind
+    leftover = shared_memory.SharedMemory(f"live_state_test_{time.time_ns()}", create=True,
+                                          size=SEGMENT_SIZE)
+    HEADER_FORMAT.pack_into(leftover.buf, 0, LIVE_MAGIC, LIVE_VERSION, PAYLOAD_FORMAT.size,
+                            finished.pid)
+    try:
+        publisher = LiveStatePublisher(leftover.name)
+        publisher.publish(1, 2, 3, 4, "Alive", [])
+        publisher.close()
+    finally:
+        leftover.close()
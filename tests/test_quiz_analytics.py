@@ -0,0 +1,31 @@
+import pytest
+
+from quiz_analytics import add_attempt
+
+
+def attempt(*answers):
+    return {"quiz": "memory_references", "score": 0,
+            "answers": [{"choice": choice, "correct": correct, "seconds": seconds}
+                        for choice, correct, seconds in answers]}
+
+
+def test_attempt_is_summarized():
+    summaries = {}
+    add_attempt(summaries, attempt((1, True, 4.2), (3, False, 10)))
+    assert summaries["memory_references:1"]["choices"] == [0, 1, 0, 0]
+    assert summaries["memory_references:2"]["correct"] == 0
+    assert summaries["memory_references:2"]["sum_rest"] == 1
+
+
+@pytest.mark.parametrize("bad_answer", [(-1, True, 1.0), (10**9, True, 1.0), (1.5, True, 1.0),
+                                        (1, True, -2.0), (1, True, float("nan")),
+                                        (1, "yes", 1.0)])
+def test_invalid_attempt_changes_nothing(bad_answer):
+    summaries = {}
+    add_attempt(summaries, attempt((1, True, 4.2)))
+    before = {key: dict(summary, choices=list(summary["choices"]))
+              for key, summary in summaries.items()}
+    with pytest.raises(ValueError):
+        add_attempt(summaries, attempt((2, False, 3.0), bad_answer))
+    assert {key: dict(summary, choices=list(summary["choices"]))
+            for key, summary in summaries.items()} == before
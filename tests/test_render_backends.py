@@ -0,0 +1,31 @@
+import pygame
+
+from render_backends import SurfaceBackend
+
+
+class FblitsSurface(pygame.Surface):
+    """A Surface with pygame-ce's fblits(), which only takes (image, pos) pairs"""
+
+    def __init__(self, size):
+        super().__init__(size)
+        self.fblits_calls = 0
+
+    def fblits(self, blits):
+        blits = list(blits)
+        assert all(len(item) == 2 for item in blits)
+        self.fblits_calls += 1
+        self.blits(blits, doreturn=False)
+
+
+def test_blits_with_areas_do_not_use_fblits():
+    surface = FblitsSurface((20, 10))
+    backend = SurfaceBackend(surface)
+    image = pygame.Surface((10, 10))
+    image.fill((255, 0, 0))
+
+    backend.blits([(image, (0, 0))])
+    assert surface.fblits_calls == 1
+    backend.blits([(image, (10, 0), (0, 0, 5, 10))])
+    assert surface.fblits_calls == 1
+    assert surface.get_at((14, 5))[:3] == (255, 0, 0)
+    assert surface.get_at((15, 5))[:3] == (0, 0, 0)
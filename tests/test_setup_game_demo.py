@@ -0,0 +1,19 @@
+import pytest
+
+from setup_game_demo import read_requirements
+
+
+def test_requirements_are_parsed(tmp_path):
+    path = tmp_path / "requirements.txt"
+    path.write_text("pygame>=2.0,<3  # the game\n\nNumPy==1.26.4 --hash=sha256:" + "A" * 64 + "\n")
+    assert read_requirements(str(path)) == [
+        {"name": "pygame", "specifiers": [(">=", "2.0"), ("<", "3")], "hashes": []},
+        {"name": "NumPy", "specifiers": [("==", "1.26.4")], "hashes": ["a" * 64]},
+    ]
+
+
+def test_malformed_specifier_names_the_line(tmp_path):
+    path = tmp_path / "requirements.txt"
+    path.write_text("pygame>=2.0,latest\n")
+    with pytest.raises(ValueError, match="pygame>=2.0,latest"):
+        read_requirements(str(path))
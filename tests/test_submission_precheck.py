@@ -0,0 +1,43 @@
+from submission_precheck import analyze_source
+
+GAME = """
+player_health = 100
+max_health = 100
+score = 0
+status = "Alive"
+power_ups = []
+level = 1
+
+def reset_game():
+    global player_health, score, status, level
+    player_health = max_health
+    score = 0
+    status = "Alive"
+    level = 1
+{reset}
+"""
+
+
+def kinds(source):
+    return [problem["kind"] for problem in analyze_source(source)]
+
+
+def test_power_ups_reset_in_place_is_accepted():
+    for reset in ("    power_ups.clear()", "    power_ups[:] = []", "    del power_ups[:]",
+                  "    power_ups.clear()\n    power_ups.extend(['Shield'])"):
+        assert kinds(GAME.format(reset=reset)) == []
+
+
+def test_power_ups_not_reset_is_reported():
+    assert kinds(GAME.format(reset="")) == ["incomplete_reset"]
+
+
+def test_local_list_emptied_is_not_a_reset():
+    reset = "    power_ups = []\n    power_ups.clear()"
+    assert "incomplete_reset" in kinds(GAME.format(reset=reset))
+
+
+def test_comprehension_variables_are_not_assignments():
+    source = GAME.format(reset="    power_ups.clear()") + (
+        "\ndef best(scores):\n    return max(score for score in scores)\n")
+    assert kinds(source) == []
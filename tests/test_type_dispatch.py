@@ -0,0 +1,38 @@
+from type_dispatch import MethodDispatcher, make_it_go_dispatch, Bicycle, Car, Rock
+
+
+class StaticVehicle:
+    @staticmethod
+    def drive():
+        return "static"
+
+
+class ClassVehicle:
+    @classmethod
+    def drive(cls):
+        return cls.__name__
+
+
+class SportsCar(Car):
+    pass
+
+
+def test_plain_methods():
+    assert make_it_go_dispatch(Car()) == "Vroom!"
+    assert make_it_go_dispatch(SportsCar()) == "Vroom!"
+    assert make_it_go_dispatch(Bicycle()) == "Pedal pedal!"
+    assert make_it_go_dispatch(Rock()) == "I don't know how to make this go!"
+
+
+def test_staticmethod_and_classmethod_are_called_like_obj_method():
+    dispatcher = MethodDispatcher("drive")
+    for vehicle in (StaticVehicle(), ClassVehicle(), StaticVehicle(), ClassVehicle()):
+        assert dispatcher.dispatch(vehicle) == vehicle.drive()
+
+
+def test_builtin_methods_take_arguments():
+    dispatcher = MethodDispatcher("upper", "append")
+    assert dispatcher("abc") == "ABC"
+    items = []
+    dispatcher(items, 1)
+    assert items == [1]
@@ -0,0 +1,48 @@
+import os
+import socket
+
+import pytest
+
+import warm_launcher
+
+
+def test_preloaded_modules_cover_the_demo_imports():
+    modules = warm_launcher.preload_modules()
+    for name in ("pygame", "game_save", "live_state", "render_backends", "game_metrics",
+                 "deep_size", "quiz_analytics"):
+        assert name in modules
+
+
+def test_script_imports(tmp_path):
+    script = tmp_path / "demo.py"
+    script.write_text("import os, os.path as p\nfrom game_save import encode_save\n"
+                      "def f():\n    import random  # used later\n"
+                      "from . import sibling\n")
+    assert warm_launcher.script_imports(str(script)) == {"os", "game_save", "random"}
+
+
+def test_socket_dir_must_be_private(tmp_path):
+    socket_dir = tmp_path / "launcher"
+    warm_launcher.private_socket_dir(str(socket_dir / "launcher.sock"))
+    assert (socket_dir.stat().st_mode & 0o777) == 0o700
+    socket_dir.chmod(0o755)
+    with pytest.raises(RuntimeError):
+        warm_launcher.private_socket_dir(str(socket_dir / "launcher.sock"))
+
+
+def test_only_stale_sockets_are_removed(tmp_path):
+    path = str(tmp_path / "launcher.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(1)
+    with pytest.raises(RuntimeError):
+        warm_launcher.remove_stale_socket(path)
+    listener.close()
+    warm_launcher.remove_stale_socket(path)
+    assert not os.path.exists(path)
+
+
+def test_peer_is_the_same_user():
+    left, right = socket.socketpair(socket.AF_UNIX)
+    with left, right:
+        assert warm_launcher.same_user(left)
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Cached Type Dispatch
+====================
+
+process_data() in dynamic_typing_demo.py walks an isinstance() chain on
+every call, and make_it_go() probes objects with hasattr(). Both repeat
+the same type checks for every value even though the answer only depends
+on the value's type.
+
+This module resolves the handler once per concrete type and caches it:
+
+- TypeDispatcher picks a handler by class (following the MRO, like
+  isinstance() would).
+- MethodDispatcher picks the first method an object's class provides
+  (duck typing, like the hasattr() chain).
+
+Registering a new handler invalidates the cache, and callers can hook
+into that invalidation to drop their own derived caches.
+
+Run this file to benchmark both against the original styles.
+"""
+
+import timeit
+import types
+
+
+class TypeDispatcher:
+    """Call a handler chosen by the argument's type, cached per type."""
+
+    def __init__(self, default=None):
+        self._handlers = {}
+        self._cache = {}
+        self._invalidation_hooks = []
+        self.default = default
+        self.dispatch = self._make_dispatch()
+
+    def register(self, cls, handler=None):
+        """Register handler for cls (and its subclasses).
+
+        Can be used directly or as a decorator:
+
+            @dispatcher.register(str)
+            def handle_str(data): ...
+        """
+        if handler is None:
+            return lambda func: self.register(cls, func)
+        self._handlers[cls] = handler
+        self.invalidate()
+        return handler
+
+    def add_invalidation_hook(self, hook):
+        """Call hook() whenever the handler cache is cleared."""
+        self._invalidation_hooks.append(hook)
+
+    def invalidate(self):
+        """Forget every cached resolution."""
+        self._cache.clear()
+        for hook in self._invalidation_hooks:
+            hook()
+
+    def resolve(self, cls):
+        """Return the handler for cls, resolving and caching it on first use."""
+        try:
+            return self._cache[cls]
+        except KeyError:
+            pass
+        handler = self.default
+        for base in cls.__mro__:
+            if base in self._handlers:
+                handler = self._handlers[base]
+                break
+        if handler is None:
+            raise TypeError(f"No handler registered for type {cls.__name__}")
+        self._cache[cls] = handler
+        return handler
+
+    def _make_dispatch(self):
+        """Build the single-argument fast path used by hot loops.
+
+        A plain closure over the cache dict avoids the attribute lookups
+        and argument packing of __call__.
+        """
+        cache_get = self._cache.get
+        resolve = self.resolve
+
+        def dispatch(obj):
+            handler = cache_get(type(obj))
+            if handler is None:
+                handler = resolve(type(obj))
+            return handler(obj)
+
+        return dispatch
+
+    def __call__(self, obj, *args, **kwargs):
+        handler = self._cache.get(type(obj))
+        if handler is None:
+            handler = self.resolve(type(obj))
+        return handler(obj, *args, **kwargs)
+
+
+def _method_caller(cls, name):
+    """Return a function doing obj.name(*args) for instances of cls, or None.
+
+    Looks name up along the MRO without triggering descriptors (a
+    getattr() on the class would hand back a staticmethod's function or a
+    classmethod already bound to the class).
+    """
+    for base in cls.__mro__:
+        if name in vars(base):
+            attribute = vars(base)[name]
+            break
+    else:
+        return None
+    if attribute is None:
+        return None
+    if isinstance(attribute, types.FunctionType):
+        return attribute  # obj.name(*args) is attribute(obj, *args)
+    bind = getattr(type(attribute), "__get__", None)
+    if bind is None:
+        return lambda obj, *args, **kwargs: attribute(*args, **kwargs)
+    return lambda obj, *args, **kwargs: bind(attribute, obj, cls)(*args, **kwargs)
+
+
+class MethodDispatcher:
+    """Call the first of several method names an object's class defines.
+
+    This is the cached equivalent of:
+
+        if hasattr(obj, "drive"): return obj.drive()
+        elif hasattr(obj, "ride"): return obj.ride()
+
+    Methods are looked up on the class, so attributes set on individual
+    instances are not considered. Plain functions are cached and called
+    directly; anything else (staticmethod, classmethod, builtin methods,
+    ...) is bound through the descriptor protocol on every call, exactly
+    as obj.name would be.
+    """
+
+    def __init__(self, *method_names, fallback=None):
+        self.method_names = list(method_names)
+        self.fallback = fallback
+        self._cache = {}
+        self._invalidation_hooks = []
+        self.dispatch = self._make_dispatch()
+
+    def add_method(self, name):
+        """Add another method name to try (after the existing ones)."""
+        self.method_names.append(name)
+        self.invalidate()
+
+    def add_invalidation_hook(self, hook):
+        """Call hook() whenever the method cache is cleared."""
+        self._invalidation_hooks.append(hook)
+
+    def invalidate(self):
+        """Forget every cached resolution."""
+        self._cache.clear()
+        for hook in self._invalidation_hooks:
+            hook()
+
+    def resolve(self, cls):
+        """Return the function to call for instances of cls."""
+        try:
+            return self._cache[cls]
+        except KeyError:
+            pass
+        for name in self.method_names:
+            method = _method_caller(cls, name)
+            if method is not None:
+                break
+        else:
+            method = self.fallback
+            if method is None:
+                raise TypeError(f"{cls.__name__} has none of: {', '.join(self.method_names)}")
+        self._cache[cls] = method
+        return method
+
+    def _make_dispatch(self):
+        """Build the single-argument fast path (see TypeDispatcher)."""
+        cache_get = self._cache.get
+        resolve = self.resolve
+
+        def dispatch(obj):
+            method = cache_get(type(obj))
+            if method is None:
+                method = resolve(type(obj))
+            return method(obj)
+
+        return dispatch
+
+    def __call__(self, obj, *args, **kwargs):
+        method = self._cache.get(type(obj))
+        if method is None:
+            method = self.resolve(type(obj))
+        return method(obj, *args, **kwargs)
+
+
+# ========================================
+# The demo functions, in both styles
+# ========================================
+
+def process_data_isinstance(data):
+    """process_data() from dynamic_typing_demo.py (without the print)."""
+    if isinstance(data, (int, float)):
+        return data * 2
+    elif isinstance(data, str):
+        return data.upper()
+    elif isinstance(data, list):
+        return len(data)
+    else:
+        return "Unknown type"
+
+
+def _double(data):
+    return data * 2
+
+
+def _unknown(data):
+    return "Unknown type"
+
+
+process_data_dispatcher = TypeDispatcher(default=_unknown)
+process_data_dispatcher.register(int, _double)
+process_data_dispatcher.register(float, _double)
+process_data_dispatcher.register(str, str.upper)
+process_data_dispatcher.register(list, len)
+process_data_dispatch = process_data_dispatcher.dispatch
+
+
+class Car:
+    def drive(self):
+        return "Vroom!"
+
+
+class Bicycle:
+    def ride(self):
+        return "Pedal pedal!"
+
+
+class Rock:
+    pass
+
+
+def make_it_go_hasattr(vehicle):
+    """make_it_go() from dynamic_typing_demo.py."""
+    if hasattr(vehicle, 'drive'):
+        return vehicle.drive()
+    elif hasattr(vehicle, 'ride'):
+        return vehicle.ride()
+    else:
+        return "I don't know how to make this go!"
+
+
+def _cannot_go(vehicle):
+    return "I don't know how to make this go!"
+
+
+make_it_go_dispatcher = MethodDispatcher("drive", "ride", fallback=_cannot_go)
+make_it_go_dispatch = make_it_go_dispatcher.dispatch
+
+
+def run_benchmark(number=200_000, repeat=5):
+    """Time both styles on the same mixed-type input and print the results."""
+    records = [42, "hello", [1, 2, 3], 3.14, {"key": "value"}, True]
+    vehicles = [Car(), Bicycle(), Rock()]
+
+    # Both styles must agree before timing them
+    for record in records:
+        assert process_data_isinstance(record) == process_data_dispatch(record)
+    for vehicle in vehicles:
+        assert make_it_go_hasattr(vehicle) == make_it_go_dispatch(vehicle)
+
+    def per_call(func, values):
+        def loop():
+            for value in values:
+                func(value)
+        loops = max(1, number // len(values))
+        best = min(timeit.repeat(loop, number=loops, repeat=repeat))
+        return best / (loops * len(values)) * 1e9
+
+    rows = [
+        ("process_data: isinstance chain", per_call(process_data_isinstance, records)),
+        ("process_data: cached dispatch", per_call(process_data_dispatch, records)),
+        ("make_it_go: hasattr probing", per_call(make_it_go_hasattr, vehicles)),
+        ("make_it_go: cached dispatch", per_call(make_it_go_dispatch, vehicles)),
+    ]
+
+    print(f"{'Variant':<34} {'ns/call':>10}")
+    print("-" * 45)
+    for name, nanoseconds in rows:
+        print(f"{name:<34} {nanoseconds:>10.1f}")
+    return rows
+
+
+def main():
+    """Run the dispatch benchmark"""
+    print("=" * 50)
+    print("CACHED TYPE DISPATCH BENCHMARK")
+    print("=" * 50)
+    run_benchmark()
+
+
+if __name__ == "__main__":
+    main()
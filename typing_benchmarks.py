@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Dynamic Typing Cost Microbenchmarks
+===================================
+
+dynamic_typing_demo.py talks about the costs of dynamic typing; this
+script measures them on the interpreter you run it with.
+
+Benchmarks:
+- rebinding a variable to values of different types vs a single type
+- duck-typed method calls vs direct function calls
+- isinstance() dispatch vs try/except dispatch
+- attribute access on __slots__ classes vs regular (dict-backed) classes
+
+Each benchmark is warmed up, then timed over several runs; the results
+(min, mean, median, standard deviation in nanoseconds per operation)
+can be saved as JSON and two result files can be compared.
+
+Usage:
+    python typing_benchmarks.py                      # run and print
+    python typing_benchmarks.py --output py311.json  # run and save
+    python typing_benchmarks.py --compare old.json new.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+
+# Operations performed inside each timed loop
+INNER_LOOPS = 1000
+
+
+# ========================================
+# Benchmark bodies
+# ========================================
+# Each benchmark is a function taking a loop count and performing
+# INNER_LOOPS * loops operations, so the loop overhead is shared.
+
+def bench_rebind_same_type(loops):
+    seven = 7
+    eight = 8
+    for _ in range(loops):
+        for i in range(INNER_LOOPS):
+            value = i
+            value = seven
+            value = eight
+    return value
+
+
+def bench_rebind_mixed_types(loops):
+    text = "hello"
+    items = [1, 2, 3]
+    for _ in range(loops):
+        for i in range(INNER_LOOPS):
+            value = i
+            value = text
+            value = items
+    return value
+
+
+class Duck:
+    def quack(self):
+        return "Quack!"
+
+
+class Robot:
+    def quack(self):
+        return "Beep quack!"
+
+
+def quack_duck(duck):
+    return "Quack!"
+
+
+# Both call benchmarks walk the same list, so they only differ in the call
+ANIMALS = [Duck(), Robot()] * (INNER_LOOPS // 2)
+
+
+def bench_direct_call(loops):
+    for _ in range(loops):
+        for animal in ANIMALS:
+            quack_duck(animal)
+
+
+def bench_duck_typed_call(loops):
+    for _ in range(loops):
+        for animal in ANIMALS:
+            animal.quack()
+
+
+MIXED_VALUES = [42, "hello", 3.14, "world"] * (INNER_LOOPS // 4)
+
+
+def bench_isinstance_dispatch(loops):
+    for _ in range(loops):
+        for value in MIXED_VALUES:
+            if isinstance(value, str):
+                value.upper()
+            else:
+                value * 2
+
+
+def bench_try_except_dispatch(loops):
+    for _ in range(loops):
+        for value in MIXED_VALUES:
+            try:
+                value.upper()
+            except AttributeError:
+                value * 2
+
+
+class DictPoint:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class SlotsPoint:
+    __slots__ = ("x", "y")
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def _read_attributes(point, loops):
+    for _ in range(loops):
+        for _ in range(INNER_LOOPS):
+            point.x + point.y
+
+
+def bench_dict_attribute_access(loops):
+    _read_attributes(DictPoint(1, 2), loops)
+
+
+def bench_slots_attribute_access(loops):
+    _read_attributes(SlotsPoint(1, 2), loops)
+
+
+# (name, function) in the order they are reported
+BENCHMARKS = [
+    ("rebind_same_type", bench_rebind_same_type),
+    ("rebind_mixed_types", bench_rebind_mixed_types),
+    ("direct_call", bench_direct_call),
+    ("duck_typed_call", bench_duck_typed_call),
+    ("isinstance_dispatch", bench_isinstance_dispatch),
+    ("try_except_dispatch", bench_try_except_dispatch),
+    ("dict_attribute_access", bench_dict_attribute_access),
+    ("slots_attribute_access", bench_slots_attribute_access),
+]
+
+
+# ========================================
+# Runner
+# ========================================
+
+def calibrate(func, min_time):
+    """Find a loop count that makes one run take at least min_time seconds."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        func(loops)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return loops
+        loops *= 2 if elapsed == 0 else max(2, int(min_time / elapsed * 1.2))
+
+
+def run_benchmark(func, warmup=2, runs=10, min_time=0.05):
+    """Time func and return statistics in nanoseconds per operation."""
+    if runs < 1:
+        raise ValueError("At least one timed run is needed")
+    loops = calibrate(func, min_time)
+    for _ in range(warmup):
+        func(loops)
+
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(loops)
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed / (loops * INNER_LOOPS) * 1e9)
+
+    return {
+        "loops": loops,
+        "runs": runs,
+        "min_ns": min(samples),
+        "mean_ns": statistics.mean(samples),
+        "median_ns": statistics.median(samples),
+        "stdev_ns": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def run_all(selected=None, warmup=2, runs=10, min_time=0.05):
+    """Run the selected benchmarks (all by default) and return a result document."""
+    results = {}
+    for name, func in BENCHMARKS:
+        if selected and name not in selected:
+            continue
+        results[name] = run_benchmark(func, warmup=warmup, runs=runs, min_time=min_time)
+        print(f"  {name:<24} {results[name]['median_ns']:>8.2f} ns/op")
+    return {
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "benchmarks": results,
+    }
+
+
+def print_results(document):
+    """Print a result document as a table."""
+    print(f"\nPython {document['python'].split()[0]} ({document['implementation']})")
+    print(f"{'Benchmark':<24} {'median':>9} {'min':>9} {'mean':>9} {'stdev':>8}")
+    print("-" * 63)
+    for name, stats in document["benchmarks"].items():
+        print(f"{name:<24} {stats['median_ns']:>9.2f} {stats['min_ns']:>9.2f} "
+              f"{stats['mean_ns']:>9.2f} {stats['stdev_ns']:>8.2f}")
+    print("(nanoseconds per operation)")
+
+
+def compare_results(baseline, candidate):
+    """Print the median change of every benchmark present in both documents."""
+    print(f"Baseline:  Python {baseline['python'].split()[0]} ({baseline['timestamp']})")
+    print(f"Candidate: Python {candidate['python'].split()[0]} ({candidate['timestamp']})")
+    print(f"{'Benchmark':<24} {'baseline':>9} {'candidate':>10} {'change':>8}")
+    print("-" * 54)
+    rows = []
+    for name, old in baseline["benchmarks"].items():
+        new = candidate["benchmarks"].get(name)
+        if new is None:
+            continue
+        change = (new["median_ns"] - old["median_ns"]) / old["median_ns"] * 100
+        rows.append((name, change))
+        print(f"{name:<24} {old['median_ns']:>9.2f} {new['median_ns']:>10.2f} {change:>+7.1f}%")
+    return rows
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def positive_int(text):
+    """argparse type for counts that must be at least 1"""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def main():
+    """Parse arguments and run or compare benchmarks"""
+    parser = argparse.ArgumentParser(description="Dynamic typing cost microbenchmarks")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"),
+                        help="compare two saved result files instead of running")
+    parser.add_argument("--only", nargs="+", choices=[name for name, _ in BENCHMARKS],
+                        help="run only these benchmarks")
+    parser.add_argument("--runs", type=positive_int, default=10, help="timed runs per benchmark")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed warmup runs")
+    parser.add_argument("--min-time", type=float, default=0.05,
+                        help="minimum seconds per timed run")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_results(load_results(args.compare[0]), load_results(args.compare[1]))
+        return
+
+    print("=" * 63)
+    print("DYNAMIC TYPING COST MICROBENCHMARKS")
+    print("=" * 63)
+    document = run_all(args.only, warmup=args.warmup, runs=args.runs, min_time=args.min_time)
+    print_results(document)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
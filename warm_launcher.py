@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""
+Warm Pre-forked Launcher
+========================
+
+Starting a demo with "python script.py" pays for a new interpreter and
+for importing pygame every single time. This launcher keeps one warm
+"zygote" process around that has already done that work, and forks it
+to start each demo in a few milliseconds.
+
+    python warm_launcher.py serve &                          # start the zygote
+    python warm_launcher.py run memory_references_demo.py    # start a demo from it
+    python warm_launcher.py bench                            # compare with a cold start
+
+The zygote imports everything the demo scripts import - pygame (without
+initializing it - SDL state must not be shared between forked processes)
+and the repository's modules - and keeps the demo scripts compiled. Each
+launched demo gets the caller's terminal, working directory, environment
+and arguments.
+
+When one of the preloaded repository modules changes on disk, requests
+are started cold (a fresh interpreter) until no forked demo is running
+any more; then the zygote restarts itself with the new code.
+
+Requires a Unix system (fork and Unix domain sockets). Start the zygote
+from the same terminal session you launch demos from, so they can take
+over the terminal for keyboard input.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import select
+import signal
+import socket
+import stat
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import types
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Scripts the zygote keeps compiled
+DEMO_SCRIPTS = [
+    "game_score_demo template.py",
+    "memory_references_demo.py",
+    "dynamic_typing_demo.py",
+]
+
+# The socket lives in a directory only this user can enter: the per-user
+# runtime directory if there is one, else a private folder in the temp dir
+SOCKET_DIR = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir(),
+    f"score-example-launcher-{os.getuid() if hasattr(os, 'getuid') else 0}")
+SOCKET_PATH = os.path.join(SOCKET_DIR, "launcher.sock")
+MAX_MESSAGE = 1024 * 1024
+REQUEST_TIMEOUT = 5.0      # Seconds a client may take to send its launch request
+
+# "import a, b as c" and "from a.b import c" (read with a regex rather than
+# ast, since the student template does not parse until it is completed)
+IMPORT_PATTERN = re.compile(r"^\s*(?:from\s+([\w.]+)\s+import\b|import\s+([\w.]+(?:\s+as\s+\w+)?"
+                            r"(?:\s*,\s*[\w.]+(?:\s+as\s+\w+)?)*))", re.MULTILINE)
+
+
+# ========================================
+# Zygote (server) side
+# ========================================
+
+def script_imports(path):
+    """Return the top-level names of the modules a script imports"""
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    names = set()
+    for from_module, modules in IMPORT_PATTERN.findall(source):
+        for module in [from_module] if from_module else modules.split(","):
+            name = module.split()[0].split(".")[0]
+            if name and name != "__future__":
+                names.add(name)
+    return names
+
+
+def preload_modules(scripts=DEMO_SCRIPTS):
+    """Return the modules the demo scripts import (the zygote imports them all)"""
+    names = set()
+    for name in scripts:
+        try:
+            names |= script_imports(os.path.join(HERE, name))
+        except OSError as e:
+            print(f"⚠️  Could not read {name}: {e}")
+    return sorted(names)
+
+
+def preload():
+    """Import the heavy modules once, before any fork"""
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    for name in preload_modules():
+        try:
+            __import__(name)
+        except ImportError as e:
+            print(f"⚠️  Could not preload {name}: {e}")
+
+
+def source_mtimes():
+    """Return {path: mtime} of every loaded module from this repository"""
+    mtimes = {}
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and os.path.dirname(os.path.abspath(path)) == HERE:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                pass
+    return mtimes
+
+
+def sources_changed(mtimes):
+    """Return True if a preloaded module's file changed (or disappeared)"""
+    for path, mtime in mtimes.items():
+        try:
+            if os.stat(path).st_mtime_ns != mtime:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+def private_socket_dir(socket_path):
+    """Create the socket's directory (mode 0700) and check nobody else can use it"""
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(directory)
+    if (not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid()
+            or info.st_mode & (stat.S_IRWXG | stat.S_IRWXO)):
+        raise RuntimeError(f"{directory} must be a directory owned by you with mode 0700")
+    return directory
+
+
+def peer_uid(conn):
+    """Return the user id of the process at the other end of a Unix socket (None if unknown)"""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None  # Not Linux: the 0700 directory is the only protection
+    credentials = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", credentials)[1]
+
+
+def same_user(conn):
+    uid = peer_uid(conn)
+    return uid is None or uid == os.getuid()
+
+
+def remove_stale_socket(socket_path):
+    """Remove a socket left by a launcher that is gone; fail if one is still running"""
+    if not os.path.exists(socket_path):
+        return
+    if is_running(socket_path):
+        raise RuntimeError(f"A warm launcher is already running on {socket_path}")
+    os.remove(socket_path)
+
+
+class CodeCache:
+    """Compiled demo scripts, recompiled when the file changes."""
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, path):
+        """Return (code object, None) or (None, SyntaxError) for path"""
+        mtime = os.stat(path).st_mtime_ns
+        entry = self._entries.get(path)
+        if entry is None or entry[0] != mtime:
+            with open(path, "rb") as f:
+                source = f.read()
+            try:
+                entry = (mtime, compile(source, path, "exec"), None)
+            except SyntaxError as e:
+                entry = (mtime, None, e)
+            self._entries[path] = entry
+        return entry[1], entry[2]
+
+
+def run_child(request, fds, code, error, cold=False):
+    """Become the requested demo (runs in the forked child, never returns).
+
+    With cold=True the script is run by a fresh interpreter instead,
+    because the preloaded modules are out of date.
+    """
+    status = 0
+    try:
+        os.setpgid(0, 0)
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+        for fd in set(fds) - {0, 1, 2}:
+            os.close(fd)
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+
+        # Re-create the standard streams so buffering matches the new files
+        line_buffered = os.isatty(1) or bool(os.environ.get("PYTHONUNBUFFERED"))
+        sys.stdin = open(0, "r", closefd=False)
+        sys.stdout = open(1, "w", buffering=1 if line_buffered else -1, closefd=False)
+        sys.stderr = open(2, "w", buffering=1, closefd=False)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        random.seed()  # Forked children would otherwise share one random sequence
+        script = request["script"]
+        if cold:
+            os.execv(sys.executable, [sys.executable, script] + request["args"])
+        sys.argv = [script] + request["args"]
+        sys.path[0] = os.path.dirname(script)
+
+        if error is not None:
+            raise error
+        main_module = types.ModuleType("__main__")
+        main_module.__file__ = script
+        main_module.__builtins__ = __builtins__
+        sys.modules["__main__"] = main_module
+        exec(code, main_module.__dict__)
+    except SystemExit as e:
+        if e.code is None:
+            status = 0
+        elif isinstance(e.code, int):
+            status = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            status = 1
+    except KeyboardInterrupt:
+        status = 130
+    except BaseException:
+        import traceback
+        traceback.print_exc()
+        status = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(status)
+
+
+def serve(socket_path=SOCKET_PATH, listen_fd=None):
+    """Run the zygote: preload, then fork a demo for every request.
+
+    listen_fd is the already listening socket handed over by a restart.
+    """
+    preload()
+    mtimes = source_mtimes()
+    codes = CodeCache()
+    for name in DEMO_SCRIPTS:
+        codes.get(os.path.join(HERE, name))
+
+    if listen_fd is not None:
+        listener = socket.socket(fileno=listen_fd)
+    else:
+        private_socket_dir(socket_path)
+        remove_stale_socket(socket_path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(socket_path)
+        os.chmod(socket_path, 0o600)
+        listener.listen(16)
+    print(f"🔥 Warm launcher ready on {socket_path} (pid {os.getpid()})")
+
+    children = {}  # pid -> connection waiting for the exit status
+    stale = False
+    try:
+        while True:
+            readable, _, _ = select.select([listener], [], [], 0.05)
+            if readable:
+                conn, _ = listener.accept()
+                if not same_user(conn):
+                    conn.close()  # Only the user who started the zygote may launch from it
+                    continue
+                # A client that connects and never sends must not block the zygote
+                conn.settimeout(REQUEST_TIMEOUT)
+                stale = stale or sources_changed(mtimes)
+                try:
+                    handle_request(conn, codes, listener, children, cold=stale)
+                except (OSError, ValueError, KeyError) as e:
+                    try:
+                        conn.sendall((json.dumps({"error": str(e)}) + "\n").encode())
+                    except OSError:
+                        pass
+                    conn.close()
+            reap_children(children)
+            if stale and not children:
+                break
+    except KeyboardInterrupt:
+        print("\nWarm launcher stopped")
+        stale = False
+    finally:
+        if not stale:
+            listener.close()
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+    if stale:
+        # Children forked from the old code have finished: start over with the
+        # new code. The listening socket is kept, so clients connecting in the
+        # meantime wait in its backlog instead of finding no launcher.
+        print("🔄 Source files changed - restarting the warm launcher")
+        sys.stdout.flush()
+        listener.set_inheritable(True)
+        os.execv(sys.executable, [sys.executable, os.path.abspath(__file__), "--socket",
+                                  socket_path, "serve", "--listen-fd", str(listener.fileno())])
+
+
+def handle_request(conn, codes, listener, children, cold=False):
+    """Receive one launch request and fork the demo for it (see run_child() for cold)"""
+    message, fds, _, _ = socket.recv_fds(conn, MAX_MESSAGE, 3)
+    if len(fds) != 3:
+        for fd in fds:
+            os.close(fd)
+        raise ValueError("Expected stdin, stdout and stderr file descriptors")
+    request = json.loads(message)
+    script = os.path.abspath(os.path.join(request["cwd"], request["script"]))
+    request["script"] = script
+    code, error = codes.get(script)
+
+    pid = os.fork()
+    if pid == 0:
+        listener.close()
+        conn.close()
+        for other in children.values():
+            other.close()
+        run_child(request, fds, code, error, cold)
+
+    for fd in fds:
+        os.close(fd)
+    try:
+        os.setpgid(pid, pid)
+    except OSError:
+        pass  # The child already did it (or already exited)
+    conn.sendall((json.dumps({"pid": pid}) + "\n").encode())
+    children[pid] = conn
+
+
+def reap_children(children):
+    """Send the exit status of finished demos back to their launchers"""
+    while children:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+        conn = children.pop(pid, None)
+        if conn is None:
+            continue
+        try:
+            conn.sendall((json.dumps({"exit": os.waitstatus_to_exitcode(status)}) + "\n").encode())
+        except OSError:
+            pass
+        conn.close()
+
+
+# ========================================
+# Launcher (client) side
+# ========================================
+
+def start(script, args=(), fds=(0, 1, 2), socket_path=SOCKET_PATH):
+    """Ask the zygote to start a script; returns (connection, reader, pid)"""
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.connect(socket_path)
+    # The request carries this user's environment and terminal
+    if not same_user(conn):
+        conn.close()
+        raise RuntimeError(f"{socket_path} is not served by your own warm launcher")
+    request = {"script": script, "args": list(args), "cwd": os.getcwd(), "env": dict(os.environ)}
+    socket.send_fds(conn, [json.dumps(request).encode()], list(fds))
+    reader = conn.makefile("r")
+    reply = json.loads(reader.readline())
+    if "error" in reply:
+        conn.close()
+        raise RuntimeError(reply["error"])
+    return conn, reader, reply["pid"]
+
+
+def wait(conn, reader):
+    """Wait for a started script to finish and return its exit code"""
+    try:
+        line = reader.readline()
+        return json.loads(line)["exit"] if line else 1
+    finally:
+        conn.close()
+
+
+def give_terminal_to(pgid):
+    """Make pgid the terminal's foreground process group (if stdin is a terminal)"""
+    if not os.isatty(0):
+        return False
+    previous = signal.signal(signal.SIGTTOU, signal.SIG_IGN)
+    try:
+        os.tcsetpgrp(0, pgid)
+        return True
+    except OSError:
+        return False
+    finally:
+        signal.signal(signal.SIGTTOU, previous)
+
+
+def launch(script, args=(), socket_path=SOCKET_PATH):
+    """Run a script from the warm zygote in this terminal and return its exit code"""
+    conn, reader, pid = start(script, args, socket_path=socket_path)
+    owns_terminal = give_terminal_to(pid)
+    if owns_terminal:
+        try:
+            os.killpg(pid, signal.SIGCONT)  # In case it stopped reading before it was foreground
+        except ProcessLookupError:
+            pass
+    try:
+        while True:
+            try:
+                return wait(conn, reader)
+            except KeyboardInterrupt:
+                try:
+                    os.killpg(pid, signal.SIGINT)
+                except ProcessLookupError:
+                    pass
+    finally:
+        if owns_terminal:
+            give_terminal_to(os.getpgrp())
+
+
+def is_running(socket_path=SOCKET_PATH):
+    """Return True if a zygote is accepting connections"""
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "fork"):
+        return False
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+# ========================================
+# Benchmark
+# ========================================
+
+def time_to_first_output_cold(script, env):
+    """Seconds from spawning a fresh interpreter until the script prints"""
+    begin = time.perf_counter()
+    process = subprocess.Popen([sys.executable, script], stdin=subprocess.DEVNULL,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env, cwd=HERE)
+    if not process.stdout.read(1):
+        raise RuntimeError(f"{os.path.basename(script)} exited without printing anything")
+    elapsed = time.perf_counter() - begin
+    process.kill()
+    process.wait()
+    return elapsed
+
+
+def time_to_first_output_warm(script, socket_path):
+    """Seconds from asking the zygote until the forked script prints"""
+    read_fd, write_fd = os.pipe()
+    devnull = os.open(os.devnull, os.O_RDWR)
+    begin = time.perf_counter()
+    conn, reader, pid = start(script, fds=(devnull, write_fd, devnull), socket_path=socket_path)
+    os.close(write_fd)
+    printed = os.read(read_fd, 1)
+    elapsed = time.perf_counter() - begin
+    os.close(read_fd)
+    os.close(devnull)
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    wait(conn, reader)
+    if not printed:
+        raise RuntimeError(f"{os.path.basename(script)} exited without printing anything")
+    return elapsed
+
+
+def bench(scripts=None, runs=10, socket_path=SOCKET_PATH):
+    """Compare cold and warm startup latency for the demo scripts"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ["PYTHONUNBUFFERED"] = "1"  # Output must not wait in a pipe buffer
+
+    zygote = None
+    if not is_running(socket_path):
+        zygote = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--socket",
+                                   socket_path, "serve"], stdout=subprocess.DEVNULL)
+        while not is_running(socket_path):
+            if zygote.poll() is not None:
+                raise RuntimeError("Warm launcher failed to start")
+            time.sleep(0.05)
+
+    print(f"{'Script':<32} {'cold (ms)':>10} {'warm (ms)':>10} {'speedup':>8}")
+    print("-" * 63)
+    try:
+        for name in scripts or DEMO_SCRIPTS:
+            script = os.path.join(HERE, name)
+            try:
+                cold = statistics.median(time_to_first_output_cold(script, os.environ.copy())
+                                         for _ in range(runs))
+                warm = statistics.median(time_to_first_output_warm(script, socket_path)
+                                         for _ in range(runs))
+            except RuntimeError as e:
+                print(f"{os.path.basename(name):<32} ❌ {e}")
+                continue
+            print(f"{os.path.basename(name):<32} {cold * 1000:>10.1f} {warm * 1000:>10.1f} "
+                  f"{cold / warm:>7.1f}x")
+    finally:
+        if zygote is not None:
+            zygote.send_signal(signal.SIGINT)
+            zygote.wait()
+    print("(median time until the script's first output)")
+
+
+def main():
+    """Parse arguments and serve, run or benchmark"""
+    parser = argparse.ArgumentParser(description="Warm pre-forked launcher for the demos")
+    parser.add_argument("--socket", default=SOCKET_PATH, help="Unix socket path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="start the warm zygote")
+    serve_parser.add_argument("--listen-fd", type=int, help=argparse.SUPPRESS)
+    run_parser = commands.add_parser("run", help="run a script from the zygote")
+    run_parser.add_argument("script")
+    run_parser.add_argument("args", nargs=argparse.REMAINDER)
+    bench_parser = commands.add_parser("bench", help="compare cold and warm startup")
+    bench_parser.add_argument("scripts", nargs="*", help="scripts to time (default: the demos)")
+    bench_parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        try:
+            serve(args.socket, args.listen_fd)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    elif args.command == "run":
+        if not is_running(args.socket):
+            print("❌ Warm launcher is not running. Start it with: python warm_launcher.py serve &")
+            sys.exit(1)
+        sys.exit(launch(args.script, args.args, args.socket))
+    else:
+        bench(args.scripts, args.runs, args.socket)
+
+
+if __name__ == "__main__":
+    main()